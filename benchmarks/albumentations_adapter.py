@@ -0,0 +1,64 @@
+"""Benchmarks `tfms.A.Adapter` on a no-op pipeline, where the cost is only the
+overhead of the adapter, comparing composing the albumentations pipeline for
+every sample (previous behaviour) against the compiled pipeline reused for
+records with the same components, and how long composing the pipeline takes.
+
+Usage: `python benchmarks/albumentations_adapter.py --num-samples 2000`
+"""
+import argparse
+import time
+from icevision.all import *
+
+
+def create_records(num_records, num_annotations, img_size=64, num_classes=10):
+    class_map = ClassMap([str(i) for i in range(num_classes)])
+    records = []
+    for i in range(num_records):
+        record = BaseRecord(
+            (
+                ImageRecordComponent(),
+                InstancesLabelsRecordComponent(),
+                BBoxesRecordComponent(),
+            )
+        )
+        record.set_record_id(i)
+        record.set_img(np.zeros((img_size, img_size, 3), dtype=np.uint8))
+        record.detection.set_class_map(class_map)
+        record.detection.add_labels_by_id(
+            np.random.randint(1, num_classes, num_annotations)
+        )
+        record.detection.add_bboxes(
+            [BBox.from_xywh(1, 1, 10, 10) for _ in range(num_annotations)]
+        )
+        records.append(record)
+    return records
+
+
+def samples_per_second(tfm, records, compile_every_sample):
+    start = time.perf_counter()
+    for record in records:
+        if compile_every_sample:
+            tfm._plans.clear()
+        tfm(record.load())
+    return len(records) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-samples", type=int, default=2000)
+    parser.add_argument("--num-annotations", type=int, default=10)
+    args = parser.parse_args()
+
+    records = create_records(args.num_samples, args.num_annotations)
+    tfm = tfms.A.Adapter([tfms.A.NoOp()])
+    for name, compile_every_sample in [("compose", True), ("compiled", False)]:
+        speed = samples_per_second(tfm, records, compile_every_sample)
+        print(f"{name:9} {speed:8.0f} samples/sec")
+
+    # what the compiled pipeline saves for each sample
+    num_iters = 1000
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        tfm._compile()
+    seconds = (time.perf_counter() - start) / num_iters
+    print(f"composing the pipeline takes {seconds * 1e6:.1f} us")
@@ -0,0 +1,81 @@
+"""Benchmarks the padding added by `ImgPadStack`, comparing random batches against
+batches made by `AspectRatioBatchSampler`.
+
+Images have a mix of COCO-like portrait and landscape sizes, resized to have
+their longest side equal to `--img-size` (as with `LongestMaxSize`). The padding
+ratio is the fraction of the batch tensors that is padding, effective pixels/sec
+only counts the pixels of the images going through a resnet18 backbone.
+
+Usage: `python benchmarks/batch_padding.py --num-records 2000 --batch-size 8`
+"""
+import argparse
+import time
+import torchvision
+from torch.utils.data import BatchSampler, RandomSampler
+from icevision.all import *
+
+SIZES = [(640, 480), (480, 640), (640, 427), (427, 640), (500, 375), (640, 640)]
+
+
+def create_records(num_records, img_size):
+    records = []
+    for i in range(num_records):
+        width, height = SIZES[np.random.randint(len(SIZES))]
+        scale = img_size / max(width, height)
+        record = BaseRecord((SizeRecordComponent(),))
+        record.set_record_id(i)
+        record.set_img_size(ImgSize(round(width * scale), round(height * scale)))
+        records.append(record)
+    return records
+
+
+def padded_shapes(records, batches):
+    shapes = []
+    for batch in batches:
+        sizes = [records[i].img_size for i in batch]
+        width = max(o.width for o in sizes)
+        height = max(o.height for o in sizes)
+        shapes.append(
+            (len(batch), height, width, sum(o.width * o.height for o in sizes))
+        )
+    return shapes
+
+
+@torch.no_grad()
+def effective_pixels_per_second(model, shapes, num_batches):
+    pixels, seconds = 0, 0.0
+    for batch_size, height, width, img_pixels in shapes[:num_batches]:
+        x = torch.zeros(batch_size, 3, height, width)
+        start = time.perf_counter()
+        model(x)
+        seconds += time.perf_counter() - start
+        pixels += img_pixels
+    return pixels / seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-records", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--img-size", type=int, default=384)
+    parser.add_argument("--num-batches", type=int, default=20)
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    records = create_records(args.num_records, args.img_size)
+    model = torchvision.models.resnet18().eval()
+    samplers = {
+        "random": BatchSampler(
+            RandomSampler(records), batch_size=args.batch_size, drop_last=False
+        ),
+        "aspect ratio": AspectRatioBatchSampler(records, batch_size=args.batch_size),
+    }
+    for name, sampler in samplers.items():
+        shapes = padded_shapes(records, list(sampler))
+        padded = sum(n * h * w for n, h, w, _ in shapes)
+        pixels = sum(o[3] for o in shapes)
+        speed = effective_pixels_per_second(model, shapes, args.num_batches)
+        print(
+            f"{name:13} padding {1 - pixels / padded:6.1%}, "
+            f"effective {speed / 1e6:6.2f} Mpixels/sec"
+        )
@@ -0,0 +1,75 @@
+"""Benchmarks parsing a COCO annotations file, comparing the streaming mode of
+`COCOBBoxParser` against loading the whole file with `json.loads`.
+
+Peak memory is measured with `tracemalloc` in a separate run, because tracing
+slows down parsing.
+
+Usage: `python benchmarks/coco_parse.py --num-images 10000 --num-annotations 10`
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from icevision.all import *
+
+
+def create_annotations(filepath, num_images, num_annotations, num_classes=80):
+    images = [
+        {"id": i, "file_name": f"{i:012d}.jpg", "width": 640, "height": 480}
+        for i in range(num_images)
+    ]
+    categories = [{"id": i, "name": str(i)} for i in range(1, num_classes + 1)]
+    annotations = [
+        {
+            "id": i,
+            "image_id": i // num_annotations,
+            "category_id": i % num_classes + 1,
+            "bbox": [10.0, 20.0, 100.0, 200.0],
+            "segmentation": [[10.0, 20.0, 110.0, 20.0, 110.0, 220.0, 10.0, 220.0]],
+            "area": 20000.0,
+            "iscrowd": 0,
+        }
+        for i in range(num_images * num_annotations)
+    ]
+    # official COCO files have the categories last
+    data = {"images": images, "annotations": annotations, "categories": categories}
+    Path(filepath).write_text(json.dumps(data))
+
+
+def parse(filepath, stream):
+    parser = parsers.COCOBBoxParser(filepath, img_dir=".", stream=stream)
+    return parser.parse_dicted(show_pbar=False)
+
+
+def measure(filepath, stream):
+    start = time.perf_counter()
+    records = parse(filepath, stream=stream)
+    seconds = time.perf_counter() - start
+    del records
+
+    tracemalloc.start()
+    records = parse(filepath, stream=stream)
+    records_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, records_memory, peak_memory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-images", type=int, default=10000)
+    parser.add_argument("--num-annotations", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = Path(tmpdir) / "annotations.json"
+        create_annotations(filepath, args.num_images, args.num_annotations)
+        print(f"annotations file: {filepath.stat().st_size / 2 ** 20:.1f} MB")
+
+        for name, stream in [("json.loads", False), ("stream", True)]:
+            seconds, records_memory, peak_memory = measure(filepath, stream=stream)
+            print(
+                f"{name:12} {seconds:8.2f} s, "
+                f"records {records_memory / 2 ** 20:8.1f} MB, "
+                f"peak {peak_memory / 2 ** 20:8.1f} MB"
+            )
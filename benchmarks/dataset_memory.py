@@ -0,0 +1,130 @@
+"""Benchmarks the memory used by `DataLoader` workers, comparing a `Dataset` with a
+list of records against `Dataset(..., shared=True)`.
+
+Each worker reports its PSS (proportional set size, shared pages are divided
+between the processes sharing them) and USS (unique set size, pages private to
+the worker) after going through the data. With a list of records, reference
+counting makes the workers copy the pages of every record they access, so USS
+grows with the number of records.
+
+Only works on Linux, memory is read from `/proc/<pid>/smaps_rollup`.
+
+Usage: `python benchmarks/dataset_memory.py --num-records 100000 --num-workers 4`
+"""
+import argparse
+import gc
+from torch.utils.data import DataLoader
+from icevision.all import *
+
+
+def create_records(num_records, num_annotations, num_classes=80):
+    class_map = ClassMap([str(i) for i in range(num_classes)])
+    records = []
+    for i in range(num_records):
+        record = BaseRecord(
+            (
+                InstancesLabelsRecordComponent(),
+                BBoxesRecordComponent(),
+                AreasRecordComponent(),
+                IsCrowdsRecordComponent(),
+            )
+        )
+        record.set_record_id(i)
+        record.detection.set_class_map(class_map)
+        record.detection.add_labels_by_id(
+            np.random.randint(1, num_classes, num_annotations)
+        )
+        record.detection.add_bboxes(
+            [BBox.from_xywh(1, 1, 10, 10) for _ in range(num_annotations)]
+        )
+        record.detection.add_areas([100.0] * num_annotations)
+        record.detection.add_iscrowds([0] * num_annotations)
+        records.append(record)
+
+    return records
+
+
+def memory_usage(pid="self"):
+    """Returns PSS and USS of a process in bytes."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    uss = fields["Private_Clean"] + fields["Private_Dirty"]
+    return fields["Pss"], uss
+
+
+class MemoryProbe:
+    """Loads the records and returns the memory of the worker that loaded them."""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, i):
+        self.dataset[i]
+        # reading the memory is slow, it's only done every few items, the garbage
+        # collector also writes to the objects it goes through
+        if i % 1000 != 0:
+            return os.getpid(), None
+        gc.collect()
+        return os.getpid(), memory_usage()
+
+
+def collate_memory(batch):
+    return [(pid, memory) for pid, memory in batch if memory is not None]
+
+
+def measure(num_records, num_annotations, num_workers, epochs, shared):
+    records = create_records(num_records, num_annotations)
+    dataset = MemoryProbe(Dataset(records, shared=shared))
+    # any other reference to the records would still be copied by the workers,
+    # the garbage collector goes through all objects
+    del records
+    gc.collect()
+
+    data_loader = DataLoader(
+        dataset,
+        batch_size=256,
+        shuffle=True,
+        num_workers=num_workers,
+        collate_fn=collate_memory,
+        persistent_workers=True,
+    )
+    workers_memory = {}
+    for _ in range(epochs):
+        for batch in data_loader:
+            workers_memory.update(batch)
+
+    return memory_usage(), workers_memory
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-records", type=int, default=100000)
+    parser.add_argument("--num-annotations", type=int, default=10)
+    parser.add_argument("--num-workers", type=int, default=4)
+    parser.add_argument("--epochs", type=int, default=2)
+    args = parser.parse_args()
+
+    mb = 2 ** 20
+    for name, shared in [("list", False), ("shared", True)]:
+        (main_pss, main_uss), workers_memory = measure(
+            args.num_records,
+            args.num_annotations,
+            num_workers=args.num_workers,
+            epochs=args.epochs,
+            shared=shared,
+        )
+        pss = [pss for pss, _ in workers_memory.values()]
+        uss = [uss for _, uss in workers_memory.values()]
+        print(
+            f"{name:8} main pss {main_pss / mb:8.1f} MB, "
+            f"worker pss {np.mean(pss) / mb:8.1f} MB, "
+            f"worker uss {np.mean(uss) / mb:8.1f} MB, "
+            f"total pss {(main_pss + sum(pss)) / mb:8.1f} MB"
+        )
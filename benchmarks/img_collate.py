@@ -0,0 +1,62 @@
+"""Benchmarks collating a batch of uint8 images, comparing `ImgPadStack` followed by
+`im2tensor` and `torch.stack` (the float32 batch built by the model dataloaders)
+against `ImgCollate`, which writes the uint8 images once in a reused buffer, and
+`normalize_imgs` (done on the device).
+
+The reported size is the number of bytes of the batch, i.e. the bytes copied from
+the host to the device.
+
+Usage: `python benchmarks/img_collate.py --batch-size 16 --img-size 640`
+"""
+import argparse
+import time
+from icevision.all import *
+
+
+def create_records(batch_size, img_size):
+    records = []
+    for _ in range(batch_size):
+        height = np.random.randint(img_size // 2, img_size + 1)
+        img = np.random.randint(0, 256, (height, img_size, 3), dtype=np.uint8)
+        record = BaseRecord((ImageRecordComponent(),))
+        record.set_img(img)
+        records.append(record)
+    return records
+
+
+def pad_stack_float(records):
+    records = tfms.batch.ImgPadStack(pad_value=np.uint8(0))(records)
+    return torch.stack([im2tensor(record.img) for record in records])
+
+
+def benchmark(fn, records, num_iters):
+    fn(records)
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        batch = fn(records)
+    return (time.perf_counter() - start) / num_iters, batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--img-size", type=int, default=640)
+    parser.add_argument("--num-iters", type=int, default=20)
+    args = parser.parse_args()
+
+    np.random.seed(0)
+    records = create_records(args.batch_size, args.img_size)
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    # batches are normalized (copied) before the buffer is reused
+    img_collate = tfms.batch.ImgCollate(num_buffers=2)
+
+    for name, fn in [
+        ("pad stack float", lambda rs: pad_stack_float(rs).to(device)),
+        ("img collate", lambda rs: normalize_imgs(img_collate(rs).to(device))),
+    ]:
+        seconds, _ = benchmark(fn, records, args.num_iters)
+        print(f"{name:16} {seconds * 1e3:7.2f} ms/batch")
+
+    float_bytes = pad_stack_float(records).numel() * 4
+    uint8_bytes = img_collate(records).numel()
+    print(f"host to device: {float_bytes / 1e6:.1f} MB vs {uint8_bytes / 1e6:.1f} MB")
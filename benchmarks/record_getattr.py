@@ -0,0 +1,81 @@
+"""Micro-benchmarks attribute access on records, comparing the cached dispatch of
+`Composite` and `TaskComposite` against a linear scan over the components.
+
+Usage: `python benchmarks/record_getattr.py --number 100000`
+"""
+import argparse
+import timeit
+from icevision.all import *
+
+
+def create_record():
+    record = BaseRecord(
+        (
+            FilepathRecordComponent(),
+            InstancesLabelsRecordComponent(),
+            BBoxesRecordComponent(),
+            AreasRecordComponent(),
+            IsCrowdsRecordComponent(),
+        )
+    )
+    record.set_record_id(1)
+    record.set_filepath("img.jpg")
+    record.set_img_size(ImgSize(width=64, height=64))
+    record.detection.set_class_map(ClassMap(["a"]))
+    record.detection.add_labels_by_id([1])
+    record.detection.add_bboxes([BBox.from_xywh(1, 1, 10, 10)])
+    return record
+
+
+def linear_getattr(composite, name):
+    """Previous implementation of `Composite.__getattr__`."""
+    for component in composite.components:
+        try:
+            return getattr(component, name)
+        except AttributeError:
+            pass
+    return getattr(composite._parent, name)
+
+
+def linear_record_getattr(record, name):
+    """Previous implementation of `TaskComposite.__getattr__`."""
+    try:
+        return linear_getattr(record.task_composites[tasks.common.name], name)
+    except AttributeError:
+        return record.task_composites[name]
+
+
+CASES = {
+    "record.record_id": (
+        lambda r: r.record_id,
+        lambda r: linear_record_getattr(r, "record_id"),
+    ),
+    "record.img_size": (
+        lambda r: r.img_size,
+        lambda r: linear_record_getattr(r, "img_size"),
+    ),
+    "record.detection.bboxes": (
+        lambda r: r.detection.bboxes,
+        lambda r: linear_getattr(linear_record_getattr(r, "detection"), "bboxes"),
+    ),
+    # delegated from the detection composite to the record
+    "record.detection.filepath": (
+        lambda r: r.detection.filepath,
+        lambda r: linear_getattr(linear_record_getattr(r, "detection"), "filepath"),
+    ),
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    record = create_record()
+    for name, (cached_fn, linear_fn) in CASES.items():
+        linear = min(timeit.repeat(lambda: linear_fn(record), number=args.number))
+        cached = min(timeit.repeat(lambda: cached_fn(record), number=args.number))
+        print(
+            f"{name:28} linear: {1e9 * linear / args.number:7.1f} ns  "
+            f"cached: {1e9 * cached / args.number:7.1f} ns  ({linear / cached:.1f}x)"
+        )
@@ -0,0 +1,70 @@
+"""Benchmarks `BaseRecord.load`, comparing the structured copy against `deepcopy`.
+
+Usage: `python benchmarks/record_load.py --num-records 1000 --num-annotations 20`
+"""
+import argparse
+import tempfile
+import timeit
+from icevision.all import *
+
+
+def create_records(filepath, num_records, num_annotations, num_classes=80):
+    class_map = ClassMap([str(i) for i in range(num_classes)])
+    records = []
+    for i in range(num_records):
+        record = BaseRecord(
+            (
+                FilepathRecordComponent(),
+                InstancesLabelsRecordComponent(),
+                BBoxesRecordComponent(),
+                AreasRecordComponent(),
+                IsCrowdsRecordComponent(),
+            )
+        )
+        record.set_record_id(i)
+        record.set_filepath(filepath)
+        record.set_img_size(ImgSize(width=64, height=64))
+        record.detection.set_class_map(class_map)
+        record.detection.add_labels_by_id(
+            np.random.randint(1, num_classes, num_annotations)
+        )
+        record.detection.add_bboxes(
+            [BBox.from_xywh(1, 1, 10, 10) for _ in range(num_annotations)]
+        )
+        record.detection.add_areas([100.0] * num_annotations)
+        record.detection.add_iscrowds([0] * num_annotations)
+        records.append(record)
+
+    return records
+
+
+def deepcopy_load(record):
+    """Previous implementation of `BaseRecord.load`."""
+    record = deepcopy(record)
+    record.reduce_on_components("_load")
+    return record
+
+
+def samples_per_sec(load_fn, records, repeat=3):
+    seconds = min(
+        timeit.repeat(lambda: [load_fn(r) for r in records], number=1, repeat=repeat)
+    )
+    return len(records) / seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-records", type=int, default=1000)
+    parser.add_argument("--num-annotations", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = Path(tmp_dir) / "img.jpg"
+        PIL.Image.new("RGB", (64, 64)).save(filepath)
+        records = create_records(filepath, args.num_records, args.num_annotations)
+
+        before = samples_per_sec(deepcopy_load, records)
+        after = samples_per_sec(lambda record: record.load(), records)
+
+    print(f"deepcopy load:   {before:10.1f} samples/sec")
+    print(f"structured load: {after:10.1f} samples/sec ({after / before:.1f}x)")
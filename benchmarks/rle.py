@@ -0,0 +1,73 @@
+"""Benchmarks RLE encoding and decoding of a stack of masks, comparing the
+vectorized functions in `icevision.core.mask` against the previous
+`itertools.groupby` implementation and pycocotools.
+
+Usage: `python benchmarks/rle.py --num-masks 100 --size 1024`
+"""
+import argparse
+import timeit
+from icevision.all import *
+
+
+def create_masks(num_masks, size):
+    masks = np.zeros((num_masks, size, size), dtype=np.uint8)
+    for mask in masks:
+        x, y = np.random.randint(0, size // 2, 2)
+        w, h = np.random.randint(1, size // 2, 2)
+        mask[y : y + h, x : x + w] = 1
+    return masks
+
+
+def groupby_encode(masks):
+    """Previous implementation of `MaskArray.to_coco_rle`."""
+    rles = []
+    for mask in masks:
+        counts = []
+        flat = itertools.groupby(mask.ravel(order="F"))
+        for i, (value, elements) in enumerate(flat):
+            if i == 0 and value == 1:
+                counts.append(0)
+            counts.append(len(list(elements)))
+        rles.append(counts)
+    return rles
+
+
+def pycocotools_encode(masks):
+    return mask_utils.encode(np.asfortranarray(masks.transpose(1, 2, 0)))
+
+
+def vectorized_encode(masks):
+    return [compress_counts(counts) for counts in encode_rle(masks)]
+
+
+def pycocotools_decode(erles):
+    return mask_utils.decode(erles).transpose(2, 0, 1)
+
+
+def vectorized_decode(erles):
+    h, w = erles[0]["size"]
+    return decode_rle([decompress_counts(o["counts"]) for o in erles], h=h, w=w)
+
+
+def seconds(fn, *args, repeat=3):
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-masks", type=int, default=100)
+    parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args()
+
+    masks = create_masks(args.num_masks, args.size)
+    erles = pycocotools_encode(masks)
+
+    results = {
+        "encode groupby": seconds(groupby_encode, masks, repeat=1),
+        "encode pycocotools": seconds(pycocotools_encode, masks),
+        "encode vectorized": seconds(vectorized_encode, masks),
+        "decode pycocotools": seconds(pycocotools_decode, erles),
+        "decode vectorized": seconds(vectorized_decode, erles),
+    }
+    for name, t in results.items():
+        print(f"{name:20} {1e3 * t:10.1f} ms")
@@ -8,6 +8,9 @@ from icevision.core.bbox import *
 from icevision.core.record_type import *
 from icevision.core.record_components import *
 from icevision.core.record import *
+from icevision.core.record_collection import *
+from icevision.core.record_cache import *
+from icevision.core.batch_autofix import *
 from icevision.core.keypoints import *
 from icevision.core.record_utils import *
 from icevision.core.record_defaults import *
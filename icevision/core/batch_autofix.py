@@ -0,0 +1,211 @@
+__all__ = ["AutofixReport", "batch_autofix_records"]
+
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core.exceptions import *
+from icevision.core.bbox import *
+from icevision.core.record_components import *
+from icevision.core.record import *
+
+
+@dataclass
+class AutofixReport:
+    """Summary of a `batch_autofix_records` run.
+
+    # Arguments
+        num_records: Number of records received.
+        counts: Number of occurrences of each failure type, one of
+            `missing_file`, `wrong_num_annotations`, `invalid_record`,
+            `clipped_bboxes`, `invalid_bboxes` and `removed_annotations`.
+        removed_record_ids: Ids of the records that could not be autofixed.
+    """
+
+    num_records: int = 0
+    counts: Dict[str, int] = dataclasses.field(default_factory=dict)
+    removed_record_ids: List[Hashable] = dataclasses.field(default_factory=list)
+
+    def count(self, failure_type: str, n: int = 1):
+        if n > 0:
+            self.counts[failure_type] = self.counts.get(failure_type, 0) + int(n)
+
+    def remove_record(self, record_id: Hashable, failure_type: str):
+        self.removed_record_ids.append(record_id)
+        self.count(failure_type)
+
+    def merge(self, other: "AutofixReport") -> "AutofixReport":
+        self.num_records += other.num_records
+        for failure_type, n in other.counts.items():
+            self.count(failure_type, n)
+        self.removed_record_ids.extend(other.removed_record_ids)
+        return self
+
+    def log(self):
+        counts = ", ".join(f"{k}: {v}" for k, v in sorted(self.counts.items()))
+        logger.log(
+            "AUTOFIX-REPORT",
+            "Autofixed {} records, {} were removed ({})",
+            self.num_records,
+            len(self.removed_record_ids),
+            counts or "no issues found",
+        )
+
+
+def batch_autofix_records(
+    records: Sequence[BaseRecord], num_workers: int = 0, show_pbar: bool = True
+) -> Tuple[List[BaseRecord], AutofixReport]:
+    """Vectorized version of `autofix_records`, meant for big datasets.
+
+    The result is the same as calling `BaseRecord.autofix` on each record, but:
+        * File existence is checked against a single listing of each image directory.
+        * Bounding boxes of all records are clipped and validated in one pass
+          as arrays, the fixed boxes are stored as a `BBoxArray`.
+        * Instead of logging every fix, a single `AutofixReport` is returned.
+
+    # Arguments
+        records: Records to be autofixed.
+        num_workers: If greater than zero, records are split in shards that are
+            autofixed by a pool of processes. Returned records are then copies
+            of the original ones.
+        show_pbar: Whether or not to show a progress bar over the shards.
+
+    # Returns
+        The records that could be autofixed and the report.
+    """
+    report = AutofixReport()
+
+    # checking before sharding, so each directory is only listed once
+    exists = _filepaths_exist(records)
+    shard_records = []
+    for record, record_exists in zip(records, exists):
+        if record_exists:
+            shard_records.append(record)
+        else:
+            report.remove_record(record.record_id, "missing_file")
+
+    num_shards = num_workers * 4 if num_workers > 0 else 1
+    results = parallel_map(
+        _autofix_shard,
+        chunks(shard_records, num_shards),
+        num_workers=num_workers,
+        show_pbar=show_pbar,
+    )
+
+    keep_records = []
+    for shard_keep_records, shard_report in results:
+        keep_records.extend(shard_keep_records)
+        report.merge(shard_report)
+    report.num_records = len(records)
+
+    return keep_records, report
+
+
+def _filepaths_exist(records: Sequence[BaseRecord]) -> List[bool]:
+    listings = {}
+    exists = []
+    for record in records:
+        filepath = getattr(record, "filepath", None)
+        if filepath is None:
+            exists.append(True)
+            continue
+
+        directory = filepath.parent
+        if directory not in listings:
+            try:
+                listings[directory] = set(os.listdir(directory))
+            except (FileNotFoundError, NotADirectoryError):
+                listings[directory] = set()
+        exists.append(filepath.name in listings[directory])
+
+    return exists
+
+
+def _autofix_shard(
+    records: Sequence[BaseRecord],
+) -> Tuple[List[BaseRecord], AutofixReport]:
+    report = AutofixReport()
+
+    valid_records = []
+    for record in records:
+        try:
+            record.check_num_annotations()
+            valid_records.append(record)
+        except AutofixAbort:
+            report.remove_record(record.record_id, "wrong_num_annotations")
+
+    bboxes_success = _autofix_bboxes(valid_records, report=report)
+
+    keep_records = []
+    for record, record_bboxes_success in zip(valid_records, bboxes_success):
+        try:
+            success = _autofix_other_components(record)
+        except AutofixAbort:
+            report.remove_record(record.record_id, "invalid_record")
+            continue
+
+        for task_name, task_success in record_bboxes_success.items():
+            success[task_name].append(task_success)
+
+        for task_name, success_list in success.items():
+            keep_mask = np.logical_and.reduce(np.array(success_list), axis=0)
+            discard_idxs = np.where(~keep_mask)[0]
+            for i in discard_idxs[::-1]:
+                record.remove_annotation(task_name=task_name, i=i)
+            report.count("removed_annotations", len(discard_idxs))
+
+        keep_records.append(record)
+
+    return keep_records, report
+
+
+def _autofix_bboxes(
+    records: Sequence[BaseRecord], report: AutofixReport
+) -> List[Dict[str, np.ndarray]]:
+    """Clips and validates the bboxes of all records at once."""
+    components, record_idxs, bboxes, img_sizes = [], [], [], []
+    for i, record in enumerate(records):
+        for component in record.components:
+            if isinstance(component, BBoxesRecordComponent):
+                components.append(component)
+                record_idxs.append(i)
+                bboxes.append(BBoxArray.from_bboxes(component.bboxes).xyxy)
+                img_sizes.append((record.width, record.height))
+
+    success = [{} for _ in records]
+    if len(components) == 0:
+        return success
+
+    lengths = [len(o) for o in bboxes]
+    all_bboxes = BBoxArray.from_xyxy(np.concatenate(bboxes))
+    img_w, img_h = np.repeat(np.array(img_sizes, dtype=np.float32), lengths, axis=0).T
+
+    inside = all_bboxes.is_inside(img_w=img_w, img_h=img_h)
+    all_bboxes = BBoxArray.from_xyxy(
+        np.clip(all_bboxes.xyxy, 0, np.stack([img_w, img_h, img_w, img_h], axis=1))
+    )
+    valid = all_bboxes.is_valid()
+    report.count("clipped_bboxes", (~inside).sum())
+    report.count("invalid_bboxes", (~valid).sum())
+
+    splits = np.cumsum(lengths)[:-1]
+    for component, i, xyxy, component_valid in zip(
+        components,
+        record_idxs,
+        np.split(all_bboxes.xyxy, splits),
+        np.split(valid, splits),
+    ):
+        component.set_bboxes(BBoxArray.from_xyxy(xyxy))
+        success[i][component.task.name] = component_valid
+
+    return success
+
+
+def _autofix_other_components(record: BaseRecord) -> Dict[str, List[List[bool]]]:
+    success = defaultdict(list)
+    for component in record.components:
+        # already handled in a vectorized way
+        if isinstance(component, (FilepathRecordComponent, BBoxesRecordComponent)):
+            continue
+        for component_success in component._autofix().values():
+            success[component.task.name].append(component_success)
+
+    return success
@@ -1,4 +1,4 @@
-__all__ = ["BBox"]
+__all__ = ["BBox", "BBoxArray"]
 
 from icevision.imports import *
 from icevision.utils import *
@@ -170,3 +170,170 @@ class BBox:
             # just went out of the image dimensions
             raise ValueError(f"invalid RLE or image dimensions: x1={x1} > shape[1]={w}")
         return cls.from_xyxy(x0, y0, x1, y1)
+
+
+class BBoxArray:
+    """Vectorized representation of multiple bounding boxes.
+
+    Stores all boxes as a single `(N, 4)` float32 array in the `xyxy` format, so
+    conversions, clipping and validity checks run as array operations instead of
+    looping over `BBox` objects. Iterating or indexing with an `int` returns `BBox`
+    objects, which keeps it compatible with code expecting a list of `BBox`.
+
+    Should **not** be instantiated directly, instead use `from_*` methods.
+    e.g. `from_xyxy`, `from_xywh`, `from_bboxes`.
+
+    # Examples
+
+    Create from `xywh` format, and get `xyxy` coordinates.
+    ```python
+    bboxes = BBoxArray.from_xywh([[1, 1, 4, 4], [2, 2, 1, 1]])
+    xyxy = bboxes.xyxy
+    ```
+    """
+
+    def __init__(self, data: np.ndarray):
+        self.data = np.asarray(data, dtype=np.float32).reshape(-1, 4)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} with {len(self)} bboxes>"
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        for xyxy in self.data.tolist():
+            yield BBox.from_xyxy(*xyxy)
+
+    def __getitem__(self, i) -> Union[BBox, "BBoxArray"]:
+        if isinstance(i, (int, np.integer)):
+            return BBox.from_xyxy(*self.data[i].tolist())
+        return type(self)(self.data[i])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BBoxArray):
+            return np.array_equal(self.data, other.data)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return False
+
+    def pop(self, i: int) -> BBox:
+        bbox = self[i]
+        self.data = np.delete(self.data, i, axis=0)
+        return bbox
+
+    def extend(self, bboxes: Union[Sequence[BBox], "BBoxArray"]):
+        self.data = np.concatenate([self.data, BBoxArray.from_bboxes(bboxes).data])
+
+    @property
+    def xmin(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def ymin(self) -> np.ndarray:
+        return self.data[:, 1]
+
+    @property
+    def xmax(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    @property
+    def ymax(self) -> np.ndarray:
+        return self.data[:, 3]
+
+    @property
+    def width(self) -> np.ndarray:
+        return self.xmax - self.xmin
+
+    @property
+    def height(self) -> np.ndarray:
+        return self.ymax - self.ymin
+
+    @property
+    def area(self) -> np.ndarray:
+        return self.width * self.height
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        return self.data
+
+    @property
+    def yxyx(self) -> np.ndarray:
+        return self.data[:, [1, 0, 3, 2]]
+
+    @property
+    def xywh(self) -> np.ndarray:
+        return np.stack([self.xmin, self.ymin, self.width, self.height], axis=1)
+
+    def relative_xcycwh(self, img_width: int, img_height: int) -> np.ndarray:
+        scale = np.array(
+            [img_width, img_height, img_width, img_height], dtype=np.float32
+        )
+        x, y, w, h = (self.xywh / scale).T
+        return np.stack([x + 0.5 * w, y + 0.5 * h, w, h], axis=1)
+
+    def to_tensor(self) -> Tensor:
+        return torch.from_numpy(np.ascontiguousarray(self.data))
+
+    def clip(self, img_w, img_h) -> "BBoxArray":
+        """Returns a new `BBoxArray` with coordinates clipped to the image size."""
+        max_xyxy = np.array([img_w, img_h, img_w, img_h], dtype=np.float32)
+        return type(self)(np.clip(self.data, 0, max_xyxy))
+
+    def is_inside(self, img_w, img_h) -> np.ndarray:
+        """Mask of the boxes that are fully inside the image."""
+        return (
+            (self.xmin >= 0)
+            & (self.ymin >= 0)
+            & (self.xmax <= img_w)
+            & (self.ymax <= img_h)
+        )
+
+    def is_valid(self) -> np.ndarray:
+        """Mask of the boxes that have a positive width and height."""
+        return (self.xmin < self.xmax) & (self.ymin < self.ymax)
+
+    def autofix(self, img_w, img_h, record_id: Optional[Any] = None) -> np.ndarray:
+        """Clips all coordinates to the image size, vectorized version of `BBox.autofix`.
+
+        # Returns
+        - A boolean mask where `False` marks the boxes that could not be fixed.
+        """
+        inside = self.is_inside(img_w=img_w, img_h=img_h)
+        if not inside.all():
+            autofix_log(
+                "AUTOFIX-SUCCESS",
+                "Clipping bboxes with indexes {} to image size (width: {}, height: {})",
+                np.where(~inside)[0].tolist(),
+                img_w,
+                img_h,
+                record_id=record_id,
+            )
+            self.data = self.clip(img_w=img_w, img_h=img_h).data
+
+        valid = self.is_valid()
+        if not valid.all():
+            autofix_log(
+                "AUTOFIX-FAIL",
+                "Cannot auto-fix coordinates of bboxes with indexes {}, "
+                "x_min or y_min is greater than or equal to x_max or y_max",
+                np.where(~valid)[0].tolist(),
+                record_id=record_id,
+            )
+
+        return valid
+
+    @classmethod
+    def from_xyxy(cls, xyxy: np.ndarray):
+        return cls(xyxy)
+
+    @classmethod
+    def from_xywh(cls, xywh: np.ndarray):
+        xywh = np.asarray(xywh, dtype=np.float32).reshape(-1, 4)
+        return cls(np.concatenate([xywh[:, :2], xywh[:, :2] + xywh[:, 2:]], axis=1))
+
+    @classmethod
+    def from_bboxes(cls, bboxes: Union[Sequence[BBox], "BBoxArray"]):
+        if isinstance(bboxes, BBoxArray):
+            return bboxes
+        return cls([bbox.xyxy for bbox in bboxes])
@@ -56,6 +56,13 @@ class ClassMap:
         self._class2id[name] = id
         return id
 
+    def update(self, other: "ClassMap") -> "ClassMap":
+        """Adds the names from `other` that are not present yet, in the same order."""
+        for name in other._id2class:
+            if name not in self._class2id:
+                self.add_name(name)
+        return self
+
     def lock(self):
         self._lock = True
         return self
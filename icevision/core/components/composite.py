@@ -19,6 +19,13 @@ class TaskComponent(Component):
         self.task = task
 
 
+# Attribute resolution tables, shared by all composites with the same structure.
+# Maps attribute names to where they were found the last time, so lookups don't
+# need to go through all components every time.
+_ATTR_TABLES: Dict[tuple, Dict[str, Any]] = {}
+_COMMON, _TASK, _PARENT = "common", "task", -1
+
+
 class TaskComposite:
     base_components = set()
 
@@ -29,22 +36,49 @@ class TaskComposite:
         self.set_task_components(self.components)
 
     def __getattr__(self, name):
-        if name == "task_composites":
+        if name in ["task_composites", "_attr_table"]:
             raise AttributeError(name)
 
+        owner = self._attr_table.get(name)
+        if owner == _TASK:
+            return self.task_composites[name]
+        if owner == _COMMON:
+            try:
+                return getattr(self.task_composites[tasks.common.name], name)
+            except AttributeError:
+                pass
+
         # TODO: Possible bug if no task with _default is passed
         try:
-            return getattr(self.task_composites[tasks.common.name], name)
+            value = getattr(self.task_composites[tasks.common.name], name)
+            self._attr_table[name] = _COMMON
+            return value
         except AttributeError:
             pass
 
         try:
-            return self.task_composites[name]
+            value = self.task_composites[name]
+            self._attr_table[name] = _TASK
+            return value
         except KeyError:
             pass
 
         raise AttributeError(f"{self.__class__.__name__} has no attribute {name}")
 
+    def __getstate__(self):
+        # the resolution table is shared, don't pickle (or deepcopy) it
+        state = self.__dict__.copy()
+        state.pop("_attr_table", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._set_attr_table()
+
+    def _set_attr_table(self):
+        key = (self.__class__, tuple(self.task_composites.keys()))
+        self._attr_table = _ATTR_TABLES.setdefault(key, {})
+
     def add_component(self, component: TaskComponent):
         self.components.add(component)
         self.set_task_components(self.components)
@@ -64,6 +98,8 @@ class TaskComposite:
             if task != tasks.common:
                 composite.set_parent(self)
 
+        self._set_attr_table()
+
     # TODO: rename reduce_on_all_tasks_components
     def reduce_on_components(
         self,
@@ -101,22 +137,50 @@ class Composite:
 
     def __getattr__(self, name):
         # avoid recursion https://nedbatchelder.com/blog/201010/surprising_getattr_recursion.html
-        if name in ["components", "_parent"]:
+        if name in ["components", "_parent", "_attr_table"]:
             raise AttributeError(name)
+
+        # fast path, the owner was already resolved by a composite with same components
+        i = self._attr_table.get(name)
+        if i is not None:
+            owner = self._parent if i == _PARENT else self.components[i]
+            try:
+                return getattr(owner, name)
+            except AttributeError:
+                pass
+
         # delegates attributes to components
-        for component in self.components:
+        for i, component in enumerate(self.components):
             try:
-                return getattr(component, name)
+                value = getattr(component, name)
+                self._attr_table[name] = i
+                return value
             except AttributeError:
                 pass
         # delegates attributes to parent
         try:
-            return getattr(self._parent, name)
+            value = getattr(self._parent, name)
+            self._attr_table[name] = _PARENT
+            return value
         except AttributeError:
             pass
 
         raise AttributeError(f"{self.__class__.__name__} has no attribute {name}")
 
+    def __getstate__(self):
+        # the resolution table is shared, don't pickle (or deepcopy) it
+        state = self.__dict__.copy()
+        state.pop("_attr_table", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._set_attr_table()
+
+    def _set_attr_table(self):
+        key = (self.__class__, tuple(self.components_cls), self._parent is not None)
+        self._attr_table = _ATTR_TABLES.setdefault(key, {})
+
     def reduce_on_components(
         self, fn_name: str, reduction: Optional[str] = None, **fn_kwargs
     ) -> Any:
@@ -151,5 +215,8 @@ class Composite:
         for component in self.components:
             component.set_composite(self)
 
+        self._set_attr_table()
+
     def set_parent(self, parent):
         self._parent = parent
+        self._set_attr_table()
@@ -17,18 +17,47 @@ class KeypointsMetadata:
 
 
 class KeyPoints:
+    """Keypoints of an instance, stored in a flat array `(x1, y1, v1, x2, ...)`.
+
+    `data` ((K, 3) array), `x`, `y` and `visible` are views into it. Keypoints of
+    all the instances of a record are best set together from a (N, K, 3) array,
+    see `KeyPointsRecordComponent.set_keypoints_data`.
+    """
+
     def __init__(
         self, keypoints: Union[List[int], np.array], metadata: Type[KeypointsMetadata]
     ):
-        self.keypoints = np.array(keypoints)
-        self.x = self.keypoints[0::3]
-        self.y = self.keypoints[1::3]
-        self.visible = self.keypoints[2::3]
-        self.xy = [(x, y) for x, y in zip(self.x, self.y)]
-        self.n_visible_keypoints = (self.visible > 0).sum()
-        self.xyv = [(x, y, v) for x, y, v in zip(self.x, self.y, self.visible)]
+        self.keypoints = np.asarray(keypoints)
         self.metadata = metadata
 
+    @property
+    def data(self) -> np.ndarray:
+        return self.keypoints.reshape(-1, 3)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.keypoints[0::3]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.keypoints[1::3]
+
+    @property
+    def visible(self) -> np.ndarray:
+        return self.keypoints[2::3]
+
+    @property
+    def xy(self) -> List[tuple]:
+        return [(x, y) for x, y in zip(self.x, self.y)]
+
+    @property
+    def xyv(self) -> List[tuple]:
+        return [(x, y, v) for x, y, v in zip(self.x, self.y, self.visible)]
+
+    @property
+    def n_visible_keypoints(self) -> int:
+        return (self.visible > 0).sum()
+
     @classmethod
     def from_xyv(cls, keypoints, labels):
         return cls(keypoints, labels)
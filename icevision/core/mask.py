@@ -1,11 +1,19 @@
 __all__ = [
     "Mask",
     "MaskArray",
+    "PackedMaskArray",
+    "CroppedMaskArray",
     "MaskFile",
     "VocMaskFile",
     "RLE",
     "Polygon",
     "EncodedRLEs",
+    "encode_rle",
+    "decode_rle",
+    "kaggle_to_coco_counts",
+    "coco_to_kaggle_counts",
+    "compress_counts",
+    "decompress_counts",
 ]
 
 from icevision.imports import *
@@ -24,6 +32,12 @@ class Mask(ABC):
 
 
 class EncodedRLEs(Mask):
+    """List of pycocotools encoded RLEs, one per object.
+
+    Flips, crops and resizes can be applied directly on the encoding with `hflip`,
+    `vflip`, `crop` and `resize`, without ever decoding the masks.
+    """
+
     def __init__(self, erles: List[dict] = None):
         self.erles = erles or []
 
@@ -49,6 +63,8 @@ class EncodedRLEs(Mask):
         self.erles.pop(i)
 
     def to_mask(self, h, w) -> "MaskArray":
+        if len(self.erles) == 0:
+            return MaskArray(np.zeros((0, h, w), dtype=np.uint8))
         mask = mask_utils.decode(self.erles)
         mask = mask.transpose(2, 0, 1)  # channels first
         return MaskArray(mask)
@@ -56,21 +72,315 @@ class EncodedRLEs(Mask):
     def to_erles(self, h, w) -> "EncodedRLEs":
         return self
 
+    def hflip(self) -> "EncodedRLEs":
+        """Horizontally flips all masks."""
+        return self._map_runs(_hflip_runs)
+
+    def vflip(self) -> "EncodedRLEs":
+        """Vertically flips all masks."""
+        return self._map_runs(_vflip_runs)
+
+    def crop(self, xmin: int, ymin: int, xmax: int, ymax: int) -> "EncodedRLEs":
+        """Crops all masks to the region [xmin, xmax) x [ymin, ymax)."""
+        return self._map_runs(partial(_crop_runs, box=(xmin, ymin, xmax, ymax)))
+
+    def resize(self, height: int, width: int) -> "EncodedRLEs":
+        """Resizes all masks with nearest neighbor interpolation."""
+        return self._map_runs(partial(_resize_runs, size=(height, width)))
+
+    def _map_runs(self, fn: Callable) -> "EncodedRLEs":
+        erles = []
+        for erle in self.erles:
+            h, w = erle["size"]
+            runs, h, w = fn(_erle_to_runs(erle), h=h, w=w)
+            erles.append(_runs_to_erle(runs, h=h, w=w))
+        return type(self)(erles)
+
+
+def encode_rle(masks: np.ndarray) -> List[np.ndarray]:
+    """Encodes a stack of binary masks into COCO (uncompressed) RLE counts.
+
+    Changes of value are found for all masks at once, instead of iterating over
+    the pixels of each mask.
+
+    # Arguments
+        masks: Array of shape (num_instances, height, width).
+
+    # Returns
+        The counts of each mask, in column major order and starting with zeros.
+    """
+    n, h, w = masks.shape
+    if n == 0:
+        return []
+    # column major order, as expected by COCO
+    flat = masks.transpose(0, 2, 1).reshape(n, h * w).astype(bool)
+
+    changes = np.empty_like(flat)
+    changes[:, 0] = flat[:, 0]
+    np.not_equal(flat[:, 1:], flat[:, :-1], out=changes[:, 1:])
+    mask_idxs, positions = np.nonzero(changes)
+
+    splits = np.cumsum(np.bincount(mask_idxs, minlength=n))[:-1]
+    return [np.diff(o, prepend=0, append=h * w) for o in np.split(positions, splits)]
+
+
+def decode_rle(counts: Sequence[Sequence[int]], h: int, w: int) -> np.ndarray:
+    """Decodes COCO (uncompressed) RLE counts, inverse of `encode_rle`.
+
+    # Returns
+        Array of shape (num_instances, height, width).
+    """
+    n = len(counts)
+    deltas = np.zeros(n * h * w + 1, dtype=np.int8)
+    for i, mask_counts in enumerate(counts):
+        edges = np.cumsum(mask_counts) + i * h * w
+        # counts alternate between zeros and ones, starting with zeros
+        starts, ends = edges[0::2][: len(edges) // 2], edges[1::2]
+        np.add.at(deltas, starts, 1)
+        np.add.at(deltas, ends, -1)
+
+    flat = np.cumsum(deltas[:-1], dtype=np.int8).astype(np.uint8)
+    return flat.reshape(n, w, h).transpose(0, 2, 1)
+
+
+def kaggle_to_coco_counts(counts: Sequence[int]) -> np.ndarray:
+    """Converts Kaggle (start, length) pairs, with 1-indexed starts, to COCO counts."""
+    if len(counts) % 2 != 0:
+        raise ValueError("Counts must be divisible by 2")
+    if len(counts) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    counts = np.asarray(counts, dtype=np.int64)
+    starts, lengths = counts[0::2], counts[1::2]
+    previous_ends = np.concatenate([[1], starts[:-1] + lengths[:-1]])
+
+    coco_counts = np.empty_like(counts)
+    coco_counts[0::2] = starts - previous_ends  # zeros
+    coco_counts[1::2] = lengths  # ones
+    # remove trailing zero
+    if coco_counts[-1] == 0:
+        coco_counts = coco_counts[:-1]
+    return coco_counts
+
+
+def coco_to_kaggle_counts(counts: Sequence[int]) -> np.ndarray:
+    """Converts COCO counts to Kaggle (start, length) pairs, inverse of
+    `kaggle_to_coco_counts`.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    # when counts is odd, round it with 0 ones at the end
+    if len(counts) % 2 != 0:
+        counts = np.append(counts, 0)
+
+    zeros, ones = counts[0::2], counts[1::2]
+    kaggle_counts = np.empty_like(counts)
+    kaggle_counts[0::2] = np.cumsum(zeros + ones) - ones + 1
+    kaggle_counts[1::2] = ones
+    return kaggle_counts
+
+
+def compress_counts(counts: Sequence[int]) -> bytes:
+    """Compresses COCO counts into the pycocotools string format (`rleToString`).
+
+    Each count (as a difference to the count two positions before) is written as
+    groups of 5 bits, all counts are processed at once group by group.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    x = counts.copy()
+    x[3:] -= counts[1:-2]
+
+    groups, alive = [], np.ones(len(x), dtype=bool)
+    while alive.any():
+        c = x & 0x1F
+        x = x >> 5
+        more = np.where(c & 0x10, x != -1, x != 0)
+        groups.append(np.where(alive, (c | (more << 5)) + 48, -1))
+        alive &= more
+
+    if not groups:
+        return b""
+    chars = np.stack(groups, axis=1).reshape(-1)
+    return chars[chars >= 0].astype(np.uint8).tobytes()
+
+
+def decompress_counts(s: Union[str, bytes]) -> np.ndarray:
+    """Decompresses counts from the pycocotools string format (`rleFrString`),
+    inverse of `compress_counts`.
+    """
+    s = s.encode() if isinstance(s, str) else s
+    c = np.frombuffer(s, dtype=np.uint8).astype(np.int64) - 48
+    if len(c) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    is_last = (c & 0x20) == 0
+    ends = np.flatnonzero(is_last)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    group_idxs = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    positions = np.arange(len(c)) - starts[group_idxs]
+
+    x = np.add.reduceat((c & 0x1F) << (5 * positions), starts)
+    # sign extension for negative differences
+    negative = (c[ends] & 0x10) != 0
+    x[negative] |= -1 << (5 * (positions[ends][negative] + 1))
+
+    counts = x.copy()
+    counts[1::2] = np.cumsum(x[1::2])
+    counts[2::2] = np.cumsum(x[2::2])
+    return counts
+
+
+# Masks runs are represented with three arrays: (columns, row_starts, row_ends),
+# each run covering the rows [row_start, row_end) of a single column. COCO RLEs
+# are in column major order, so going from and to counts is cheap.
+def _erle_to_runs(erle: dict):
+    h, w = erle["size"]
+    counts = erle["counts"]
+    if isinstance(counts, (str, bytes)):
+        counts = decompress_counts(counts)
+
+    counts = np.asarray(counts, dtype=np.int64)
+    ends = np.cumsum(counts)
+    # counts alternate between zeros and ones, starting with zeros
+    starts, ends = (ends - counts)[1::2], ends[1::2]
+    nonempty = ends > starts
+    starts, ends = starts[nonempty], ends[nonempty]
+
+    # split runs that span multiple columns
+    first_col, last_col = starts // h, (ends - 1) // h
+    num_cols = last_col - first_col + 1
+    group_starts = np.repeat(np.cumsum(num_cols) - num_cols, num_cols)
+    cols = np.repeat(first_col, num_cols) + np.arange(num_cols.sum()) - group_starts
+    row_starts = np.maximum(np.repeat(starts, num_cols) - cols * h, 0)
+    row_ends = np.minimum(np.repeat(ends, num_cols) - cols * h, h)
+
+    return cols, row_starts, row_ends
+
+
+def _runs_to_erle(runs, h: int, w: int) -> dict:
+    cols, row_starts, row_ends = runs
+    nonempty = row_ends > row_starts
+    cols, row_starts, row_ends = (
+        cols[nonempty],
+        row_starts[nonempty],
+        row_ends[nonempty],
+    )
+
+    order = np.lexsort((row_starts, cols))
+    starts = (cols * h + row_starts)[order]
+    ends = (cols * h + row_ends)[order]
+    # merge runs that continue in the next column
+    is_new = np.ones(len(starts), dtype=bool)
+    is_new[1:] = starts[1:] != ends[:-1]
+    is_last = np.ones(len(starts), dtype=bool)
+    is_last[:-1] = is_new[1:]
+    starts, ends = starts[is_new], ends[is_last]
+
+    edges = np.empty(2 * len(starts) + 2, dtype=np.int64)
+    edges[0], edges[-1] = 0, h * w
+    edges[1:-1:2], edges[2:-1:2] = starts, ends
+    counts = np.diff(edges)
+    # pycocotools does not store trailing zeros
+    if len(counts) > 1 and counts[-1] == 0:
+        counts = counts[:-1]
+
+    return {"size": [h, w], "counts": compress_counts(counts)}
+
+
+def _hflip_runs(runs, h, w):
+    cols, row_starts, row_ends = runs
+    return (w - 1 - cols, row_starts, row_ends), h, w
+
+
+def _vflip_runs(runs, h, w):
+    cols, row_starts, row_ends = runs
+    return (cols, h - row_ends, h - row_starts), h, w
+
+
+def _crop_runs(runs, h, w, box):
+    cols, row_starts, row_ends = runs
+    xmin, ymin, xmax, ymax = box
+    xmin, ymin = max(xmin, 0), max(ymin, 0)
+    xmax, ymax = min(xmax, w), min(ymax, h)
+
+    keep = (cols >= xmin) & (cols < xmax)
+    cols = cols[keep] - xmin
+    row_starts = np.clip(row_starts[keep], ymin, ymax) - ymin
+    row_ends = np.clip(row_ends[keep], ymin, ymax) - ymin
+    return (cols, row_starts, row_ends), ymax - ymin, xmax - xmin
+
+
+def _resize_runs(runs, h, w, size):
+    """Nearest neighbor, output pixel `i` samples input pixel `floor(i * old / new)`."""
+    cols, row_starts, row_ends = runs
+    new_h, new_w = size
+    # first output row/col that samples from a given input row/col
+    ceil_div = lambda a, b: -(-a // b)
+    row_starts = ceil_div(row_starts * new_h, h)
+    row_ends = ceil_div(row_ends * new_h, h)
+
+    col_starts = ceil_div(cols * new_w, w)
+    num_cols = ceil_div((cols + 1) * new_w, w) - col_starts
+    group_starts = np.repeat(np.cumsum(num_cols) - num_cols, num_cols)
+    new_cols = (
+        np.repeat(col_starts, num_cols) + np.arange(num_cols.sum()) - group_starts
+    )
+    runs = (
+        new_cols,
+        np.repeat(row_starts, num_cols),
+        np.repeat(row_ends, num_cols),
+    )
+    return runs, new_h, new_w
+
 
 # TODO: Assert shape? (bs, height, width)
 class MaskArray(Mask):
     """Binary numpy array representation of a mask.
 
+    When created with `from_erles` the masks are only decoded the first time `data`
+    is accessed. Until then `to_erles` returns the original encoding instead of
+    encoding the masks again, once decoded the masks can be modified in place and
+    are encoded again.
+
     # Arguments
         data: Mask array, with the dimensions: (num_instances, height, width)
     """
 
+    _erles, _size = None, None
+
     def __init__(self, data: np.uint8):
         self.data = data.astype(np.uint8)
 
+    @property
+    def data(self) -> np.ndarray:
+        if self._data is None:
+            self._data = self._erles.to_mask(h=self._size[0], w=self._size[1]).data
+            # the decoded masks can be modified in place, the encoding may be stale
+            self._erles = None
+        return self._data
+
+    @data.setter
+    def data(self, data: np.ndarray):
+        self._data = data
+        self._erles = None
+
     def __len__(self):
+        if self._data is None:
+            return len(self._erles)
         return len(self.data)
 
+    def __getstate__(self):
+        # the decoded masks can be recreated from the encoding, no need to store them
+        state = self.__dict__.copy()
+        if state["_erles"] is not None:
+            state["_data"] = None
+        return state
+
+    def __setstate__(self, state):
+        # pickled by a previous version, before `data` was a property
+        if "data" in state:
+            state["_data"] = state.pop("data")
+        self.__dict__.update(state)
+
     def __getitem__(self, i):
         return type(self)(self.data[i])
 
@@ -81,38 +391,159 @@ class MaskArray(Mask):
         return self
 
     def to_erles(self, h, w) -> EncodedRLEs:
+        if self._erles is not None:
+            return self._erles
         return EncodedRLEs(
             mask_utils.encode(np.asfortranarray(self.data.transpose(1, 2, 0)))
         )
 
     def to_coco_rle(self, h, w) -> List[dict]:
-        """From https://stackoverflow.com/a/49547872/6772672"""
         assert self.data.shape[1:] == (h, w)
-        rles = []
-        for mask in self.data:
-            counts = []
-            flat = itertools.groupby(mask.ravel(order="F"))
-            for i, (value, elements) in enumerate(flat):
-                if i == 0 and value == 1:
-                    counts.append(0)
-                counts.append(len(list(elements)))
-            rles.append({"counts": counts, "size": (h, w)})
-        return rles
+        return [
+            {"counts": counts.tolist(), "size": (h, w)}
+            for counts in encode_rle(self.data)
+        ]
 
     @property
     def shape(self):
+        if self._data is None:
+            erles = self._erles.erles
+            h, w = erles[0]["size"] if len(erles) > 0 else self._size
+            return (len(erles), h, w)
         return self.data.shape
 
+    @classmethod
+    def from_erles(cls, erles: EncodedRLEs, h: int, w: int) -> "MaskArray":
+        """Creates a `MaskArray` that lazily decodes `erles`."""
+        mask = cls.__new__(cls)
+        mask._data, mask._erles, mask._size = None, erles, (h, w)
+        return mask
+
     @classmethod
     def from_masks(cls, masks: Union[EncodedRLEs, Sequence[Mask]], h: int, w: int):
         # HACK: check for backwards compatibility
         if isinstance(masks, EncodedRLEs):
-            return masks.to_mask(h, w)
+            return cls.from_erles(masks, h=h, w=w)
         else:
             masks_arrays = [o.to_mask(h=h, w=w).data for o in masks]
             return cls(np.concatenate(masks_arrays))
 
 
+class PackedMaskArray(Mask):
+    """Bit-packed binary masks, 8 times smaller than a `MaskArray`.
+
+    Should **not** be instantiated directly, instead use `from_mask_array`.
+
+    # Arguments
+        packed: Masks packed along the width with `np.packbits`, with the
+            dimensions: (num_instances, height, ceil(width / 8))
+        width: Width of the unpacked masks.
+    """
+
+    def __init__(self, packed: np.ndarray, width: int):
+        self.packed = packed
+        self.width = width
+
+    def __len__(self):
+        return len(self.packed)
+
+    def __getitem__(self, i):
+        return type(self)(self.packed[i], width=self.width)
+
+    @property
+    def shape(self):
+        return (*self.packed.shape[:-1], self.width)
+
+    @property
+    def data(self) -> np.ndarray:
+        return np.unpackbits(self.packed, axis=-1, count=self.width)
+
+    def to_mask(self, h, w) -> MaskArray:
+        return MaskArray(self.data)
+
+    def to_erles(self, h, w) -> EncodedRLEs:
+        return self.to_mask(h=h, w=w).to_erles(h=h, w=w)
+
+    @classmethod
+    def from_mask_array(cls, mask: MaskArray) -> "PackedMaskArray":
+        return cls(np.packbits(mask.data, axis=-1), width=mask.shape[-1])
+
+
+class CroppedMaskArray(Mask):
+    """Binary masks where each instance is only stored inside its bounding box.
+
+    Should **not** be instantiated directly, instead use `from_mask_array`.
+
+    # Arguments
+        crops: One array per instance, with the dimensions: (box_height, box_width)
+        offsets: Array with the (xmin, ymin) position of each crop, with the
+            dimensions: (num_instances, 2)
+        height: Height of the full masks.
+        width: Width of the full masks.
+    """
+
+    def __init__(
+        self, crops: List[np.ndarray], offsets: np.ndarray, height: int, width: int
+    ):
+        self.crops = crops
+        self.offsets = offsets
+        self.height = height
+        self.width = width
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, i):
+        idxs = np.arange(len(self))[i]
+        # an int index selects a single (height, width) mask, as with `MaskArray`
+        crops = self.crops[idxs] if idxs.ndim == 0 else [self.crops[j] for j in idxs]
+        return type(self)(
+            crops=crops,
+            offsets=self.offsets[idxs],
+            height=self.height,
+            width=self.width,
+        )
+
+    @property
+    def shape(self):
+        return (*self.offsets.shape[:-1], self.height, self.width)
+
+    @property
+    def data(self) -> np.ndarray:
+        if self.offsets.ndim == 1:
+            single = type(self)(
+                [self.crops], self.offsets[None], self.height, self.width
+            )
+            return single.data[0]
+
+        data = np.zeros(self.shape, dtype=np.uint8)
+        for mask, crop, (xmin, ymin) in zip(data, self.crops, self.offsets):
+            h, w = crop.shape
+            mask[ymin : ymin + h, xmin : xmin + w] = crop
+        return data
+
+    def to_mask(self, h, w) -> MaskArray:
+        return MaskArray(self.data)
+
+    def to_erles(self, h, w) -> EncodedRLEs:
+        return self.to_mask(h=h, w=w).to_erles(h=h, w=w)
+
+    @classmethod
+    def from_mask_array(cls, mask: MaskArray) -> "CroppedMaskArray":
+        data = mask.data
+        n, height, width = data.shape
+        rows, cols = data.any(axis=2), data.any(axis=1)
+        # empty masks get an empty crop
+        ymin, ymax = rows.argmax(axis=1), height - rows[:, ::-1].argmax(axis=1)
+        xmin, xmax = cols.argmax(axis=1), width - cols[:, ::-1].argmax(axis=1)
+        empty = ~rows.any(axis=1)
+        ymax[empty], xmax[empty] = ymin[empty], xmin[empty]
+
+        crops = [data[i, ymin[i] : ymax[i], xmin[i] : xmax[i]].copy() for i in range(n)]
+        offsets = np.stack([xmin, ymin], axis=1)
+        return cls(crops=crops, offsets=offsets, height=height, width=width)
+
+
 class MaskFile(Mask):
     """Holds the path to mask image file.
 
@@ -151,7 +582,8 @@ class VocMaskFile(MaskFile):
 
     def to_mask(self, h, w) -> MaskArray:
         mask_arr = np.array(Image.open(self.filepath))
-        obj_ids = np.unique(mask_arr)[1:]
+        # palette images are uint8, counting is faster than sorting with `np.unique`
+        obj_ids = np.flatnonzero(np.bincount(mask_arr.ravel(), minlength=256))[1:]
         masks = mask_arr == obj_ids[:, None, None]
 
         if self.drop_void:
@@ -171,21 +603,14 @@ class RLE(Mask):
         self.counts = counts
 
     def to_mask(self, h, w) -> "MaskArray":
-        return self.to_erles(h=h, w=w).to_mask(h=h, w=w)
-        # Convert kaggle counts to mask
-        # "From https://www.kaggle.com/julienbeaulieu/imaterialist-detectron2"
-        # mask = np.full(h * w, 0, dtype=np.uint8)
-        # for start, ones in zip(self.counts[::2], self.counts[1::2]):
-        #     # counting starts on one
-        #     start -= 1
-        #     if ones:
-        #         mask[start : start + ones] = 1
-        # mask = mask.reshape((h, w), order="F")
-        # return MaskArray(mask)
+        return MaskArray(decode_rle([self.to_coco()], h=h, w=w))
 
     def to_coco(self) -> List[int]:
         return self.counts
 
+    def to_kaggle(self) -> List[int]:
+        return coco_to_kaggle_counts(self.counts).tolist()
+
     def to_erles(self, h, w) -> EncodedRLEs:
         return EncodedRLEs(
             mask_utils.frPyObjects([{"counts": self.to_coco(), "size": [h, w]}], h, w)
@@ -198,37 +623,13 @@ class RLE(Mask):
     @classmethod
     def from_kaggle(cls, counts: Sequence[int]):
         """Described [here](https://www.kaggle.com/c/imaterialist-fashion-2020-fgvc7/overview/evaluation)"""
-        if len(counts) % 2 != 0:
-            raise ValueError("Counts must be divisible by 2")
-
-        current = 1
-        coco_counts = []
-        for start, count in zip(counts[::2], counts[1::2]):
-            coco_counts.append(start - current)  # zeros
-            coco_counts.append(count)  # ones
-            current = start + count
-
-        # remove trailing zero
-        if coco_counts[-1] == 0:
-            coco_counts.pop(-1)
-
+        coco_counts = kaggle_to_coco_counts(counts).tolist()
         return cls.from_coco(coco_counts)
 
     @classmethod
     def from_coco(cls, counts: Sequence[int]):
         """Described [here](https://stackoverflow.com/a/49547872/6772672)"""
         return cls(counts)
-        # Convert from kaggle to coco
-        # when counts is odd, round it with 0 ones at the end
-        # if len(counts) % 2 != 0:
-        #     counts = counts + [0]
-        #
-        # kaggle_counts, total = [], 0
-        # for zeros, ones in zip(counts[::2], counts[1::2]):
-        #     start = zeros + total + 1
-        #     kaggle_counts.extend([start, ones])
-        #     total += zeros + ones
-        # return cls.from_kaggle(kaggle_counts)
 
 
 class Polygon(Mask):
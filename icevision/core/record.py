@@ -60,15 +60,73 @@ class BaseRecord(TaskComposite):
     def aggregate_objects(self):
         return self.reduce_on_components("_aggregate_objects", reduction="update")
 
+    def copy(self) -> "BaseRecord":
+        """Cheap alternative to `deepcopy`, used when loading records.
+
+        Components are shallow copied. Lists of annotations and objects modified in
+        place (e.g. `BBox` by `autofix`, the image) are copied, objects that are
+        never modified in place (`ClassMap`, filepaths, `KeyPoints`, encoded masks)
+        are shared until replaced (e.g. by `set_bboxes` or `rescale`).
+        """
+        record = self.__class__.__new__(self.__class__)
+        record.__dict__.update(self.__dict__)
+        record.components = {component._copy() for component in self.components}
+        record.set_task_components(record.components)
+        return record
+
     # Instead of copying here, copy outside?
-    def load(self) -> "BaseRecord":
-        record = deepcopy(self)
+    def load(self, draft_size: Optional[ImgSize] = None) -> "BaseRecord":
+        """Returns a copy of the record with the image (and masks) loaded.
+
+        # Arguments
+            draft_size: If specified, JPEG images are decoded at a reduced scale as
+                long as they stay at least as large as `draft_size` (see `open_img`),
+                the annotations are rescaled to the size of the decoded image.
+        """
+        record = self.copy()
+        if draft_size is not None and getattr(record, "filepath", None) is not None:
+            record.set_rescaled_img(open_img(record.filepath, draft_size=draft_size))
         record.reduce_on_components("_load")
         return record
 
     def unload(self):
         self.reduce_on_components("_unload")
 
+    def rescale(self, img_size: ImgSize) -> None:
+        """Scales the annotations (and `img_size`) to match the image being resized
+        to `img_size`, the image itself is not modified.
+        """
+        from_size = self.img_size
+        self.reduce_on_components("_rescale", from_size=from_size, to_size=img_size)
+
+    def flip(self, horizontal: bool = True) -> None:
+        """Flips the annotations to match the image being flipped horizontally (or
+        vertically), the image itself is not modified.
+        """
+        self.reduce_on_components(
+            "_flip", img_size=self.img_size, horizontal=horizontal
+        )
+
+    def crop(self, xmin: int, ymin: int, xmax: int, ymax: int) -> None:
+        """Moves the annotations (and `img_size`) to match the image being cropped to
+        the region [xmin, xmax) x [ymin, ymax), the image itself is not modified.
+
+        Bounding boxes are clipped to the region, boxes completely outside of it end
+        up empty and are not removed.
+        """
+        self.reduce_on_components(
+            "_crop", img_size=self.img_size, xmin=xmin, ymin=ymin, xmax=xmax, ymax=ymax
+        )
+
+    def set_rescaled_img(self, img: np.ndarray) -> None:
+        """Sets an image resized from `img_size` (e.g. decoded at a reduced scale),
+        the annotations are rescaled to match it.
+        """
+        height, width = img.shape[:2]
+        if self.img_size != (width, height):
+            self.rescale(ImgSize(width=width, height=height))
+        self.set_img(img)
+
     def setup_transform(self, tfm):
         self.reduce_on_components("setup_transform", tfm=tfm)
 
@@ -0,0 +1,371 @@
+__all__ = [
+    "RECORDS_CACHE_VERSION",
+    "CachedRecords",
+    "save_records_cache",
+    "load_records_cache",
+    "read_records_cache",
+    "share_records",
+    "files_fingerprint",
+]
+
+import hashlib, mmap, struct, tempfile, weakref
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core.class_map import *
+from icevision.core.record import *
+
+RECORDS_CACHE_VERSION = 1
+
+# file layout:
+#   header | record 0 | record 1 | ... | offsets | metadata | footer
+# each record is pickled on its own, `offsets` (int64, num_records + 1) marks
+# where each of them starts, objects shared between records (e.g. `ClassMap`)
+# are stored only once in `metadata`
+_MAGIC = b"ICEVREC\x00"
+_HEADER = struct.Struct("<8sI")
+_FOOTER = struct.Struct("<QQQ8s")
+_SHARED_TYPES = (ClassMap,)
+
+
+class _RecordPickler(pickle.Pickler):
+    def __init__(self, file, shared: Dict[int, Tuple[int, Any]]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = shared
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _SHARED_TYPES):
+            key, _ = self.shared.setdefault(id(obj), (len(self.shared), obj))
+            return key
+        return None
+
+
+class _RecordUnpickler(pickle.Unpickler):
+    def __init__(self, file, shared: List[Any]):
+        super().__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, key):
+        return self.shared[key]
+
+
+def files_fingerprint(filepaths: Sequence[Union[str, Path]]) -> List[dict]:
+    """Returns the path, size, modification time and content hash of each file."""
+    return [_file_fingerprint(Path(filepath)) for filepath in filepaths]
+
+
+def _file_fingerprint(filepath: Path, with_hash: bool = True) -> dict:
+    stat = filepath.stat()
+    fingerprint = {
+        "path": str(filepath.resolve()),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+    }
+    if with_hash:
+        fingerprint["hash"] = _file_hash(filepath)
+    return fingerprint
+
+
+def _file_hash(filepath: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _files_changed(fingerprint: List[dict], filepaths: Sequence[Path]) -> bool:
+    """Files are considered unchanged if size and mtime are the same, if only the
+    mtime changed (e.g. the file was touched or copied) the content hash decides.
+    """
+    paths = [str(Path(filepath).resolve()) for filepath in filepaths]
+    if sorted(paths) != sorted(o["path"] for o in fingerprint):
+        return True
+
+    for cached in fingerprint:
+        filepath = Path(cached["path"])
+        try:
+            current = _file_fingerprint(filepath, with_hash=False)
+        except FileNotFoundError:
+            return True
+        if current["size"] != cached["size"]:
+            return True
+        if (
+            current["mtime"] != cached["mtime"]
+            and _file_hash(filepath) != cached["hash"]
+        ):
+            return True
+
+    return False
+
+
+def save_records_cache(
+    filepath: Union[str, Path],
+    splits: Sequence[Sequence[Union[BaseRecord, "CachedRecords"]]],
+    source: Optional[dict] = None,
+    state: Optional[dict] = None,
+) -> None:
+    """Saves parsed records in a binary file that can be memory mapped.
+
+    Records are written one at a time, so the file is never fully built in memory.
+    The file is first written to a temporary path and then moved, processes that
+    are reading a previous version of the cache are not affected.
+
+    # Arguments
+        filepath: Where to save the cache.
+        splits: A list of records for each split, as returned by `Parser.parse`.
+            Instead of a record, an item can be a `CachedRecords`, its records are
+            copied from the cache file they belong to without being unpickled.
+        source: Describes where the records came from, it's compared against the
+            `source` passed to `load_records_cache`. Use `files_fingerprint` for
+            the files entry, so changes to the files invalidate the cache.
+        state: Any other information to be saved with the records, can be
+            retrieved with `read_records_cache`.
+    """
+    filepath = Path(filepath)
+    tmp_filepath = filepath.with_name(f"{filepath.name}.tmp")
+
+    # records of this file are copied as they are, so their shared objects keep
+    # the same keys
+    copy_file = next(
+        (
+            item.records_file
+            for records in splits
+            for item in records
+            if isinstance(item, CachedRecords)
+        ),
+        None,
+    )
+    shared = {}
+    for obj in copy_file.shared if copy_file is not None else []:
+        shared[id(obj)] = (len(shared), obj)
+
+    split_lengths = []
+    with open(tmp_filepath, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, RECORDS_CACHE_VERSION))
+        pickler = _RecordPickler(f, shared=shared)
+
+        offsets = [f.tell()]
+        for records in splits:
+            start = len(offsets)
+            for item in records:
+                if isinstance(item, CachedRecords) and item.records_file is copy_file:
+                    for i in item.idxs:
+                        f.write(copy_file.raw_record(i))
+                        offsets.append(f.tell())
+                    continue
+
+                for record in item if isinstance(item, CachedRecords) else [item]:
+                    pickler.clear_memo()
+                    pickler.dump(record)
+                    offsets.append(f.tell())
+            split_lengths.append(len(offsets) - start)
+
+        f.write(b"\x00" * (-f.tell() % 8))
+        index_offset = f.tell()
+        f.write(np.asarray(offsets, dtype="<i8").tobytes())
+
+        metadata = {
+            "split_lengths": split_lengths,
+            "shared": [obj for _, obj in sorted(shared.values(), key=itemgetter(0))],
+            "source": source or {},
+            "state": state or {},
+        }
+        metadata_offset = f.tell()
+        pickle.dump(metadata, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.write(_FOOTER.pack(index_offset, metadata_offset, len(offsets) - 1, _MAGIC))
+
+    os.replace(tmp_filepath, filepath)
+
+
+def load_records_cache(
+    filepath: Union[str, Path],
+    source: Optional[dict] = None,
+    source_files: Optional[Sequence[Union[str, Path]]] = None,
+) -> Optional[List["CachedRecords"]]:
+    """Lazily loads records saved with `save_records_cache`.
+
+    Loading takes constant time in the number of records, the file is memory
+    mapped and records are only unpickled when accessed.
+
+    # Arguments
+        filepath: Path of the cache.
+        source: Needs to be equal to the `source` the cache was saved with,
+            excluding the `files` entry.
+        source_files: Current source files, compared against the `files` fingerprint
+            the cache was saved with.
+
+    # Returns
+        A `CachedRecords` for each split, or `None` if the file is not a valid
+        cache, was saved with a different format version or is outdated.
+    """
+    try:
+        splits, metadata = read_records_cache(filepath)
+    except (ValueError, OSError, pickle.UnpicklingError, EOFError) as e:
+        logger.info("Ignoring records cache {}: {}", filepath, e)
+        return None
+
+    cached_source = dict(metadata["source"])
+    fingerprint = cached_source.pop("files", [])
+    expected_source = {k: v for k, v in (source or {}).items() if k != "files"}
+    if cached_source != expected_source:
+        logger.info("Ignoring records cache {}: created by another source", filepath)
+        return None
+    if source_files is not None and _files_changed(fingerprint, source_files):
+        logger.info("Ignoring records cache {}: source files changed", filepath)
+        return None
+
+    return splits
+
+
+def read_records_cache(
+    filepath: Union[str, Path]
+) -> Tuple[List["CachedRecords"], Dict[str, dict]]:
+    """Reads a records cache without validating it, see `load_records_cache`.
+
+    Raises a `ValueError` if the file is not a valid records cache.
+
+    # Returns
+        A `CachedRecords` for each split and a dict with the `source` and `state`
+        the cache was saved with.
+    """
+    records_file = _RecordsFile(filepath)
+
+    splits, start = [], 0
+    for length in records_file.split_lengths:
+        splits.append(CachedRecords(records_file, np.arange(start, start + length)))
+        start += length
+    return splits, {"source": records_file.source, "state": records_file.state}
+
+
+def share_records(
+    records: Sequence[BaseRecord], dirpath: Optional[Union[str, Path]] = None
+) -> "CachedRecords":
+    """Moves records to a memory mapped file, to be shared between processes.
+
+    A list of records is slowly copied by each `DataLoader` worker, reference
+    counting writes to the memory pages of every record that is accessed. The pages
+    of the returned `CachedRecords` are never written to, so they are shared by all
+    workers, and only the record being loaded is unpickled.
+
+    # Arguments
+        records: Records to share, returned as they are if already `CachedRecords`.
+        dirpath: Where to create the file, defaults to `/dev/shm` if available (so
+            the records are kept in memory) or the temporary directory. The file is
+            removed when the returned records are garbage collected.
+    """
+    if isinstance(records, CachedRecords):
+        return records
+
+    if dirpath is None:
+        dirpath = "/dev/shm" if Path("/dev/shm").is_dir() else tempfile.gettempdir()
+    fd, filepath = tempfile.mkstemp(
+        prefix="icevision-records-", suffix=".cache", dir=dirpath
+    )
+    os.close(fd)
+    save_records_cache(filepath, [records])
+    (shared_records,), _ = read_records_cache(filepath)
+
+    # forked workers have copies of the records, only the owner removes the file
+    weakref.finalize(
+        shared_records.records_file, _remove_shared_file, filepath, os.getpid()
+    )
+    return shared_records
+
+
+def _remove_shared_file(filepath: str, pid: int) -> None:
+    if os.getpid() == pid and os.path.exists(filepath):
+        os.remove(filepath)
+
+
+class _RecordsFile:
+    """Memory mapped cache file, shared by all `CachedRecords` created from it."""
+
+    def __init__(self, filepath: Union[str, Path]):
+        self.filepath = Path(filepath)
+        with open(self.filepath, "rb") as f:
+            if f.read(_HEADER.size)[: len(_MAGIC)] != _MAGIC:
+                raise ValueError("not a records cache file")
+            f.seek(0)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = _HEADER.unpack_from(self._mmap, 0)
+        if version != RECORDS_CACHE_VERSION:
+            raise ValueError(
+                f"format version {version}, expected {RECORDS_CACHE_VERSION}"
+            )
+        index_offset, metadata_offset, num_records, magic = _FOOTER.unpack_from(
+            self._mmap, len(self._mmap) - _FOOTER.size
+        )
+        if magic != _MAGIC:
+            raise ValueError("file is truncated")
+
+        self.offsets = np.frombuffer(
+            self._mmap, dtype="<i8", count=num_records + 1, offset=index_offset
+        )
+        metadata = pickle.loads(
+            self._mmap[metadata_offset : len(self._mmap) - _FOOTER.size]
+        )
+        self.split_lengths = metadata["split_lengths"]
+        self.shared = metadata["shared"]
+        self.source = metadata["source"]
+        self.state = metadata.get("state", {})
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw_record(self, i: int) -> bytes:
+        return self._mmap[self.offsets[i] : self.offsets[i + 1]]
+
+    def load_record(self, i: int) -> BaseRecord:
+        file = io.BytesIO(self.raw_record(i))
+        return _RecordUnpickler(file, shared=self.shared).load()
+
+    def __getstate__(self):
+        # pages are shared with other processes by mapping the same file again
+        return {"filepath": self.filepath}
+
+    def __setstate__(self, state):
+        self.__init__(state["filepath"])
+
+
+class CachedRecords:
+    """Read only sequence of records backed by a memory mapped cache file.
+
+    Created by `load_records_cache` (or `Parser.parse` with `lazy=True`).
+    Indexing with an `int` unpickles that record from the file, so a fresh copy is
+    returned each time and modifications are **not** written back to the cache.
+    Indexing with a `slice` or a sequence of indexes returns a new `CachedRecords`.
+
+    When sent to other processes (e.g. `DataLoader` workers) only the file path is
+    pickled, the file is memory mapped again and the pages are shared.
+    """
+
+    def __init__(self, records_file: _RecordsFile, idxs: np.ndarray):
+        self.records_file = records_file
+        self.idxs = idxs
+
+    @property
+    def filepath(self) -> Path:
+        return self.records_file.filepath
+
+    def __len__(self):
+        return len(self.idxs)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return self.records_file.load_record(self.idxs[i])
+        if isinstance(i, slice):
+            return type(self)(self.records_file, self.idxs[i])
+        return type(self)(self.records_file, self.idxs[np.asarray(i, dtype=np.int64)])
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} with {len(self)} records from {self.filepath}>"
+        )
+
+    def to_records(self) -> List[BaseRecord]:
+        return list(self)
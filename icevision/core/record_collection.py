@@ -0,0 +1,259 @@
+__all__ = ["RecordCollection"]
+
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core.bbox import *
+from icevision.core.class_map import *
+from icevision.core.record_components import *
+from icevision.core.record import *
+
+
+class RecordCollection:
+    """Columnar storage for a list of detection records.
+
+    Instead of keeping one `BaseRecord` (with all its components and `BBox` objects)
+    per image, all records are stored in flat per-field numpy arrays. Per annotation
+    fields (`label_ids`, `bboxes`, `areas`, `iscrowds`) are concatenated across all
+    records and indexed with `offsets`, the annotations of record `i` are
+    `offsets[i]:offsets[i + 1]`.
+
+    Indexing with an `int` returns a freshly built `BaseRecord` view of that record,
+    so a `RecordCollection` can be used anywhere a list of records is expected
+    (e.g. `Dataset`, `autofix_records`). Modifications done to a view are **not**
+    written back to the collection. Indexing with a `slice` or a sequence of indexes
+    returns a new `RecordCollection`.
+
+    Don't instantiate this class directly, instead use `from_records`.
+
+    # Arguments
+        component_types: Record components present in all records.
+        record_ids: Array of shape (num_records,) with the record ids.
+        img_sizes: Array of shape (num_records, 2) with the image (width, height).
+        filepaths: Array of shape (num_records,) with the encoded image filepaths.
+        offsets: Array of shape (num_records + 1,) with the annotation offsets.
+        annotations: Dictionary mapping field names to the concatenated annotations.
+        class_map: The `ClassMap` shared by all records.
+
+    # Examples
+
+    Convert parsed records to a collection and use it to create a `Dataset`.
+    ```python
+    train_records, valid_records = parser.parse()
+    train_records = RecordCollection.from_records(train_records)
+    train_ds = Dataset(train_records, train_tfms)
+    ```
+    """
+
+    supported_components = (
+        RecordIDRecordComponent,
+        SizeRecordComponent,
+        FilepathRecordComponent,
+        InstancesLabelsRecordComponent,
+        BBoxesRecordComponent,
+        AreasRecordComponent,
+        IsCrowdsRecordComponent,
+    )
+
+    def __init__(
+        self,
+        component_types: Sequence[type],
+        record_ids: np.ndarray,
+        img_sizes: np.ndarray,
+        filepaths: np.ndarray,
+        offsets: np.ndarray,
+        annotations: Dict[str, np.ndarray],
+        class_map: Optional[ClassMap] = None,
+    ):
+        self.component_types = tuple(component_types)
+        self.record_ids = record_ids
+        self.img_sizes = img_sizes
+        self.filepaths = filepaths
+        self.offsets = offsets
+        self.annotations = annotations
+        self.class_map = class_map
+
+    @property
+    def label_ids(self) -> np.ndarray:
+        return self.annotations["label_ids"]
+
+    @property
+    def bboxes(self) -> np.ndarray:
+        return self.annotations["bboxes"]
+
+    @property
+    def areas(self) -> np.ndarray:
+        return self.annotations["areas"]
+
+    @property
+    def iscrowds(self) -> np.ndarray:
+        return self.annotations["iscrowds"]
+
+    @property
+    def num_annotations(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.record_ids)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return self._record(int(i))
+        if isinstance(i, slice):
+            return self.take(np.arange(len(self))[i])
+        return self.take(np.asarray(i, dtype=np.int64))
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} with {len(self)} records and "
+            f"{len(self.label_ids)} annotations>"
+        )
+
+    def take(self, idxs: np.ndarray) -> "RecordCollection":
+        """Returns a new collection with the records at positions `idxs`."""
+        idxs = np.asarray(idxs, dtype=np.int64).reshape(-1)
+        starts, lengths = self.offsets[idxs], self.num_annotations[idxs]
+
+        offsets = np.zeros(len(idxs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # position of each selected annotation in the original concatenated arrays
+        annotation_idxs = np.repeat(starts - offsets[:-1], lengths) + np.arange(
+            offsets[-1]
+        )
+
+        return type(self)(
+            component_types=self.component_types,
+            record_ids=self.record_ids[idxs],
+            img_sizes=self.img_sizes[idxs],
+            filepaths=self.filepaths[idxs],
+            offsets=offsets,
+            annotations={k: v[annotation_idxs] for k, v in self.annotations.items()},
+            class_map=self.class_map,
+        )
+
+    def to_records(self) -> List[BaseRecord]:
+        return list(self)
+
+    def _record(self, i: int) -> BaseRecord:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"Index {i} out of range for {len(self)} records")
+
+        record = BaseRecord(
+            [
+                component_type()
+                for component_type in self.component_types
+                if component_type not in BaseRecord.base_components
+            ]
+        )
+        record.set_record_id(self.record_ids[i].item())
+        width, height = self.img_sizes[i].tolist()
+        record.set_img_size(ImgSize(width=width, height=height), original=True)
+        record.set_filepath(os.fsdecode(self.filepaths[i]))
+
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        detection = record.detection
+        detection.set_class_map(self.class_map)
+        detection.set_labels_by_id(self.label_ids[start:stop].tolist())
+        if "bboxes" in self.annotations:
+            # copy, so changes done to the view never reach the collection
+            detection.set_bboxes(BBoxArray.from_xyxy(self.bboxes[start:stop].copy()))
+        if "areas" in self.annotations:
+            detection.set_areas(self.areas[start:stop].tolist())
+        if "iscrowds" in self.annotations:
+            detection.set_iscrowds(self.iscrowds[start:stop].tolist())
+
+        return record
+
+    @classmethod
+    def from_records(cls, records: Sequence[BaseRecord]) -> "RecordCollection":
+        """Creates a collection from a list of detection records.
+
+        All records need to have the same components and share the same `ClassMap`.
+        Only the components listed in `supported_components` can be stored, a
+        `ValueError` is raised otherwise.
+        """
+        if len(records) == 0:
+            raise ValueError("Cannot create a RecordCollection from zero records")
+
+        component_types = _component_types(records[0])
+        unsupported = [
+            o.__name__ for o in component_types if o not in cls.supported_components
+        ]
+        if unsupported:
+            raise ValueError(
+                f"{cls.__name__} does not support the components: {unsupported}"
+            )
+        if InstancesLabelsRecordComponent not in component_types:
+            raise ValueError(f"{cls.__name__} requires InstancesLabelsRecordComponent")
+
+        record_ids, img_sizes, filepaths, num_annotations = [], [], [], []
+        annotations = {"label_ids": []}
+        for component_type, name in [
+            (BBoxesRecordComponent, "bboxes"),
+            (AreasRecordComponent, "areas"),
+            (IsCrowdsRecordComponent, "iscrowds"),
+        ]:
+            if component_type in component_types:
+                annotations[name] = []
+
+        class_map = records[0].detection.class_map
+        for record in records:
+            if _component_types(record) != component_types:
+                raise ValueError(
+                    f"(record_id: {record.record_id}) All records in a "
+                    f"{cls.__name__} need to have the same components"
+                )
+            if record.detection.class_map != class_map:
+                raise ValueError(
+                    f"(record_id: {record.record_id}) All records in a "
+                    f"{cls.__name__} need to share the same ClassMap"
+                )
+
+            record_ids.append(record.record_id)
+            img_sizes.append((record.width, record.height))
+            filepaths.append(os.fsencode(record.filepath))
+            num_annotations.append(len(record.detection.label_ids))
+
+            annotations["label_ids"].extend(record.detection.label_ids)
+            if "bboxes" in annotations:
+                bboxes = BBoxArray.from_bboxes(record.detection.bboxes)
+                annotations["bboxes"].extend(bboxes.xyxy.tolist())
+            if "areas" in annotations:
+                annotations["areas"].extend(record.detection.areas)
+            if "iscrowds" in annotations:
+                annotations["iscrowds"].extend(record.detection.iscrowds)
+
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum(num_annotations, out=offsets[1:])
+
+        dtypes = {
+            "label_ids": np.int64,
+            "bboxes": np.float32,
+            "areas": np.float64,
+            "iscrowds": np.uint8,
+        }
+        annotations = {
+            name: np.asarray(values, dtype=dtypes[name])
+            for name, values in annotations.items()
+        }
+        if "bboxes" in annotations:
+            annotations["bboxes"] = annotations["bboxes"].reshape(-1, 4)
+
+        return cls(
+            component_types=component_types,
+            record_ids=np.asarray(record_ids),
+            img_sizes=np.asarray(img_sizes, dtype=np.int32).reshape(-1, 2),
+            filepaths=np.asarray(filepaths, dtype=np.bytes_),
+            offsets=offsets,
+            annotations=annotations,
+            class_map=class_map,
+        )
+
+
+def _component_types(record: BaseRecord) -> Tuple[type]:
+    return tuple(sorted({o.__class__ for o in record.components}, key=str))
@@ -43,6 +43,48 @@ class RecordComponent(TaskComponent):
     def _unload(self) -> None:
         return
 
+    def _copy(self) -> "RecordComponent":
+        """Shallow copy used by `BaseRecord.copy`.
+
+        Attributes are shared with the original component, except for lists which
+        are copied so they can safely be modified in place (e.g. on `_remove_annotation`).
+        """
+        component = copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, list):
+                setattr(component, name, copy(value))
+        return component
+
+    def _rescale(self, from_size: ImgSize, to_size: ImgSize) -> None:
+        """Scales the annotations to match the image being resized from `from_size`
+        to `to_size`, used by `BaseRecord.rescale`.
+        """
+        return
+
+    def _flip(self, img_size: ImgSize, horizontal: bool) -> None:
+        """Flips the annotations to match the image being flipped horizontally (or
+        vertically), used by `BaseRecord.flip`.
+        """
+        return
+
+    def _crop(
+        self, img_size: ImgSize, xmin: int, ymin: int, xmax: int, ymax: int
+    ) -> None:
+        """Moves the annotations to match the image being cropped to the region
+        [xmin, xmax) x [ymin, ymax), used by `BaseRecord.crop`.
+        """
+        return
+
+    def _merge(self, other: "RecordComponent") -> None:
+        """Adds the annotations of `other` (the same component of another record).
+
+        List attributes are extended, everything else is kept. Used when the
+        annotations of a record were parsed in separate shards.
+        """
+        for name, value in vars(other).items():
+            if isinstance(value, list):
+                getattr(self, name).extend(value)
+
     def _num_annotations(self) -> Dict[str, int]:
         return {}
 
@@ -136,6 +178,13 @@ class ImageRecordComponent(RecordComponent):
     def _unload(self):
         self.img = None
 
+    def _copy(self) -> "ImageRecordComponent":
+        component = super()._copy()
+        # transforms are allowed to modify in memory images in place
+        if self.img is not None:
+            component.img = self.img.copy()
+        return component
+
     def as_dict(self) -> dict:
         return {"img": self.img}
 
@@ -152,8 +201,9 @@ class FilepathRecordComponent(ImageRecordComponent):
         self.filepath = Path(filepath)
 
     def _load(self):
-        img = open_img(self.filepath)
-        self.set_img(img)
+        # the image can already be set, e.g. when it comes from an `ImageCache`
+        if self.img is None:
+            self.set_img(open_img(self.filepath))
 
     def _autofix(self) -> Dict[str, bool]:
         exists = self.filepath.exists()
@@ -192,6 +242,14 @@ class SizeRecordComponent(RecordComponent):
     def setup_transform(self, tfm) -> None:
         tfm.setup_size(self)
 
+    def _rescale(self, from_size: ImgSize, to_size: ImgSize) -> None:
+        self.set_img_size(to_size)
+
+    def _crop(
+        self, img_size: ImgSize, xmin: int, ymin: int, xmax: int, ymax: int
+    ) -> None:
+        self.set_img_size(ImgSize(width=xmax - xmin, height=ymax - ymin))
+
     def _repr(self) -> List[str]:
         return [
             f"Image size {self.img_size}",
@@ -301,15 +359,26 @@ class ClassificationLabelsRecordComponent(BaseLabelsRecordComponent):
 class BBoxesRecordComponent(RecordComponent):
     def __init__(self, task=tasks.detection):
         super().__init__(task=task)
-        self.bboxes: List[BBox] = []
+        self.bboxes: Union[List[BBox], BBoxArray] = []
 
-    def set_bboxes(self, bboxes: Sequence[BBox]):
-        self.bboxes = list(bboxes)
+    def set_bboxes(self, bboxes: Union[Sequence[BBox], BBoxArray]):
+        self.bboxes = copy(bboxes) if isinstance(bboxes, BBoxArray) else list(bboxes)
 
-    def add_bboxes(self, bboxes: Sequence[BBox]):
+    def add_bboxes(self, bboxes: Union[Sequence[BBox], BBoxArray]):
         self.bboxes.extend(bboxes)
 
+    def _merge(self, other: "BBoxesRecordComponent") -> None:
+        self.add_bboxes(other.bboxes)
+
     def _autofix(self) -> Dict[str, bool]:
+        if isinstance(self.bboxes, BBoxArray):
+            success = self.bboxes.autofix(
+                img_w=self.composite.width,
+                img_h=self.composite.height,
+                record_id=self.composite.record_id,
+            )
+            return {"bboxes": success.tolist()}
+
         success = []
         for bbox in self.bboxes:
             try:
@@ -327,6 +396,52 @@ class BBoxesRecordComponent(RecordComponent):
 
         return {"bboxes": success}
 
+    def _copy(self) -> "BBoxesRecordComponent":
+        component = super()._copy()
+        if isinstance(self.bboxes, BBoxArray):
+            # `data` is only ever replaced (e.g. by `autofix`), sharing it is safe
+            component.bboxes = copy(self.bboxes)
+        else:
+            # `BBox.autofix` modifies the coordinates in place
+            component.bboxes = [copy(bbox) for bbox in self.bboxes]
+        return component
+
+    def _rescale(self, from_size: ImgSize, to_size: ImgSize) -> None:
+        scale_x, scale_y = _scale_factors(from_size, to_size)
+        scale = np.array([scale_x, scale_y, scale_x, scale_y], dtype=np.float32)
+        self._set_xyxy(self._xyxy() * scale)
+
+    def _flip(self, img_size: ImgSize, horizontal: bool) -> None:
+        # `data` of a `BBoxArray` can be shared with other records
+        xyxy = self._xyxy().copy()
+        if horizontal:
+            xyxy[:, [0, 2]] = img_size.width - xyxy[:, [2, 0]]
+        else:
+            xyxy[:, [1, 3]] = img_size.height - xyxy[:, [3, 1]]
+        self._set_xyxy(xyxy)
+
+    def _crop(
+        self, img_size: ImgSize, xmin: int, ymin: int, xmax: int, ymax: int
+    ) -> None:
+        # boxes outside of the region end up empty, see `BaseRecord.remove_empty_bboxes`
+        xyxy = self._xyxy() - np.array([xmin, ymin, xmin, ymin], dtype=np.float32)
+        size = np.array([xmax - xmin, ymax - ymin] * 2, dtype=np.float32)
+        self._set_xyxy(np.clip(xyxy, 0, size))
+
+    def _xyxy(self) -> np.ndarray:
+        if isinstance(self.bboxes, BBoxArray):
+            return self.bboxes.data
+        # not converted to float32, as `BBoxArray` does
+        xyxy = [bbox.xyxy for bbox in self.bboxes]
+        return np.array(xyxy, dtype=np.float64).reshape(-1, 4)
+
+    def _set_xyxy(self, xyxy: np.ndarray) -> None:
+        # keeps the type of `bboxes`
+        if isinstance(self.bboxes, BBoxArray):
+            self.bboxes = BBoxArray(xyxy)
+        else:
+            self.bboxes = [BBox.from_xyxy(*o) for o in xyxy.tolist()]
+
     def _num_annotations(self) -> Dict[str, int]:
         return {"bboxes": len(self.bboxes)}
 
@@ -377,24 +492,83 @@ class MasksRecordComponent(RecordComponent):
     def setup_transform(self, tfm) -> None:
         tfm.setup_masks(self)
 
+    def compact_masks(self, mode: str = "packed"):
+        """Stores the masks in a compact form, they are only expanded back to full
+        frame masks when building the batch.
+
+        # Arguments
+            mode: `packed` to store them with one bit per pixel (`PackedMaskArray`) or
+                `cropped` to only store each mask inside its bounding box
+                (`CroppedMaskArray`).
+        """
+        compact_masks_cls = {"packed": PackedMaskArray, "cropped": CroppedMaskArray}
+        if mode not in compact_masks_cls:
+            raise ValueError(
+                f"mode must be one of {list(compact_masks_cls)}, got {mode}"
+            )
+
+        masks = self.masks.to_mask(h=self.composite.height, w=self.composite.width)
+        self.masks = compact_masks_cls[mode].from_mask_array(masks)
+
     def _masks_to_erle(self, masks: Sequence[Mask]) -> List[Mask]:
         width, height = self.composite.img_size
         return [mask.to_erles(h=height, w=width) for mask in masks]
 
     def _load(self):
+        # encoded masks are only decoded when (and if) `masks.data` is accessed
         self.masks = MaskArray.from_masks(
             self.masks, self.composite.height, self.composite.width
         )
 
     def _unload(self):
-        # TODO: SLOW: Maybe cause slowdowns?
+        # only encodes again if the masks were modified (e.g. by a transform)
         self.masks = self.masks.to_erles(self.composite.height, self.composite.width)
 
+    def _merge(self, other: "MasksRecordComponent") -> None:
+        self.masks.append(other.masks)
+
+    def _copy(self) -> "MasksRecordComponent":
+        component = super()._copy()
+        if isinstance(self.masks, EncodedRLEs):
+            component.masks = EncodedRLEs(copy(self.masks.erles))
+        return component
+
+    def _rescale(self, from_size: ImgSize, to_size: ImgSize) -> None:
+        erles = self.masks.to_erles(h=from_size.height, w=from_size.width)
+        erles = erles.resize(height=to_size.height, width=to_size.width)
+        self._set_erles(erles, to_size)
+
+    def _flip(self, img_size: ImgSize, horizontal: bool) -> None:
+        erles = self.masks.to_erles(h=img_size.height, w=img_size.width)
+        erles = erles.hflip() if horizontal else erles.vflip()
+        self._set_erles(erles, img_size)
+
+    def _crop(
+        self, img_size: ImgSize, xmin: int, ymin: int, xmax: int, ymax: int
+    ) -> None:
+        erles = self.masks.to_erles(h=img_size.height, w=img_size.width)
+        erles = erles.crop(xmin=xmin, ymin=ymin, xmax=xmax, ymax=ymax)
+        self._set_erles(erles, ImgSize(width=xmax - xmin, height=ymax - ymin))
+
+    def _set_erles(self, erles: EncodedRLEs, img_size: ImgSize) -> None:
+        # transformed while encoded, other formats are converted back afterwards
+        width, height = img_size
+        if isinstance(self.masks, EncodedRLEs):
+            self.masks = erles
+        elif isinstance(self.masks, (PackedMaskArray, CroppedMaskArray)):
+            masks = erles.to_mask(h=height, w=width)
+            self.masks = type(self.masks).from_mask_array(masks)
+        else:
+            self.masks = MaskArray.from_erles(erles, h=height, w=width)
+
     def _num_annotations(self) -> Dict[str, int]:
         return {"masks": len(self.masks)}
 
     def _remove_annotation(self, i):
-        self.masks.pop(i)
+        if isinstance(self.masks, EncodedRLEs):
+            self.masks.pop(i)
+        else:
+            self.masks = self.masks[np.arange(len(self.masks)) != i]
 
     def _repr(self) -> List[str]:
         return [f"Masks: {self.masks}"]
@@ -417,6 +591,10 @@ class AreasRecordComponent(RecordComponent):
     def setup_transform(self, tfm) -> None:
         tfm.setup_areas(self)
 
+    def _rescale(self, from_size: ImgSize, to_size: ImgSize) -> None:
+        scale_x, scale_y = _scale_factors(from_size, to_size)
+        self.areas = [area * scale_x * scale_y for area in self.areas]
+
     def _num_annotations(self) -> Dict[str, int]:
         return {"areas": len(self.areas)}
 
@@ -471,15 +649,88 @@ class KeyPointsRecordComponent(RecordComponent):
     def add_keypoints(self, keypoints: Sequence[KeyPoints]):
         self.keypoints.extend(keypoints)
 
+    @property
+    def keypoints_data(self) -> np.ndarray:
+        """Keypoints of all the instances as a (N, K, 3) array of (x, y, visible),
+        all instances need to have the same number of keypoints.
+        """
+        if not self.keypoints:
+            return np.zeros((0, 0, 3))
+        num_keypoints = {len(kpts.data) for kpts in self.keypoints}
+        if len(num_keypoints) > 1:
+            raise ValueError(
+                "All instances need to have the same number of keypoints, "
+                f"got {sorted(num_keypoints)}"
+            )
+        return np.stack([kpts.data for kpts in self.keypoints])
+
+    def set_keypoints_data(
+        self,
+        data: Union[np.ndarray, Sequence[np.ndarray]],
+        metadata: Sequence[Type[KeypointsMetadata]],
+    ):
+        """Sets the keypoints from a (N, K, 3) array (or a (K, 3) array for each
+        instance), the `KeyPoints` of each instance are views into it.
+        """
+        self.keypoints = [
+            KeyPoints(xyv.reshape(-1), kpts_metadata)
+            for xyv, kpts_metadata in zip(data, metadata)
+        ]
+
     def setup_transform(self, tfm) -> None:
         tfm.setup_keypoints(self)
 
     def as_dict(self) -> dict:
         return {"keypoints": self.keypoints}
 
+    def _rescale(self, from_size: ImgSize, to_size: ImgSize) -> None:
+        scale_x, scale_y = _scale_factors(from_size, to_size)
+
+        def rescale(xyv):
+            xyv[:, :2] *= [scale_x, scale_y]
+
+        self._map_xyv(rescale)
+
+    def _flip(self, img_size: ImgSize, horizontal: bool) -> None:
+        axis, size = (0, img_size.width) if horizontal else (1, img_size.height)
+
+        def flip(xyv):
+            # not labeled keypoints stay at (0, 0)
+            labeled = xyv[:, 2] > 0
+            xyv[labeled, axis] = size - xyv[labeled, axis]
+
+        self._map_xyv(flip)
+
+    def _crop(
+        self, img_size: ImgSize, xmin: int, ymin: int, xmax: int, ymax: int
+    ) -> None:
+        def crop(xyv):
+            xyv[:, :2] -= [xmin, ymin]
+            # keypoints outside of the region are not visible anymore
+            x, y = xyv[:, 0], xyv[:, 1]
+            outside = (x < 0) | (x > xmax - xmin) | (y < 0) | (y > ymax - ymin)
+            xyv[outside] = 0
+
+        self._map_xyv(crop)
+
+    def _map_xyv(self, fn: Callable[[np.ndarray], None]) -> None:
+        if not self.keypoints:
+            return
+        # the keypoints of all instances are updated at once, as a single array
+        xyv = np.concatenate([kpts.data for kpts in self.keypoints]).astype(np.float64)
+        fn(xyv)
+        sizes = [len(kpts.data) for kpts in self.keypoints]
+        self.set_keypoints_data(
+            np.split(xyv, np.cumsum(sizes)[:-1]),
+            [kpts.metadata for kpts in self.keypoints],
+        )
+
+    def _remove_annotation(self, i):
+        self.keypoints.pop(i)
+
     def _aggregate_objects(self) -> Dict[str, List[dict]]:
         objects = [
-            {"keypoint_x": kpt.x, "keypoint_y": kpt.y, "keypoint_visible": kpt.v}
+            {"keypoint_x": kpt.x, "keypoint_y": kpt.y, "keypoint_visible": kpt.visible}
             for kpt in self.keypoints
         ]
         return {"keypoints": objects}
@@ -510,3 +761,7 @@ class LossesRecordComponent(RecordComponent):
 
     def set_losses(self, losses: Dict):
         self.losses = losses
+
+
+def _scale_factors(from_size: ImgSize, to_size: ImgSize) -> Tuple[float, float]:
+    return to_size.width / from_size.width, to_size.height / from_size.height
@@ -1,4 +1,8 @@
 from icevision.data.data_splitter import *
+from icevision.data.image_cache import *
+from icevision.data.presize import *
 from icevision.data.dataset import *
+from icevision.data.batch_sampler import *
+from icevision.data.shards import *
 from icevision.data.prediction import *
 from icevision.data.convert_records_to_coco_style import *
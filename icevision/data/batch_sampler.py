@@ -0,0 +1,111 @@
+__all__ = ["AspectRatioBatchSampler"]
+
+from torch.utils.data import Sampler
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core import *
+
+
+class AspectRatioBatchSampler(Sampler):
+    """Batches items with a similar aspect ratio, so that images padded to the
+    largest image of the batch (e.g. by `ImgPadStack`) have as little padding as
+    possible.
+
+    Items are grouped in `num_buckets` buckets of aspect ratio, log spaced between
+    1:2 and 2:1, using the `img_size` of the records. With 2 buckets, portrait and
+    landscape images are split. Batches are made within each bucket, the leftovers
+    of all buckets are batched together at the end, so all batches are full except
+    the last one. The order of the batches is then shuffled.
+
+    Passed to any `train_dl` / `valid_dl` as `batch_sampler` (instead of
+    `batch_size` and `shuffle`), the resulting `DataLoader` can also be converted
+    with `convert_dataloader_to_fastai`.
+
+    # Arguments
+        dataset: A `Dataset` or a list of records.
+        batch_size: Number of items in each batch.
+        shuffle: Whether or not to shuffle the items within the buckets and the
+            order of the batches. The order changes every epoch.
+        drop_last: Whether or not to drop the last batch if it's incomplete.
+        num_buckets: Number of aspect ratio buckets, more buckets means less
+            padding but more leftover items batched together at the end.
+        seed: Seed used for shuffling, combined with the epoch (see `set_epoch`).
+    """
+
+    def __init__(
+        self,
+        dataset: Union["Dataset", Sequence[BaseRecord]],
+        batch_size: int,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        num_buckets: int = 8,
+        seed: int = 0,
+    ):
+        records = getattr(dataset, "records", dataset)
+        self.aspect_ratios = np.array(
+            [_aspect_ratio(record) for record in records], dtype=np.float64
+        )
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+
+        boundaries = 2 ** np.linspace(-1, 1, num_buckets + 1)[1:-1]
+        self.buckets = np.digitize(self.aspect_ratios, boundaries)
+
+    def set_epoch(self, epoch: int) -> None:
+        """Sets the epoch used for shuffling, it's otherwise increased every time
+        the sampler is iterated.
+        """
+        self.epoch = epoch
+
+    def __len__(self):
+        num_items = len(self.aspect_ratios)
+        if self.drop_last:
+            return num_items // self.batch_size
+        return math.ceil(num_items / self.batch_size)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        rng = np.random.RandomState(self.seed + self.epoch)
+        self.epoch += 1
+
+        batches, leftovers = [], []
+        for bucket in np.unique(self.buckets):
+            idxs = np.flatnonzero(self.buckets == bucket)
+            if self.shuffle:
+                idxs = rng.permutation(idxs)
+            num_full = len(idxs) // self.batch_size * self.batch_size
+            for start in range(0, num_full, self.batch_size):
+                batches.append(idxs[start : start + self.batch_size])
+            leftovers.append(idxs[num_full:])
+
+        # leftovers are sorted by aspect ratio, batches of them are still similar
+        leftovers = np.concatenate([np.zeros(0, dtype=int)] + leftovers)
+        leftovers = leftovers[np.argsort(self.aspect_ratios[leftovers], kind="stable")]
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+        for start in range(0, len(leftovers), self.batch_size):
+            batch = leftovers[start : start + self.batch_size]
+            if len(batch) < self.batch_size:
+                # only the very last batch can be incomplete
+                if self.drop_last:
+                    break
+                batches.append(batch)
+            elif self.shuffle:
+                batches.insert(rng.randint(len(batches) + 1), batch)
+            else:
+                batches.append(batch)
+
+        for batch in batches:
+            yield batch.tolist()
+
+
+def _aspect_ratio(record: BaseRecord) -> float:
+    img_size = getattr(record, "img_size", None)
+    if img_size is None:
+        raise ValueError(
+            f"Record {record.record_id} has no img_size, "
+            "AspectRatioBatchSampler requires a SizeRecordComponent"
+        )
+    return img_size.width / img_size.height
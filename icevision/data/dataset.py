@@ -1,8 +1,10 @@
 __all__ = ["Dataset"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.core import *
 from icevision.tfms import *
+from icevision.data.image_cache import *
 
 
 class Dataset:
@@ -16,15 +18,33 @@ class Dataset:
     # Arguments
         records: A list of records.
         tfm: Transforms to be applied to each item.
+        shared: If True, records are moved to a memory mapped file with
+            `share_records`, so `DataLoader` workers don't end up with a private copy
+            of every record. Records are then unpickled when requested. Other
+            references to the list of records should be deleted, the garbage
+            collector of each worker would still go through them.
+        img_cache: Decoded images are taken from this `ImageCache` (and stored in it
+            when missing) instead of opening the image files every time.
+        draft: If True and `tfm` starts by resizing the image (e.g. `aug_tfms` with
+            `presize` or `resize_and_pad`), JPEG images are decoded at a reduced
+            scale close to that size (see `Transform.draft_size`). The annotations
+            are rescaled to the decoded image before `tfm` is applied.
     """
 
     def __init__(
         self,
         records: List[dict],
         tfm: Optional[Transform] = None,
+        shared: bool = False,
+        img_cache: Optional[ImageCache] = None,
+        draft: bool = False,
     ):
-        self.records = records
+        self.records = share_records(records) if shared else records
         self.tfm = tfm
+        self.img_cache = img_cache
+        self.draft = draft
+        if img_cache is not None:
+            img_cache.setup(len(self.records))
         # if self.tfm is not None:
         #     self.tfm.setup(records[0].components_cls)
 
@@ -32,7 +52,11 @@ class Dataset:
         return len(self.records)
 
     def __getitem__(self, i):
-        record = self.records[i].load()
+        record = self.records[i]
+        if self.img_cache is not None:
+            record = self.img_cache.load(record, i)
+        else:
+            record = record.load(draft_size=self._draft_size(record))
         if self.tfm is not None:
             record = self.tfm(record)
         return record
@@ -40,6 +64,11 @@ class Dataset:
     def __repr__(self):
         return f"<{self.__class__.__name__} with {len(self.records)} items>"
 
+    def _draft_size(self, record: BaseRecord) -> Optional[ImgSize]:
+        if not self.draft or self.tfm is None or record.img_size is None:
+            return None
+        return self.tfm.draft_size(record.img_size)
+
     @classmethod
     def from_images(
         cls,
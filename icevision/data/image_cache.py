@@ -0,0 +1,172 @@
+__all__ = ["ImageCache"]
+
+import multiprocessing, tempfile, weakref
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core import *
+
+# indexes of `ImageCache._counters`
+_CLOCK, _HITS, _MISSES, _NBYTES = range(4)
+
+
+class ImageCache:
+    """Decoded images shared by all `DataLoader` workers, with LRU eviction.
+
+    Passed to `Dataset(..., img_cache=...)`, images are decoded once and then read
+    back from the cache instead of being decoded again every epoch. Each image is
+    stored as a `.npy` file, by default in `/dev/shm` so it's kept in memory, and
+    the index (size and last access of each item) lives in shared memory, so an
+    image decoded by one worker is a hit for all of them.
+
+    The index is created by `setup` (called by `Dataset`), so the cache needs to be
+    created before the workers are started. A cache can only be used by one
+    `Dataset`, items are identified by their index in the dataset.
+
+    # Arguments
+        max_bytes: Memory budget for the decoded images, the least recently used
+            images are evicted when a new image does not fit.
+        max_size: If specified, images larger than `max_size` (on either side) are
+            downscaled to it, keeping the aspect ratio, before being stored. The
+            annotations of the records are rescaled accordingly (`BaseRecord.rescale`).
+        dirpath: Where the images are stored, defaults to `/dev/shm` if available or
+            the temporary directory. A new directory is created inside it, and
+            removed when the cache is garbage collected.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_size: Optional[int] = None,
+        dirpath: Optional[Union[str, Path]] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_size = max_size
+        if dirpath is None:
+            dirpath = "/dev/shm" if Path("/dev/shm").is_dir() else None
+        self.dirpath = Path(tempfile.mkdtemp(prefix="icevision-images-", dir=dirpath))
+        # forked workers have copies of the cache, only the owner removes the files
+        weakref.finalize(self, _remove_cache_dir, str(self.dirpath), os.getpid())
+
+        self._lock = multiprocessing.Lock()
+        self._counters = multiprocessing.RawArray("q", 4)
+        self._items_nbytes = None
+        self._items_last_used = None
+
+    def setup(self, num_items: int) -> None:
+        if self._items_nbytes is not None:
+            if len(self._items_nbytes) != num_items:
+                raise ValueError(
+                    f"ImageCache was already setup for {len(self._items_nbytes)} items"
+                    f", can't be used by a dataset of {num_items} items"
+                )
+            return
+        self._items_nbytes = multiprocessing.RawArray("q", num_items)
+        self._items_last_used = multiprocessing.RawArray("q", num_items)
+
+    @property
+    def hits(self) -> int:
+        return self._counters[_HITS]
+
+    @property
+    def misses(self) -> int:
+        return self._counters[_MISSES]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the cached images."""
+        return self._counters[_NBYTES]
+
+    def __len__(self):
+        return int(np.count_nonzero(self._nbytes_array()))
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} with {len(self)} images "
+            f"({self.nbytes / 2 ** 20:.1f}/{self.max_bytes / 2 ** 20:.1f} MB), "
+            f"{self.hits} hits, {self.misses} misses>"
+        )
+
+    def load(self, record: BaseRecord, i: int) -> BaseRecord:
+        """Same as `record.load()`, but the image is taken from the cache."""
+        record = record.copy()
+        if getattr(record, "filepath", None) is not None:
+            img = self.get(i)
+            if img is None:
+                img = open_img(record.filepath, max_size=self.max_size)
+                self.put(i, img)
+
+            if self.max_size is not None:
+                record.set_rescaled_img(img)
+            else:
+                record.set_img(img)
+
+        record.reduce_on_components("_load")
+        return record
+
+    def get(self, i: int) -> Optional[np.ndarray]:
+        """Returns a copy of the cached image for item `i`, `None` if not cached."""
+        img = None
+        if self._items_nbytes[i] > 0:
+            try:
+                img = np.load(self._filepath(i))
+            except (FileNotFoundError, ValueError):
+                # evicted (or being replaced) by another worker meanwhile
+                img = None
+
+        with self._lock:
+            if img is None:
+                self._counters[_MISSES] += 1
+            else:
+                self._counters[_HITS] += 1
+                self._touch(i)
+        return img
+
+    def put(self, i: int, img: np.ndarray) -> None:
+        """Stores the image of item `i`, evicting least recently used images."""
+        if img.nbytes > self.max_bytes:
+            return
+
+        # written before taking the lock, renaming is atomic
+        tmp_filepath = self.dirpath / f"{i}.{os.getpid()}.tmp.npy"
+        np.save(tmp_filepath, img)
+
+        with self._lock:
+            if self._items_nbytes[i] > 0:
+                # stored by another worker meanwhile
+                tmp_filepath.unlink()
+                return
+
+            nbytes_array = self._nbytes_array()
+            last_used_array = self._last_used_array()
+            while self._counters[_NBYTES] + img.nbytes > self.max_bytes:
+                cached = nbytes_array > 0
+                lru = np.where(cached, last_used_array, np.iinfo(np.int64).max)
+                self._evict(int(lru.argmin()))
+
+            os.replace(tmp_filepath, self._filepath(i))
+            self._items_nbytes[i] = img.nbytes
+            self._counters[_NBYTES] += img.nbytes
+            self._touch(i)
+
+    def _evict(self, i: int) -> None:
+        self._filepath(i).unlink()
+        self._counters[_NBYTES] -= self._items_nbytes[i]
+        self._items_nbytes[i] = 0
+
+    def _touch(self, i: int) -> None:
+        self._counters[_CLOCK] += 1
+        self._items_last_used[i] = self._counters[_CLOCK]
+
+    def _filepath(self, i: int) -> Path:
+        return self.dirpath / f"{i}.npy"
+
+    def _nbytes_array(self) -> np.ndarray:
+        return np.frombuffer(self._items_nbytes, dtype=np.int64)
+
+    def _last_used_array(self) -> np.ndarray:
+        return np.frombuffer(self._items_last_used, dtype=np.int64)
+
+
+def _remove_cache_dir(dirpath: str, pid: int) -> None:
+    if os.getpid() == pid:
+        shutil.rmtree(dirpath, ignore_errors=True)
@@ -0,0 +1,86 @@
+__all__ = ["presize_records"]
+
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core import *
+
+_JPEG_SUFFIXES = {".jpg", ".jpeg"}
+
+
+def presize_records(
+    records: Sequence[BaseRecord],
+    max_size: int,
+    out_dir: Union[str, Path],
+    num_workers: int = 0,
+    show_pbar: bool = True,
+) -> List[BaseRecord]:
+    """Resizes the images of the records once, ahead of training.
+
+    Images larger than `max_size` (on either side) are downscaled to it, keeping the
+    aspect ratio, and saved to `out_dir`. New records are returned, pointing to the
+    resized images and with all the annotations (`img_size`, bboxes, masks,
+    keypoints, areas) rescaled accordingly, the original records are not modified.
+    Training on the returned records avoids decoding and resizing the full size
+    images every epoch.
+
+    Images are saved as `<record_id>.jpg` for JPEG sources and `<record_id>.png`
+    otherwise. Images already presized in `out_dir` (newer than the source and with
+    the expected size) are not resized again, so it's cheap to call this every time.
+
+    # Arguments
+        records: Records to presize, records without a `filepath` are copied as is.
+        max_size: Maximum size of the longest side of the images.
+        out_dir: Where the resized images are saved, created if it does not exist.
+        num_workers: Number of processes resizing the images, if 0 everything runs
+            in the main process.
+        show_pbar: Whether or not to show a progress bar.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # only filepaths are sent to the workers, records (and their `ClassMap`) stay
+    # in the main process
+    items, indexes = [], []
+    for i, record in enumerate(records):
+        filepath = getattr(record, "filepath", None)
+        if filepath is None:
+            continue
+        suffix = ".jpg" if filepath.suffix.lower() in _JPEG_SUFFIXES else ".png"
+        out_filepath = out_dir / f"{record.record_id}{suffix}"
+        expected_size = scaled_img_size(record.img_size, max_size)
+        items.append((filepath, out_filepath, expected_size, max_size))
+        indexes.append(i)
+
+    img_sizes = parallel_map(
+        _presize_img, items, num_workers=num_workers, show_pbar=show_pbar
+    )
+
+    presized_records = [record.copy() for record in records]
+    for i, (_, out_filepath, _, _), img_size in zip(indexes, items, img_sizes):
+        record = presized_records[i]
+        if record.img_size != img_size:
+            record.rescale(img_size)
+        record.set_filepath(out_filepath)
+
+    return presized_records
+
+
+def _presize_img(item) -> ImgSize:
+    filepath, out_filepath, expected_size, max_size = item
+    if (
+        out_filepath.exists()
+        and out_filepath.stat().st_mtime_ns >= Path(filepath).stat().st_mtime_ns
+        and get_img_size(out_filepath) == expected_size
+    ):
+        return expected_size
+
+    img = open_img(filepath, max_size=max_size)
+    # written to a temporary file first, an interrupted run leaves no partial image
+    tmp_filepath = out_filepath.with_name(
+        f"{out_filepath.stem}.tmp{out_filepath.suffix}"
+    )
+    PIL.Image.fromarray(img).save(str(tmp_filepath), quality=95)
+    os.replace(tmp_filepath, out_filepath)
+
+    height, width = img.shape[:2]
+    return ImgSize(width=width, height=height)
@@ -0,0 +1,231 @@
+__all__ = ["SHARDS_VERSION", "write_shards", "StreamingDataset"]
+
+import tarfile
+import torch.distributed as dist
+from torch.utils.data import IterableDataset, get_worker_info
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core import *
+from icevision.core.record_cache import _RecordPickler, _RecordUnpickler
+from icevision.tfms import *
+
+SHARDS_VERSION = 1
+
+# directory layout:
+#   index.json      version, shards and their number of records
+#   shared.pkl      objects shared between records (e.g. `ClassMap`), stored once
+#   shard-000000.tar
+#   ...
+# each shard is a plain tar file, the members of a record are next to each other
+# and share the same key, `<key>.pkl` (the pickled record) comes first followed by
+# `<key><suffix>` (the bytes of the image file, as they are)
+_INDEX_FILENAME = "index.json"
+_SHARED_FILENAME = "shared.pkl"
+
+
+def write_shards(
+    records: Sequence[BaseRecord],
+    out_dir: Union[str, Path],
+    records_per_shard: int = 1000,
+    show_pbar: bool = True,
+) -> List[Path]:
+    """Writes records and their images to tar shards, read with `StreamingDataset`.
+
+    Image files are copied as they are, not decoded, combine with `presize_records`
+    to store smaller images. Only the image is stored in the shards, components
+    that read other files when loaded (e.g. `MaskFile`) still read them from their
+    original location.
+
+    # Arguments
+        records: Records to write, e.g. as returned by `Parser.parse`.
+        out_dir: Where the shards are written, created if it does not exist.
+        records_per_shard: Maximum number of records in each shard. Shards are the unit of
+            work split between `DataLoader` workers (and ranks), there should be
+            a few times more shards than workers.
+        show_pbar: Whether or not to show a progress bar.
+
+    # Returns
+        The paths of the shards.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    shared = {}
+    shards_info, filepaths = [], []
+    tar = None
+    for i, record in enumerate(pbar(records, show=show_pbar)):
+        if i % records_per_shard == 0:
+            if tar is not None:
+                _close_shard(tar, filepaths[-1])
+            filepaths.append(out_dir / f"shard-{len(filepaths):06d}.tar")
+            shards_info.append({"path": filepaths[-1].name, "num_records": 0})
+            tar = tarfile.open(_tmp_filepath(filepaths[-1]), "w")
+        _write_record(tar, f"{i:09d}", record, shared)
+        shards_info[-1]["num_records"] += 1
+    if tar is not None:
+        _close_shard(tar, filepaths[-1])
+
+    shared_objs = [obj for _, obj in sorted(shared.values(), key=itemgetter(0))]
+    with open(out_dir / _SHARED_FILENAME, "wb") as f:
+        pickle.dump(shared_objs, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # written last, an interrupted run does not leave a valid index
+    index = {"version": SHARDS_VERSION, "shards": shards_info}
+    (out_dir / _INDEX_FILENAME).write_text(json.dumps(index))
+
+    return filepaths
+
+
+def _tmp_filepath(filepath: Path) -> Path:
+    return filepath.with_name(f"{filepath.name}.tmp")
+
+
+def _close_shard(tar: tarfile.TarFile, filepath: Path) -> None:
+    tar.close()
+    os.replace(_tmp_filepath(filepath), filepath)
+
+
+def _write_record(
+    tar: tarfile.TarFile, key: str, record: BaseRecord, shared: dict
+) -> None:
+    buffer = io.BytesIO()
+    _RecordPickler(buffer, shared).dump(record)
+    _add_tar_member(tar, f"{key}.pkl", buffer.getvalue())
+
+    filepath = getattr(record, "filepath", None)
+    if filepath is not None:
+        _add_tar_member(tar, f"{key}{filepath.suffix.lower()}", filepath.read_bytes())
+
+
+def _add_tar_member(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+class StreamingDataset(IterableDataset):
+    """Iterable flavour of `Dataset`, reads records and images sequentially from the
+    tar shards written by `write_shards`.
+
+    Reading a few large files sequentially is much faster than opening millions of
+    small image files at random, specially on network or object store backed
+    filesystems. Shards are split between ranks (when `torch.distributed` is
+    initialized) and between `DataLoader` workers, so each record is read once per
+    epoch. Works with the `train_dl` and `valid_dl` of all models, the `shuffle`
+    argument of the `DataLoader` is ignored, shuffling is done by the dataset.
+
+    Shuffling is done at two levels, the order of the shards is shuffled every epoch
+    and the records read are passed through a shuffle buffer. The order of the
+    shards depends on `seed` and the epoch, call `set_epoch` at the beginning of
+    each epoch (as with a `DistributedSampler`) to read them in a different order.
+
+    # Arguments
+        shards_dir: Directory the shards were written to by `write_shards`.
+        tfm: Transforms to be applied to each item.
+        shuffle: Whether or not to shuffle the shards and the records.
+        shuffle_buffer: Number of records kept in memory (by each worker) to
+            shuffle them, only the order of the shards is shuffled if 1.
+        seed: Seed used to shuffle the shards, needs to be the same on all ranks.
+    """
+
+    def __init__(
+        self,
+        shards_dir: Union[str, Path],
+        tfm: Optional[Transform] = None,
+        shuffle: bool = True,
+        shuffle_buffer: int = 1000,
+        seed: int = 0,
+    ):
+        self.shards_dir = Path(shards_dir)
+        index = json.loads((self.shards_dir / _INDEX_FILENAME).read_text())
+        if index.get("version") != SHARDS_VERSION:
+            raise ValueError(
+                f"Shards version {index.get('version')} is not supported, "
+                f"expected version {SHARDS_VERSION}, write the shards again"
+            )
+        self.shards = index["shards"]
+        with open(self.shards_dir / _SHARED_FILENAME, "rb") as f:
+            self.shared = pickle.load(f)
+
+        self.tfm = tfm
+        self.shuffle = shuffle
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def __len__(self):
+        return sum(shard["num_records"] for shard in self._rank_shards())
+
+    def __iter__(self):
+        shards = self._rank_shards()
+        worker_info = get_worker_info()
+        if worker_info is not None:
+            shards = shards[worker_info.id :: worker_info.num_workers]
+
+        records = (
+            record
+            for shard in shards
+            for record in self._read_shard(self.shards_dir / shard["path"])
+        )
+        if self.shuffle:
+            records = _shuffle_buffer(records, self.shuffle_buffer)
+
+        for record in records:
+            if self.tfm is not None:
+                record = self.tfm(record)
+            yield record
+
+    def __repr__(self):
+        num_records = sum(shard["num_records"] for shard in self.shards)
+        return (
+            f"<{self.__class__.__name__} with {num_records} items "
+            f"in {len(self.shards)} shards>"
+        )
+
+    def _rank_shards(self) -> List[dict]:
+        shards = self.shards
+        if self.shuffle:
+            rng = random.Random(self.seed + self.epoch)
+            shards = rng.sample(shards, len(shards))
+        if dist.is_available() and dist.is_initialized():
+            shards = shards[dist.get_rank() :: dist.get_world_size()]
+        return shards
+
+    def _read_shard(self, filepath: Path) -> Iterator[BaseRecord]:
+        record = None
+        # streaming mode, the shard is only read sequentially
+        with tarfile.open(filepath, mode="r|") as tar:
+            for member in tar:
+                data = tar.extractfile(member).read()
+                if member.name.endswith(".pkl"):
+                    if record is not None:
+                        yield self._load(record)
+                    record = _RecordUnpickler(io.BytesIO(data), self.shared).load()
+                else:
+                    record.set_img(open_img(io.BytesIO(data)))
+        if record is not None:
+            yield self._load(record)
+
+    def _load(self, record: BaseRecord) -> BaseRecord:
+        # the record was just unpickled, it's not shared with other items, the
+        # image is already set and the other components are loaded as usual
+        record.reduce_on_components("_load")
+        return record
+
+
+def _shuffle_buffer(items: Iterable, size: int) -> Iterator:
+    # workers have different seeds, they can't share the global random state
+    rng = random.Random(torch.initial_seed())
+    size = max(1, size)
+    buffer = []
+    for item in items:
+        if len(buffer) < size:
+            buffer.append(item)
+            continue
+        i = rng.randrange(size)
+        yield buffer[i]
+        buffer[i] = item
+    rng.shuffle(buffer)
+    yield from buffer
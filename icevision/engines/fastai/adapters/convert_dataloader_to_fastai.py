@@ -1,6 +1,7 @@
 __all__ = ["convert_dataloader_to_fastai"]
 
 from icevision.imports import *
+from icevision.data import *
 from icevision.engines.fastai.imports import *
 from torch.utils.data import SequentialSampler, RandomSampler
 
@@ -13,6 +14,23 @@ def convert_dataloader_to_fastai(dataloader: DataLoader):
         def create_batch(self, b):
             return (dataloader.collate_fn, raise_error_convert)[self.prebatched](b)
 
+    batch_sampler = dataloader.batch_sampler
+    if isinstance(batch_sampler, AspectRatioBatchSampler):
+        # all batches are full except the last one, fastai splits the flattened
+        # indexes in the same batches
+        class FastaiDataLoaderWithBatchSampler(FastaiDataLoaderWithCollate):
+            def get_idxs(self):
+                return [i for batch in batch_sampler for i in batch]
+
+        return FastaiDataLoaderWithBatchSampler(
+            dataset=dataloader.dataset,
+            bs=batch_sampler.batch_size,
+            num_workers=dataloader.num_workers,
+            drop_last=batch_sampler.drop_last,
+            shuffle=False,
+            pin_memory=dataloader.pin_memory,
+        )
+
     # use the type of sampler to determine if shuffle is true or false
     if isinstance(dataloader.sampler, SequentialSampler):
         shuffle = False
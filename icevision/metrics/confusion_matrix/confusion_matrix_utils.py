@@ -1,5 +1,5 @@
 from icevision.imports import *
-from icevision import BBox, BaseRecord
+from icevision import BBox, BBoxArray, BaseRecord
 
 
 def get_best_score_item(prediction_items: Collection[Dict]):
@@ -18,13 +18,8 @@ def pairwise_iou_record_record(target: BaseRecord, prediction: BaseRecord):
     """
     Calculates pairwise iou on prediction and target BaseRecord. Uses torchvision implementation of `box_iou`.
     """
-    stacked_preds = [bbox.to_tensor() for bbox in prediction.detection.bboxes]
-    stacked_preds = torch.stack(stacked_preds) if stacked_preds else torch.empty(0, 4)
-
-    stacked_targets = [bbox.to_tensor() for bbox in target.detection.bboxes]
-    stacked_targets = (
-        torch.stack(stacked_targets) if stacked_targets else torch.empty(0, 4)
-    )
+    stacked_preds = BBoxArray.from_bboxes(prediction.detection.bboxes).to_tensor()
+    stacked_targets = BBoxArray.from_bboxes(target.detection.bboxes).to_tensor()
     return torchvision.ops.box_iou(stacked_preds, stacked_targets)
 
 
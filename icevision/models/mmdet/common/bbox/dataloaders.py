@@ -13,30 +13,40 @@ from icevision.imports import *
 from icevision.models.utils import *
 
 
-def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def train_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     return transform_dl(
         dataset=dataset,
         build_batch=build_train_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def valid_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     return transform_dl(
         dataset=dataset,
         build_batch=build_valid_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def infer_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for inferring the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -47,22 +57,22 @@ def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_infer_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
 def build_train_batch(
-    records: Sequence[RecordType],
+    records: Sequence[RecordType], uint8_imgs: bool = False
 ) -> Tuple[dict, List[Dict[str, torch.Tensor]]]:
-    images, labels, bboxes, img_metas = [], [], [], []
+    labels, bboxes, img_metas = [], [], []
     for record in records:
-        images.append(_img_tensor(record))
         img_metas.append(_img_meta(record))
         labels.append(_labels(record))
         bboxes.append(_bboxes(record))
 
     data = {
-        "img": torch.stack(images),
+        "img": _imgs_tensor(records, uint8_imgs),
         "img_metas": img_metas,
         "gt_labels": labels,
         "gt_bboxes": bboxes,
@@ -72,25 +82,31 @@ def build_train_batch(
 
 
 def build_valid_batch(
-    records: Sequence[RecordType],
+    records: Sequence[RecordType], uint8_imgs: bool = False
 ) -> Tuple[dict, List[Dict[str, torch.Tensor]]]:
-    return build_train_batch(records=records)
+    return build_train_batch(records=records, uint8_imgs=uint8_imgs)
 
 
-def build_infer_batch(records):
-    imgs, img_metas = [], []
+def build_infer_batch(records, uint8_imgs: bool = False):
+    img_metas = []
     for record in records:
-        imgs.append(_img_tensor(record))
         img_metas.append(_img_meta(record))
 
     data = {
-        "img": [torch.stack(imgs)],
+        "img": [_imgs_tensor(records, uint8_imgs)],
         "img_metas": [img_metas],
     }
 
     return data, records
 
 
+def _imgs_tensor(records, uint8_imgs: bool = False):
+    if uint8_imgs:
+        # converted to BGR on the device, by `normalize_imgs`
+        return _collate_imgs(records, uint8_imgs=True)
+    return torch.stack([_img_tensor(record) for record in records])
+
+
 def _img_tensor(record):
     # convert from RGB to BGR
     img = record.img[:, :, ::-1].copy()
@@ -124,5 +140,4 @@ def _bboxes(record):
     if len(record.detection.label_ids) == 0:
         raise RuntimeError("Negative samples still needs to be implemented")
     else:
-        xyxys = [bbox.xyxy for bbox in record.detection.bboxes]
-        return tensor(xyxys, dtype=torch.float32)
+        return BBoxArray.from_bboxes(record.detection.bboxes).to_tensor()
@@ -1,6 +1,7 @@
 __all__ = ["learner"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.models.mmdet.fastai.learner import mmdetection_learner
 from icevision.models.mmdet.common.bbox.fastai.callbacks import BBoxMMDetectionCallback
 
@@ -9,6 +10,7 @@ def learner(
     dls: List[Union[DataLoader, fastai.DataLoader]],
     model: nn.Module,
     cbs=None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
     **learner_kwargs,
 ):
     """Fastai `Learner` adapted for MMDetection Object Detection models.
@@ -18,10 +20,13 @@ def learner(
         The first one will be used for training and the second for validation.
         model: The model to train.
         cbs: Optional `Sequence` of callbacks.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
         **learner_kwargs: Keyword arguments that will be internally passed to `Learner`.
 
     # Returns
         A fastai `Learner`.
     """
-    cbs = [BBoxMMDetectionCallback] + L(cbs)
+    cbs = [BBoxMMDetectionCallback(norm_stats=norm_stats)] + L(cbs)
     return mmdetection_learner(dls=dls, model=model, cbs=cbs, **learner_kwargs)
@@ -12,37 +12,47 @@ from icevision.core import *
 from icevision.imports import *
 from icevision.models.utils import *
 from icevision.models.mmdet.common.bbox.dataloaders import (
-    _img_tensor,
+    _imgs_tensor,
     _img_meta,
     _labels,
     _bboxes,
 )
 
 
-def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def train_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     return transform_dl(
         dataset=dataset,
         build_batch=build_train_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def valid_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     return transform_dl(
         dataset=dataset,
         build_batch=build_valid_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def infer_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for inferring the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -53,29 +63,29 @@ def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_infer_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
 def build_valid_batch(
-    records: Sequence[RecordType],
+    records: Sequence[RecordType], uint8_imgs: bool = False
 ) -> Tuple[dict, List[Dict[str, torch.Tensor]]]:
-    return build_train_batch(records=records)
+    return build_train_batch(records=records, uint8_imgs=uint8_imgs)
 
 
 def build_train_batch(
-    records: Sequence[RecordType],
+    records: Sequence[RecordType], uint8_imgs: bool = False
 ) -> Tuple[dict, List[Dict[str, torch.Tensor]]]:
-    images, labels, bboxes, masks, img_metas = [], [], [], [], []
+    labels, bboxes, masks, img_metas = [], [], [], []
     for record in records:
-        images.append(_img_tensor(record))
         img_metas.append(_img_meta_mask(record))
         labels.append(_labels(record))
         bboxes.append(_bboxes(record))
         masks.append(_masks(record))
 
     data = {
-        "img": torch.stack(images),
+        "img": _imgs_tensor(records, uint8_imgs),
         "img_metas": img_metas,
         "gt_labels": labels,
         "gt_bboxes": bboxes,
@@ -85,14 +95,13 @@ def build_train_batch(
     return data, records
 
 
-def build_infer_batch(records):
-    imgs, img_metas = [], []
+def build_infer_batch(records, uint8_imgs: bool = False):
+    img_metas = []
     for record in records:
-        imgs.append(_img_tensor(record))
         img_metas.append(_img_meta_mask(record))
 
     data = {
-        "img": [torch.stack(imgs)],
+        "img": [_imgs_tensor(records, uint8_imgs)],
         "img_metas": [img_metas],
     }
 
@@ -109,6 +118,7 @@ def _masks(record):
     if len(record.detection.masks) == 0:
         raise RuntimeError("Negative samples still needs to be implemented")
     else:
-        mask = record.detection.masks.data
-        _, h, w = mask.shape
-        return BitmapMasks(mask, height=h, width=w)
+        # compact masks are only expanded here
+        masks = record.detection.masks
+        _, h, w = masks.shape
+        return BitmapMasks(masks.to_mask(h=h, w=w).data, height=h, width=w)
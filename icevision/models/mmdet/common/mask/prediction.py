@@ -25,9 +25,12 @@ def _predict_batch(
     detection_threshold: float = 0.5,
     keep_images: bool = False,
     device: Optional[torch.device] = None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
 ):
     device = device or model_device(model)
-    batch["img"] = [img.to(device) for img in batch["img"]]
+    batch["img"] = [
+        normalize_imgs(img.to(device), *norm_stats, bgr=True) for img in batch["img"]
+    ]
 
     raw_preds = model(return_loss=False, rescale=False, **batch)
     return convert_raw_predictions(
@@ -1,6 +1,7 @@
 __all__ = ["MMDetectionCallback"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.engines.fastai import *
 from icevision.models.mmdet.utils import *
 
@@ -22,11 +23,20 @@ class _ModelWrap(nn.Module):
 
 
 class MMDetectionCallback(fastai.Callback):
+    def __init__(
+        self, norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS
+    ):
+        super().__init__()
+        # mean and std used to normalize the images of uint8 batches
+        self.norm_stats = norm_stats
+
     def after_create(self):
         self.learn.model = _ModelWrap(self.model)
         self.model.param_groups = self.model.model.param_groups
 
     def before_batch(self):
+        data = self.xb[0]
+        data["img"] = normalize_imgs(data["img"], *self.norm_stats, bgr=True)
         self.learn.records = self.yb[0]
         self.learn.yb = self.xb
 
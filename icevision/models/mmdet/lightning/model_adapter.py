@@ -17,14 +17,23 @@ class MMDetModelAdapter(LightningModelAdapter, ABC):
     # Arguments
         model: The pytorch model to use.
         metrics: `Sequence` of metrics to use.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
 
     # Returns
         A `LightningModule`.
     """
 
-    def __init__(self, model: nn.Module, metrics: List[Metric] = None):
+    def __init__(
+        self,
+        model: nn.Module,
+        metrics: List[Metric] = None,
+        norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
+    ):
         super().__init__(metrics=metrics)
         self.model = model
+        self.norm_stats = norm_stats
 
     @abstractmethod
     def convert_raw_predictions(self, batch, raw_preds, records):
@@ -35,6 +44,7 @@ class MMDetModelAdapter(LightningModelAdapter, ABC):
 
     def training_step(self, batch, batch_idx):
         data, samples = batch
+        data["img"] = normalize_imgs(data["img"], *self.norm_stats, bgr=True)
 
         outputs = self.model.train_step(data=data, optimizer=None)
 
@@ -45,6 +55,7 @@ class MMDetModelAdapter(LightningModelAdapter, ABC):
 
     def validation_step(self, batch, batch_idx):
         data, records = batch
+        data["img"] = normalize_imgs(data["img"], *self.norm_stats, bgr=True)
         self.model.eval()
         with torch.no_grad():
             outputs = self.model.train_step(data=data, optimizer=None)
@@ -8,15 +8,20 @@ __all__ = [
 ]
 
 from icevision.imports import *
+from icevision.core import *
 from icevision.models.utils import *
 
 
-def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def train_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for training the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -27,16 +32,21 @@ def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_train_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def valid_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for validating the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -47,16 +57,21 @@ def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_valid_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def infer_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for inferring the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -67,11 +82,12 @@ def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_infer_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def build_train_batch(records):
+def build_train_batch(records, uint8_imgs: bool = False):
     """Builds a batch in the format required by the model when training.
 
     # Arguments
@@ -90,13 +106,13 @@ def build_train_batch(records):
     outs = model(*batch)
     ```
     """
-    batch_images, batch_bboxes, batch_classes = zip(
+    batch_bboxes, batch_classes = zip(
         *(process_train_record(record) for record in records)
     )
 
     # convert to tensors
-    batch_images = torch.stack(batch_images)
-    batch_bboxes = [tensor(bboxes, dtype=torch.float32) for bboxes in batch_bboxes]
+    batch_images = _collate_imgs(records, uint8_imgs=uint8_imgs)
+    batch_bboxes = [torch.from_numpy(bboxes) for bboxes in batch_bboxes]
     batch_classes = [tensor(classes, dtype=torch.float32) for classes in batch_classes]
 
     # convert to EffDet interface
@@ -105,7 +121,7 @@ def build_train_batch(records):
     return (batch_images, targets), records
 
 
-def build_valid_batch(records):
+def build_valid_batch(records, uint8_imgs: bool = False):
     """Builds a batch in the format required by the model when validating.
 
     # Arguments
@@ -124,7 +140,7 @@ def build_valid_batch(records):
     outs = model(*batch)
     ```
     """
-    (batch_images, targets), records = build_train_batch(records)
+    (batch_images, targets), records = build_train_batch(records, uint8_imgs)
 
     # convert to EffDet interface, when not training, dummy size and scale is required
     targets = dict(img_size=None, img_scale=None, **targets)
@@ -132,7 +148,7 @@ def build_valid_batch(records):
     return (batch_images, targets), records
 
 
-def build_infer_batch(records):
+def build_infer_batch(records, uint8_imgs: bool = False):
     """Builds a batch in the format required by the model when doing inference.
 
     # Arguments
@@ -148,12 +164,12 @@ def build_infer_batch(records):
     outs = model(*batch)
     ```
     """
-    batch_images, batch_sizes, batch_scales = zip(
+    batch_sizes, batch_scales = zip(
         *(process_infer_record(record) for record in records)
     )
 
     # convert to tensors
-    batch_images = torch.stack(batch_images)
+    batch_images = _collate_imgs(records, uint8_imgs=uint8_imgs)
     batch_sizes = tensor(batch_sizes, dtype=torch.float32)
     batch_scales = tensor(batch_scales, dtype=torch.float32)
 
@@ -165,21 +181,19 @@ def build_infer_batch(records):
 
 def process_train_record(record) -> tuple:
     """Extracts information from record and prepares a format required by the EffDet training"""
-    image = im2tensor(record.img)
     # background and dummy if no label in record
     classes = record.detection.label_ids if record.detection.label_ids else [0]
     bboxes = (
-        [bbox.yxyx for bbox in record.detection.bboxes]
+        BBoxArray.from_bboxes(record.detection.bboxes).yxyx
         if len(record.detection.label_ids) > 0
-        else [[0, 0, 0, 0]]
+        else np.zeros((1, 4), dtype=np.float32)
     )
-    return image, bboxes, classes
+    return bboxes, classes
 
 
 def process_infer_record(record) -> tuple:
     """Extracts information from record and prepares a format required by the EffDet inference"""
-    image = im2tensor(record.img)
-    image_size = image.shape[-2:]
+    image_size = record.img.shape[:2]
     image_scale = 1.0
 
-    return image, image_size, image_scale
+    return image_size, image_scale
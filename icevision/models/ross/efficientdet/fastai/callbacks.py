@@ -1,13 +1,23 @@
 __all__ = ["EfficientDetCallback"]
 
+from icevision.imports import *
+from icevision.utils import *
 from icevision.models.ross import efficientdet
 from icevision.engines.fastai import *
 
 
 class EfficientDetCallback(fastai.Callback):
+    def __init__(
+        self, norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS
+    ):
+        super().__init__()
+        # mean and std used to normalize the images of uint8 batches
+        self.norm_stats = norm_stats
+
     def before_batch(self):
         assert len(self.xb) == len(self.yb) == 1, "Only works for single input-output"
-        self.learn.xb = self.xb[0]
+        images, targets = self.xb[0]
+        self.learn.xb = (normalize_imgs(images, *self.norm_stats), targets)
         self.learn.records = self.yb[0]
         self.learn.yb = ()
 
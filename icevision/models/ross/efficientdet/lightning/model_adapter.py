@@ -1,6 +1,7 @@
 __all__ = ["ModelAdapter"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.metrics import *
 from icevision.engines.lightning.lightning_model_adapter import LightningModelAdapter
 from icevision.models.ross import efficientdet
@@ -15,20 +16,30 @@ class ModelAdapter(LightningModelAdapter, ABC):
     # Arguments
         model: The pytorch model to use.
         metrics: `Sequence` of metrics to use.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
 
     # Returns
         A `LightningModule`.
     """
 
-    def __init__(self, model: nn.Module, metrics: List[Metric] = None):
+    def __init__(
+        self,
+        model: nn.Module,
+        metrics: List[Metric] = None,
+        norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
+    ):
         super().__init__(metrics=metrics)
         self.model = model
+        self.norm_stats = norm_stats
 
     def forward(self, *args, **kwargs):
         return self.model(*args, **kwargs)
 
     def training_step(self, batch, batch_idx):
         (xb, yb), records = batch
+        xb = normalize_imgs(xb, *self.norm_stats)
         preds = self(xb, yb)
 
         loss = efficientdet.loss_fn(preds, yb)
@@ -40,6 +51,7 @@ class ModelAdapter(LightningModelAdapter, ABC):
 
     def validation_step(self, batch, batch_idx):
         (xb, yb), records = batch
+        xb = normalize_imgs(xb, *self.norm_stats)
 
         with torch.no_grad():
             raw_preds = self(xb, yb)
@@ -17,11 +17,12 @@ def _predict_batch(
     detection_threshold: float = 0.5,
     keep_images: bool = False,
     device: Optional[torch.device] = None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
 ) -> List[Prediction]:
     device = device or model_device(model)
 
     imgs, img_info = batch
-    imgs = imgs.to(device)
+    imgs = normalize_imgs(imgs.to(device), *norm_stats)
     img_info = {k: v.to(device) for k, v in img_info.items()}
 
     bench = DetBenchPredict(unwrap_bench(model))
@@ -29,7 +30,7 @@ def _predict_batch(
 
     raw_preds = bench(x=imgs, img_info=img_info)
     preds = convert_raw_predictions(
-        batch=batch,
+        batch=(imgs, img_info),
         raw_preds=raw_preds,
         records=records,
         detection_threshold=detection_threshold,
@@ -12,12 +12,16 @@ from icevision.core import *
 from icevision.models.utils import *
 
 
-def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def train_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for training the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -28,16 +32,21 @@ def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_train_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def valid_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for validating the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -48,16 +57,21 @@ def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_valid_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def infer_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for inferring the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -68,16 +82,17 @@ def infer_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_infer_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
 def _build_train_sample(
-    record: RecordType,
+    record: RecordType, uint8_imgs: bool = False
 ) -> Tuple[torch.Tensor, Dict[str, torch.Tensor]]:
     assert len(record.detection.label_ids) == len(record.detection.bboxes)
 
-    image = im2tensor(record.img)
+    image = _img_to_tensor(record.img, uint8_imgs=uint8_imgs)
     target = {}
 
     # If no labels and bboxes are present, use as negative samples as described in
@@ -87,14 +102,14 @@ def _build_train_sample(
         target["boxes"] = torch.zeros((0, 4), dtype=torch.float32)
     else:
         target["labels"] = tensor(record.detection.label_ids, dtype=torch.int64)
-        xyxys = [bbox.xyxy for bbox in record.detection.bboxes]
-        target["boxes"] = tensor(xyxys, dtype=torch.float32)
+        bboxes = BBoxArray.from_bboxes(record.detection.bboxes)
+        target["boxes"] = bboxes.to_tensor()
 
     return image, target
 
 
 def build_train_batch(
-    records: Sequence[RecordType],
+    records: Sequence[RecordType], uint8_imgs: bool = False
 ) -> Tuple[List[torch.Tensor], List[Dict[str, torch.Tensor]]]:
     """Builds a batch in the format required by the model when training.
 
@@ -117,7 +132,7 @@ def build_train_batch(
     """
     images, targets = [], []
     for record in records:
-        image, target = _build_train_sample(record)
+        image, target = _build_train_sample(record, uint8_imgs=uint8_imgs)
         images.append(image)
         targets.append(target)
 
@@ -125,7 +140,7 @@ def build_train_batch(
 
 
 def build_valid_batch(
-    records: List[RecordType],
+    records: List[RecordType], uint8_imgs: bool = False
 ) -> Tuple[List[torch.Tensor], Dict[str, torch.Tensor]]:
     """Builds a batch in the format required by the model when validating.
 
@@ -146,10 +161,10 @@ def build_valid_batch(
     outs = model(*batch)
     ```
     """
-    return build_train_batch(records=records)
+    return build_train_batch(records=records, uint8_imgs=uint8_imgs)
 
 
-def build_infer_batch(records: Sequence[RecordType]):
+def build_infer_batch(records: Sequence[RecordType], uint8_imgs: bool = False):
     """Builds a batch in the format required by the model when doing inference.
 
     # Arguments
@@ -168,7 +183,6 @@ def build_infer_batch(records: Sequence[RecordType]):
     outs = model(*batch)
     ```
     """
-    tensor_imgs = [im2tensor(record.img) for record in records]
-    tensor_imgs = torch.stack(tensor_imgs)
+    tensor_imgs = _collate_imgs(records, uint8_imgs=uint8_imgs)
 
     return (tensor_imgs,), records
@@ -1,4 +1,5 @@
 from icevision.imports import *
+from icevision.utils import *
 from icevision.engines.fastai import *
 from icevision.models.torchvision.fastai.learner import rcnn_learner
 from icevision.models.torchvision.faster_rcnn.fastai.callbacks import *
@@ -8,6 +9,7 @@ def learner(
     dls: Sequence[Union[DataLoader, fastai.DataLoader]],
     model: nn.Module,
     cbs: Optional[Sequence[fastai.Callback]] = None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
     **learner_kwargs
 ) -> fastai.Learner:
     """Fastai `Learner` adapted for Faster RCNN.
@@ -17,10 +19,13 @@ def learner(
         The first one will be used for training and the second for validation.
         model: The model to train.
         cbs: Optional `Sequence` of callbacks.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
         **learner_kwargs: Keyword arguments that will be internally passed to `Learner`.
 
     # Returns
         A fastai `Learner`.
     """
-    cbs = [FasterRCNNCallback()] + L(cbs)
+    cbs = [FasterRCNNCallback(norm_stats=norm_stats)] + L(cbs)
     return rcnn_learner(dls=dls, model=model, cbs=cbs, **learner_kwargs)
@@ -21,10 +21,11 @@ def _predict_batch(
     detection_threshold: float = 0.5,
     keep_images: bool = False,
     device: Optional[torch.device] = None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
 ):
     model.eval()
     device = device or model_device(model)
-    batch = [o.to(device) for o in batch]
+    batch = [normalize_imgs(o.to(device), *norm_stats) for o in batch]
 
     raw_preds = model(*batch)
     return convert_raw_predictions(
@@ -19,12 +19,16 @@ from icevision.models.torchvision.faster_rcnn.dataloaders import (
 )
 
 
-def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def train_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for training the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -35,16 +39,21 @@ def train_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_train_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
+def valid_dl(
+    dataset, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+) -> DataLoader:
     """A `DataLoader` with a custom `collate_fn` that batches items as required for validating the model.
 
     # Arguments
         dataset: Possibly a `Dataset` object, but more generally, any `Sequence` that returns records.
         batch_tfms: Transforms to be applied at the batch level.
+        uint8_imgs: Whether or not to keep the images uint8, they're then normalized on
+        the device (by the model adapters and `predict_from_dl`) instead of by `tfms.A.Normalize`.
         **dataloader_kwargs: Keyword arguments that will be internally passed to a Pytorch `DataLoader`.
         The parameter `collate_fn` is already defined internally and cannot be passed here.
 
@@ -55,32 +64,33 @@ def valid_dl(dataset, batch_tfms=None, **dataloader_kwargs) -> DataLoader:
         dataset=dataset,
         build_batch=build_valid_batch,
         batch_tfms=batch_tfms,
+        uint8_imgs=uint8_imgs,
         **dataloader_kwargs
     )
 
 
-def _build_keypoints_train_sample(record: RecordType):
+def _build_keypoints_train_sample(record: RecordType, uint8_imgs: bool = False):
     assert (
         len(record.detection.label_ids)
         == len(record.detection.bboxes)
         == len(record.detection.keypoints)
     )
 
-    image, target = _build_train_sample(record=record)
+    image, target = _build_train_sample(record=record, uint8_imgs=uint8_imgs)
 
     # If no labels and bboxes are present, use as negative samples as described in
     # https://github.com/pytorch/vision/releases/tag/v0.6.0
     if len(record.detection.label_ids) == 0:
         target["keypoints"] = torch.zeros((0, 3), dtype=torch.float32)
     else:
-        kps = [kp.xyv for kp in record.detection.keypoints]
-        target["keypoints"] = tensor(kps, dtype=torch.float32)
+        kps = record.detection.keypoints_data
+        target["keypoints"] = torch.as_tensor(kps, dtype=torch.float32)
 
     return image, target
 
 
 def build_train_batch(
-    records: List[RecordType],
+    records: List[RecordType], uint8_imgs: bool = False
 ) -> Tuple[List[torch.Tensor], List[Dict[str, torch.Tensor]]]:
     """Builds a batch in the format required by the model when training.
 
@@ -103,7 +113,7 @@ def build_train_batch(
     """
     images, targets = [], []
     for record in records:
-        image, target = _build_keypoints_train_sample(record)
+        image, target = _build_keypoints_train_sample(record, uint8_imgs=uint8_imgs)
         images.append(image)
         targets.append(target)
 
@@ -111,7 +121,7 @@ def build_train_batch(
 
 
 def build_valid_batch(
-    records: List[RecordType],
+    records: List[RecordType], uint8_imgs: bool = False
 ) -> Tuple[List[torch.Tensor], List[Dict[str, torch.Tensor]]]:
     """Builds a batch in the format required by the model when validating.
 
@@ -132,4 +142,4 @@ def build_valid_batch(
     outs = model(*batch)
     ```
     """
-    return build_train_batch(records=records)
+    return build_train_batch(records=records, uint8_imgs=uint8_imgs)
@@ -1,6 +1,7 @@
 __all__ = ["learner"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.engines.fastai import *
 from icevision.models.torchvision.fastai.learner import rcnn_learner
 from icevision.models.torchvision.keypoint_rcnn.fastai.callbacks import *
@@ -10,6 +11,7 @@ def learner(
     dls: List[Union[DataLoader, fastai.DataLoader]],
     model: nn.Module,
     cbs=None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
     **learner_kwargs
 ):
     """Fastai `Learner` adapted for RCNN.
@@ -19,10 +21,13 @@ def learner(
         The first one will be used for training and the second for validation.
         model: The model to train.
         cbs: Optional `Sequence` of callbacks.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
         **learner_kwargs: Keyword arguments that will be internally passed to `Learner`.
 
     # Returns
         A fastai `Learner`.
     """
-    cbs = [KeypointRCNNCallback()] + L(cbs)
+    cbs = [KeypointRCNNCallback(norm_stats=norm_stats)] + L(cbs)
     return rcnn_learner(dls=dls, model=model, cbs=cbs, **learner_kwargs)
@@ -5,7 +5,6 @@ __all__ = [
     "convert_raw_predictions",
 ]
 
-from itertools import chain
 from icevision.imports import *
 from icevision.core import *
 from icevision.utils import *
@@ -25,10 +24,11 @@ def _predict_batch(
     detection_threshold: float = 0.5,
     keep_images: bool = False,
     device: Optional[torch.device] = None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
 ):
     model.eval()
     device = device or model_device(model)
-    batch = [o.to(device) for o in batch]
+    batch = [normalize_imgs(o.to(device), *norm_stats) for o in batch]
 
     raw_preds = model(*batch)
     return convert_raw_predictions(
@@ -110,15 +110,10 @@ def convert_raw_prediction(
     )
 
     above_threshold = pred.detection.above_threshold
-    kps = raw_pred["keypoints"][above_threshold]
-    keypoints = []
-    for k in kps:
-        k = k.cpu().numpy()
-        k = list(chain.from_iterable(k))
-        # `if sum(k) > 0` prevents empty `KeyPoints` objects to be instantiated.
-        # E.g. `k = [0, 0, 0, 0, 0, 0]` is a flattened list of 2 points `(0, 0, 0)` and `(0, 0, 0)`. We don't want a `KeyPoints` object to be created on top of this list.
-        if sum(k) > 0:
-            keypoints.append(KeyPoints.from_xyv(k, None))
+    kps = raw_pred["keypoints"][above_threshold].detach().cpu().numpy()
+    # `if k.sum() > 0` prevents empty `KeyPoints` objects to be instantiated.
+    # E.g. `k = [[0, 0, 0], [0, 0, 0]]` are 2 points `(0, 0, 0)` and `(0, 0, 0)`. We don't want a `KeyPoints` object to be created on top of them.
+    keypoints = [KeyPoints.from_xyv(k.reshape(-1), None) for k in kps if k.sum() > 0]
 
     pred.pred.add_component(KeyPointsRecordComponent())
     pred.pred.detection.add_keypoints(keypoints)
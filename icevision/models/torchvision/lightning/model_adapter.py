@@ -8,9 +8,15 @@ from icevision.models.torchvision.loss_fn import loss_fn
 
 
 class RCNNModelAdapter(LightningModelAdapter, ABC):
-    def __init__(self, model: nn.Module, metrics: Sequence[Metric] = None):
+    def __init__(
+        self,
+        model: nn.Module,
+        metrics: Sequence[Metric] = None,
+        norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
+    ):
         super().__init__(metrics=metrics)
         self.model = model
+        self.norm_stats = norm_stats
 
     @abstractmethod
     def convert_raw_predictions(self, batch, raw_preds, records):
@@ -21,6 +27,7 @@ class RCNNModelAdapter(LightningModelAdapter, ABC):
 
     def training_step(self, batch, batch_idx):
         (xb, yb), records = batch
+        xb = normalize_imgs(xb, *self.norm_stats)
         preds = self(xb, yb)
 
         loss = loss_fn(preds, yb)
@@ -30,6 +37,7 @@ class RCNNModelAdapter(LightningModelAdapter, ABC):
 
     def validation_step(self, batch, batch_idx):
         (xb, yb), records = batch
+        xb = normalize_imgs(xb, *self.norm_stats)
 
         with torch.no_grad():
             self.train()
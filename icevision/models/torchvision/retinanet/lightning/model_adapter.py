@@ -13,6 +13,9 @@ class ModelAdapter(RCNNModelAdapter):
     # Arguments
         model: The pytorch model to use.
         metrics: `Sequence` of metrics to use.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
 
     # Returns
         A `LightningModule`.
@@ -1,14 +1,23 @@
 __all__ = ["Yolov5Callback"]
 
+from icevision.imports import *
+from icevision.utils import *
 from icevision.engines.fastai import *
 from icevision.models.ultralytics import yolov5
 
 
 class Yolov5Callback(fastai.Callback):
+    def __init__(
+        self, norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS
+    ):
+        super().__init__()
+        # mean and std used to normalize the images of uint8 batches
+        self.norm_stats = norm_stats
+
     def before_batch(self):
         assert len(self.xb) == len(self.yb) == 1, "Only works for single input-output"
         x, y, records = self.xb[0][0], self.xb[0][1], self.yb
-        self.learn.xb = [x]
+        self.learn.xb = [normalize_imgs(x, *self.norm_stats)]
         self.learn.yb = [y]
         self.learn.records = records[0]
 
@@ -1,6 +1,7 @@
 __all__ = ["learner"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.engines.fastai import *
 from icevision.models.ultralytics.yolov5.fastai.callbacks import Yolov5Callback
 from yolov5.utils.loss import ComputeLoss
@@ -10,6 +11,7 @@ def learner(
     dls: List[Union[DataLoader, fastai.DataLoader]],
     model: nn.Module,
     cbs=None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
     **learner_kwargs,
 ):
     """Fastai `Learner` adapted for Yolov5.
@@ -19,12 +21,15 @@ def learner(
         The first one will be used for training and the second for validation.
         model: The model to train.
         cbs: Optional `Sequence` of callbacks.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
         **learner_kwargs: Keyword arguments that will be internally passed to `Learner`.
 
     # Returns
         A fastai `Learner`.
     """
-    cbs = [Yolov5Callback()] + L(cbs)
+    cbs = [Yolov5Callback(norm_stats=norm_stats)] + L(cbs)
 
     compute_loss = ComputeLoss(model)
 
@@ -1,6 +1,7 @@
 __all__ = ["ModelAdapter"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.metrics import *
 from icevision.engines.lightning.lightning_model_adapter import LightningModelAdapter
 from icevision.models.ultralytics import yolov5
@@ -16,14 +17,23 @@ class ModelAdapter(LightningModelAdapter, ABC):
     # Arguments
         model: The pytorch model to use.
         metrics: `Sequence` of metrics to use.
+        norm_stats: Mean and standard deviation of each channel, as `IMAGENET_STATS`,
+            used to normalize the images of dataloaders created with `uint8_imgs=True`.
+            Pass the ones of `tfms.A.Normalize` if they're not the ImageNet stats.
 
     # Returns
         A `LightningModule`.
     """
 
-    def __init__(self, model: nn.Module, metrics: List[Metric] = None):
+    def __init__(
+        self,
+        model: nn.Module,
+        metrics: List[Metric] = None,
+        norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
+    ):
         super().__init__(metrics=metrics)
         self.model = model
+        self.norm_stats = norm_stats
         self.compute_loss = ComputeLoss(model)
 
     def forward(self, *args, **kwargs):
@@ -31,6 +41,7 @@ class ModelAdapter(LightningModelAdapter, ABC):
 
     def training_step(self, batch, batch_idx):
         (xb, yb), _ = batch
+        xb = normalize_imgs(xb, *self.norm_stats)
         preds = self(xb)
 
         loss = self.compute_loss(preds, yb)[0]
@@ -41,6 +52,7 @@ class ModelAdapter(LightningModelAdapter, ABC):
 
     def validation_step(self, batch, batch_idx):
         (xb, yb), records = batch
+        xb = normalize_imgs(xb, *self.norm_stats)
 
         with torch.no_grad():
             inference_out, training_out = self(xb)
@@ -18,6 +18,7 @@ def _predict_batch(
     nms_iou_threshold: float = 0.45,
     keep_images: bool = False,
     device: Optional[torch.device] = None,
+    norm_stats: Tuple[Sequence[float], Sequence[float]] = IMAGENET_STATS,
 ) -> List[Prediction]:
     # device issue addressed on discord: https://discord.com/channels/735877944085446747/770279401791160400/832361687855923250
     if device is not None:
@@ -31,7 +32,7 @@ def _predict_batch(
     # trust it's device (will always be CPU)
     device = grid.device if grid.numel() > 1 else model_device(model)
 
-    batch = batch[0].to(device)
+    batch = normalize_imgs(batch[0].to(device), *norm_stats)
     model = model.eval().to(device)
 
     raw_preds = model(batch)[0]
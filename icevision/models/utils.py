@@ -4,6 +4,8 @@ __all__ = [
     "freeze",
     "transform_dl",
     "apply_batch_tfms",
+    "_img_to_tensor",
+    "_collate_imgs",
     "_predict_from_dl",
 ]
 
@@ -12,6 +14,8 @@ from icevision.utils import *
 from icevision.core import *
 from icevision.data import *
 from icevision.parsers import *
+from icevision.tfms.batch.img_collate import ImgCollate
+from icevision.tfms.batch.tensor_tfms import _batch_tensor
 
 BN_TYPES = (nn.BatchNorm1d, nn.BatchNorm2d, nn.BatchNorm3d)
 
@@ -52,8 +56,17 @@ def freeze(params):
         p.requires_grad = False
 
 
-def transform_dl(dataset, build_batch, batch_tfms=None, **dataloader_kwargs):
-    """Creates collate_fn from build_batch by decorating it with apply_batch_tfms and unload_records"""
+def transform_dl(
+    dataset, build_batch, batch_tfms=None, uint8_imgs=False, **dataloader_kwargs
+):
+    """Creates collate_fn from build_batch by decorating it with apply_batch_tfms and unload_records.
+    With `uint8_imgs`, build_batch is called with `uint8_imgs=True`.
+    """
+    if isinstance(dataset, torch.utils.data.IterableDataset):
+        # iterable datasets (e.g. `StreamingDataset`) do their own shuffling
+        dataloader_kwargs.pop("shuffle", None)
+    if uint8_imgs:
+        build_batch = partial(build_batch, uint8_imgs=True)
     collate_fn = apply_batch_tfms(build_batch, batch_tfms=batch_tfms)
     collate_fn = unload_records(collate_fn)
     return DataLoader(dataset=dataset, collate_fn=collate_fn, **dataloader_kwargs)
@@ -82,6 +95,50 @@ def unload_records(build_batch):
     return inner
 
 
+def _img_to_tensor(img: np.ndarray, uint8_imgs: bool = False) -> Tensor:
+    """Converts an image to a (C, H, W) tensor, float as `im2tensor` or, with
+    `uint8_imgs`, kept as uint8 to be normalized on the device by `normalize_imgs`.
+    """
+    if not uint8_imgs:
+        return im2tensor(img)
+    _check_uint8_img(img)
+    return torch.from_numpy(np.ascontiguousarray(img)).permute(2, 0, 1)
+
+
+def _collate_imgs(records: Sequence[RecordType], uint8_imgs: bool = False) -> Tensor:
+    """Stacks the images of the records, which need to have the same size, in a
+    (N, C, H, W) tensor. With `uint8_imgs` they're written once in a uint8 tensor
+    by `ImgCollate` instead of being converted and stacked. Images transformed by a
+    `TensorBatchTransform` are already stacked, that tensor is used instead.
+    """
+    imgs = [record.img for record in records]
+    batch = _batch_tensor(imgs)
+    if not uint8_imgs:
+        if batch is None:
+            return torch.stack([im2tensor(img) for img in imgs])
+        # as `im2tensor`, only uint8 images are scaled
+        return batch.float().div_(255) if batch.dtype == torch.uint8 else batch
+    for img in imgs:
+        _check_uint8_img(img)
+    if batch is not None:
+        return batch
+    if len({img.shape for img in imgs}) > 1:
+        raise ValueError("All images in a batch need to have the same size")
+    return _img_collate.collate(imgs)
+
+
+# a new tensor is created for every batch, it's not reused
+_img_collate = ImgCollate(num_buffers=0)
+
+
+def _check_uint8_img(img: np.ndarray) -> None:
+    if img.dtype != np.uint8:
+        raise ValueError(
+            f"uint8_imgs requires uint8 images, got {img.dtype}. The images are "
+            "normalized on the device, remove `tfms.A.Normalize` from the transforms"
+        )
+
+
 @torch.no_grad()
 def _predict_from_dl(
     predict_fn,
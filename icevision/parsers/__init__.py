@@ -1,4 +1,5 @@
 from icevision.parsers.parser import *
+from icevision.parsers.img_size_resolver import *
 
 from icevision.parsers.coco_parser import *
 from icevision.parsers.voc_parser import *
@@ -29,34 +29,122 @@ def coco(
 
 
 class COCOBaseParser(Parser):
+    """Base parser for COCO annotation files.
+
+    # Arguments
+        annotations_filepath: Path of the COCO json file.
+        img_dir: Directory containing the images.
+        idmap: Maps from image ids to record ids.
+        img_size_resolver: How to get the image sizes, defaults to `ImgSizeResolver()`.
+        stream: If True, the annotations file is not loaded in memory at once.
+            `images`, `categories` and `annotations` are read one item at a time
+            while parsing, so the peak memory is bounded by the size of the
+            records. `class_map` is only available after parsing.
+    """
+
     def __init__(
         self,
         annotations_filepath: Union[str, Path],
         img_dir: Union[str, Path],
         idmap: Optional[IDMap] = None,
+        img_size_resolver: Optional[ImgSizeResolver] = None,
+        stream: bool = False,
     ):
 
-        self.annotations_dict = json.loads(Path(annotations_filepath).read_bytes())
+        self.annotations_filepath = Path(annotations_filepath)
         self.img_dir = Path(img_dir)
-
-        self._record_id2info = {o["id"]: o for o in self.annotations_dict["images"]}
-
-        categories = self.annotations_dict["categories"]
-        id2class = {o["id"]: o["name"] for o in categories}
-        id2class[0] = BACKGROUND
-        # coco has non sequential ids, we fill the blanks with `None`, check #668 for more info
-        classes = [None for _ in range(max(id2class.keys()) + 1)]
-        for i, name in id2class.items():
-            classes[i] = name
-        self.class_map = ClassMap(classes)
+        self.img_size_resolver = img_size_resolver or ImgSizeResolver()
+        self.stream = stream
+        self._record_id2size = None
+
+        if stream:
+            # filled while iterating over the annotations file
+            self.annotations_dict = None
+            self._record_id2info = {}
+            self.class_map = None
+            self._num_annotations = None
+            self._unlabelled_records = []
+        else:
+            self.annotations_dict = json.loads(self.annotations_filepath.read_bytes())
+            self._record_id2info = {o["id"]: o for o in self.annotations_dict["images"]}
+            self.class_map = _class_map(self.annotations_dict["categories"])
 
         super().__init__(template_record=self.template_record(), idmap=idmap)
 
     def __iter__(self):
-        yield from self.annotations_dict["annotations"]
+        if self.stream:
+            yield from self._iter_stream()
+        else:
+            yield from self.annotations_dict["annotations"]
+
+    def _iter_stream(self):
+        section, images_done, categories, pending = None, False, [], []
+        num_annotations = 0
+        for key, item in iter_json_items(self.annotations_filepath):
+            if key != section and section == "images":
+                images_done = True
+                self._resolve_img_sizes()
+            if key != section and section == "categories" and self.class_map is None:
+                self.class_map = _class_map(categories)
+            section = key
+
+            if key == "images":
+                self._record_id2info[item["id"]] = item
+            elif key == "categories":
+                categories.append(item)
+            elif key == "annotations":
+                num_annotations += 1
+                if images_done:
+                    yield item
+                else:
+                    # needs the images info, only kept for files with images last
+                    pending.append(item)
+
+        if section == "images":
+            self._resolve_img_sizes()
+        if self.class_map is None:
+            self.class_map = _class_map(categories)
+        yield from pending
+
+        # categories were after the annotations, label names are set now
+        for record in self._unlabelled_records:
+            record.detection.set_class_map(self.class_map)
+            record.detection.set_labels_by_id(record.detection.label_ids)
+        self._unlabelled_records = []
+        self._num_annotations = num_annotations
+
+    def source_files(self) -> List[Path]:
+        return [self.annotations_filepath]
 
     def __len__(self):
-        return len(self.annotations_dict["annotations"])
+        if not self.stream:
+            return len(self.annotations_dict["annotations"])
+        if self._num_annotations is None:
+            raise TypeError("The number of annotations is only known after parsing")
+        return self._num_annotations
+
+    def parse_dicted(
+        self, show_pbar: bool = True, num_workers: int = 0
+    ) -> Dict[int, RecordType]:
+        # all sizes are resolved at once, before sharding
+        if not self.stream:
+            self._resolve_img_sizes(show_pbar=show_pbar)
+        return super().parse_dicted(show_pbar=show_pbar, num_workers=num_workers)
+
+    def _resolve_img_sizes(self, show_pbar: bool = True) -> Dict[int, ImgSize]:
+        if self._record_id2size is None:
+            infos = list(self._record_id2info.values())
+            if not self.stream:
+                # images without annotations are never parsed
+                record_ids = {o["image_id"] for o in self}
+                infos = [o for o in infos if o["id"] in record_ids]
+            img_sizes = self.img_size_resolver(
+                [self.img_dir / o["file_name"] for o in infos],
+                [_metadata_img_size(o) for o in infos],
+                show_pbar=show_pbar,
+            )
+            self._record_id2size = {o["id"]: s for o, s in zip(infos, img_sizes)}
+        return self._record_id2size
 
     def template_record(self) -> BaseRecord:
         return BaseRecord(
@@ -74,11 +162,15 @@ class COCOBaseParser(Parser):
     def record_id(self, o) -> int:
         return o["image_id"]
 
+    def sample_fingerprint(self, o) -> str:
+        # the image info is shared by all annotations of the record
+        return super().sample_fingerprint((o, self._info))
+
     def filepath(self, o) -> Path:
         return self.img_dir / self._info["file_name"]
 
     def img_size(self, o) -> ImgSize:
-        return get_img_size(self.filepath(o))
+        return self._resolve_img_sizes()[o["image_id"]]
 
     def labels_ids(self, o) -> List[Hashable]:
         return [o["category_id"]]
@@ -93,6 +185,8 @@ class COCOBaseParser(Parser):
         if is_new:
             record.set_filepath(self.filepath(o))
             record.set_img_size(self.img_size(o))
+            if self.class_map is None:
+                self._unlabelled_records.append(record)
 
         # TODO: is class_map still a issue here?
         record.detection.set_class_map(self.class_map)
@@ -101,6 +195,23 @@ class COCOBaseParser(Parser):
         record.detection.add_iscrowds(self.iscrowds(o))
 
 
+def _class_map(categories: List[dict]) -> ClassMap:
+    id2class = {o["id"]: o["name"] for o in categories}
+    id2class[0] = BACKGROUND
+    # coco has non sequential ids, we fill the blanks with `None`, check #668 for more info
+    classes = [None for _ in range(max(id2class.keys()) + 1)]
+    for i, name in id2class.items():
+        classes[i] = name
+    return ClassMap(classes)
+
+
+def _metadata_img_size(info: dict) -> Optional[ImgSize]:
+    width, height = info.get("width"), info.get("height")
+    if not width or not height:
+        return None
+    return ImgSize(width=width, height=height)
+
+
 class COCOBBoxParser(COCOBaseParser):
     def bboxes(self, o) -> List[BBox]:
         return [BBox.from_xywh(*o["bbox"])]
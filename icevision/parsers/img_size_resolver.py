@@ -0,0 +1,98 @@
+__all__ = ["ImgSizeResolver"]
+
+from icevision.imports import *
+from icevision.utils import *
+
+
+class ImgSizeResolver:
+    """Strategy used by parsers to get the size of the images.
+
+    Sizes from the annotation metadata (e.g. `width` and `height` in COCO `images`)
+    are trusted by default, so no image needs to be opened. Images without
+    metadata have their headers read by a pool of threads (see `get_img_sizes`).
+
+    Note that sizes read from the images take the EXIF orientation into account,
+    metadata sizes are expected to do the same.
+
+    # Arguments
+        trust_metadata: If False, the metadata is ignored and all images are read.
+        verify_samples: Number of random images (with metadata) to read and compare
+            with the metadata. A warning is logged for any mismatch, and the
+            size read from the image is used for those.
+        num_workers: Number of threads used to read the images.
+        cache_filepath: If specified, sizes read from the images are saved to this
+            file and reused while the images are not modified (see `ImgSizeCache`).
+        seed: Seed used to choose the images to verify.
+    """
+
+    def __init__(
+        self,
+        trust_metadata: bool = True,
+        verify_samples: int = 0,
+        num_workers: int = 16,
+        cache_filepath: Optional[Union[str, Path]] = None,
+        seed: int = 42,
+    ):
+        self.trust_metadata = trust_metadata
+        self.verify_samples = verify_samples
+        self.num_workers = num_workers
+        self.cache_filepath = cache_filepath
+        self.seed = seed
+
+    def __call__(
+        self,
+        filepaths: Sequence[Path],
+        metadata_img_sizes: Optional[Sequence[Optional[ImgSize]]] = None,
+        show_pbar: bool = True,
+    ) -> List[ImgSize]:
+        """Returns the size of each image.
+
+        # Arguments
+            filepaths: Images to get the size of.
+            metadata_img_sizes: Size of each image as found in the annotations,
+                `None` for images without this information.
+        """
+        if metadata_img_sizes is None or not self.trust_metadata:
+            metadata_img_sizes = [None] * len(filepaths)
+        img_sizes = list(metadata_img_sizes)
+
+        missing = [i for i, img_size in enumerate(img_sizes) if img_size is None]
+        with_metadata = [i for i, img_size in enumerate(img_sizes) if img_size]
+        num_verify = min(self.verify_samples, len(with_metadata))
+        verify = []
+        if num_verify > 0:
+            rng = np.random.RandomState(self.seed)
+            verify = rng.choice(with_metadata, num_verify, replace=False)
+            verify = sorted(verify.tolist())
+
+        read_idxs = missing + verify
+        if len(read_idxs) == 0:
+            return img_sizes
+
+        if len(missing) > 0:
+            logger.info("Reading the size of {} images", len(missing))
+        cache = ImgSizeCache(self.cache_filepath) if self.cache_filepath else None
+        read_img_sizes = get_img_sizes(
+            [filepaths[i] for i in read_idxs],
+            num_workers=self.num_workers,
+            cache=cache,
+            show_pbar=show_pbar,
+        )
+
+        mismatches = []
+        for i, img_size in zip(read_idxs, read_img_sizes):
+            if img_sizes[i] is not None and img_sizes[i] != img_size:
+                mismatches.append(filepaths[i])
+            img_sizes[i] = img_size
+
+        if mismatches:
+            logger.warning(
+                "The size of {} out of {} verified images does not match the "
+                "annotations metadata (e.g. {}), consider using "
+                "`ImgSizeResolver(trust_metadata=False)`",
+                len(mismatches),
+                num_verify,
+                mismatches[0],
+            )
+
+        return img_sizes
@@ -1,5 +1,6 @@
 __all__ = ["ParserInterface", "Parser"]
 
+import hashlib, time
 from icevision.imports import *
 from icevision.utils import *
 from icevision.utils.code_template import *
@@ -66,15 +67,30 @@ class Parser(ParserInterface, ABC):
     def prepare(self, o):
         pass
 
-    def parse_dicted(self, show_pbar: bool = True) -> Dict[int, RecordType]:
+    def parse_dicted(
+        self, show_pbar: bool = True, num_workers: int = 0
+    ) -> Dict[int, RecordType]:
+        if num_workers > 0:
+            return self._parse_dicted_parallel(
+                num_workers=num_workers, show_pbar=show_pbar
+            )
+        return self._parse_samples(self, show_pbar=show_pbar)
+
+    def _parse_samples(
+        self, samples: Sequence[Any], show_pbar: bool = True
+    ) -> Dict[int, RecordType]:
         records = {}
 
-        for sample in pbar(self, show_pbar):
+        for sample in pbar(samples, show_pbar):
             try:
                 self.prepare(sample)
                 # TODO: Do we still need idmap?
                 true_record_id = self.record_id(sample)
                 record_id = self.idmap[true_record_id]
+                # only tracked when creating a cache for incremental parsing
+                fingerprints = getattr(self, "_fingerprints", None)
+                if fingerprints is not None:
+                    fingerprints[true_record_id].append(self.sample_fingerprint(sample))
 
                 try:
                     record = records[record_id]
@@ -97,56 +113,332 @@ class Parser(ParserInterface, ABC):
 
         return dict(records)
 
+    def _parse_dicted_parallel(
+        self, num_workers: int, show_pbar: bool = True
+    ) -> Dict[int, RecordType]:
+        """Parses contiguous shards of samples in separate processes.
+
+        Shards are merged in order, so ids (from `idmap`) and labels (from an
+        unlocked `class_map`) are assigned in the same order as when parsing
+        serially. Records with samples in multiple shards are merged.
+        """
+        shards = chunks(list(self), num_workers)
+        results = parallel_map(
+            functools.partial(_parse_shard, self),
+            shards,
+            num_workers=num_workers,
+            show_pbar=show_pbar,
+        )
+
+        class_map = getattr(self, "class_map", None)
+        fingerprints = getattr(self, "_fingerprints", None)
+        records = {}
+        for shard_records, shard_idmap, shard_class_map, shard_fingerprints in results:
+            if class_map is not None and shard_class_map is not None:
+                class_map.update(shard_class_map)
+            if fingerprints is not None:
+                for true_record_id, values in shard_fingerprints.items():
+                    fingerprints[true_record_id].extend(values)
+
+            for shard_record_id, true_record_id in shard_idmap.id2name.items():
+                record_id = self.idmap[true_record_id]
+                shard_record = shard_records.get(shard_record_id)
+                if shard_record is None:
+                    continue
+
+                shard_record.set_record_id(record_id)
+                if class_map is not None:
+                    _set_class_map(shard_record, shard_class_map, class_map)
+
+                if record_id in records:
+                    _merge_records(records[record_id], shard_record)
+                else:
+                    records[record_id] = shard_record
+
+        return records
+
     def _check_path(self, path: Union[str, Path] = None):
         if path is None:
             return False
         if path is not None:
             return Path(path).exists()
 
+    def source_files(self) -> List[Path]:
+        """Annotation files the records are parsed from.
+
+        Used to validate the records cache, override it in parsers that read from
+        files so the cache is invalidated when any of them changes.
+        """
+        return []
+
+    def prepare_fingerprint(self, o):
+        """Called instead of `prepare` when incremental parsing checks which records
+        changed, before `record_id` and `sample_fingerprint`.
+
+        Defaults to `prepare`, override it if they can be computed without fully
+        preparing the data point (e.g. without parsing the file it's read from).
+        """
+        self.prepare(o)
+
+    def sample_fingerprint(self, o) -> str:
+        """Hash of the content of a data point, called after `prepare` (or
+        `prepare_fingerprint`).
+
+        Used by incremental parsing to find which records changed. Override it if
+        the data point does not contain all the information used when parsing it
+        (e.g. it's a path to a file).
+        """
+        return hashlib.blake2b(pickle.dumps(o), digest_size=16).hexdigest()
+
+    def _cache_source(self) -> dict:
+        return {"parser": f"{type(self).__module__}.{type(self).__qualname__}"}
+
+    def _restore_idmap(self, idmap: IDMap) -> None:
+        # updated in place, the idmap can be shared with the caller
+        self.idmap.id2name, self.idmap.name2id = idmap.id2name, idmap.name2id
+
+    def _restore_class_map(
+        self, cached_class_map: Optional[ClassMap], cached_splits: List[CachedRecords]
+    ) -> bool:
+        """Merges the class map of the cache into `self.class_map`, which is then
+        used by the cached records. Returns False if the ids of the classes differ.
+        """
+        class_map = getattr(self, "class_map", None)
+        if class_map is None or cached_class_map is None:
+            return True
+        # the ids of the cached labels are kept, unlocked class maps grow from them
+        n = min(len(class_map), len(cached_class_map))
+        if class_map._id2class[:n] != cached_class_map._id2class[:n]:
+            return False
+        if len(cached_class_map) > n:
+            if class_map._lock:
+                return False
+            class_map.update(cached_class_map)
+
+        for records_file in {o.records_file for o in cached_splits}:
+            records_file.shared = [
+                class_map if o is cached_class_map else o for o in records_file.shared
+            ]
+        return True
+
+    def _cache_state(
+        self,
+        splits: List[List[int]],
+        digests: Dict[Hashable, str],
+        record_ids: List[List[int]],
+    ) -> dict:
+        """Information needed to incrementally update the cache.
+
+        `splits` are the record ids assigned to each split, including records that
+        were skipped, and `record_ids` the ids of the records saved for each split.
+        """
+        return {
+            "idmap": self.idmap,
+            "class_map": getattr(self, "class_map", None),
+            "digests": digests,
+            "splits": [[int(i) for i in ids] for ids in splits],
+            "record_ids": record_ids,
+        }
+
     def parse(
         self,
         data_splitter: DataSplitter = None,
         autofix: bool = True,
         show_pbar: bool = True,
         cache_filepath: Union[str, Path] = None,
-    ) -> List[List[BaseRecord]]:
+        num_workers: int = 0,
+        incremental: bool = False,
+        lazy: bool = False,
+    ) -> Union[List[List[BaseRecord]], List[CachedRecords]]:
         """Loops through all data points parsing the required fields.
 
         # Arguments
             data_splitter: How to split the parsed data, defaults to a [0.8, 0.2] random split.
             show_pbar: Whether or not to show a progress bar while parsing the data.
-            cache_filepath: Path to save records in pickle format. Defaults to None, e.g.
-                            if the user does not specify a path, no saving nor loading happens.
+            cache_filepath: Path to save the parsed records (see `save_records_cache`).
+                Defaults to None, e.g. if the user does not specify a path, no saving nor
+                loading happens. The cache is only loaded if it was created by the same
+                parser class and none of the `source_files` changed since then.
+            num_workers: If greater than zero, the data points are split in shards that
+                are parsed by a pool of processes. The parser needs to be picklable.
+                The records and splits are the same as when parsing serially.
+            incremental: If True, and `cache_filepath` is outdated, only the records that
+                were added or changed since the cache was created are parsed (and
+                autofixed), records that no longer exist are removed. The record ids
+                and the split of the previous records are kept, new records are split
+                with `data_splitter`. The cache needs to be created with
+                `incremental=True` as well.
+            lazy: If True, the records are returned as `CachedRecords` read lazily from
+                `cache_filepath` (which is then required), whether the cache was loaded
+                or created. Otherwise lists of records are returned in both cases.
 
         # Returns
             A list of records for each split defined by `data_splitter`.
         """
+        if lazy and cache_filepath is None:
+            raise ValueError("lazy=True requires a cache_filepath")
+
         if self._check_path(cache_filepath):
-            logger.info(
-                f"Loading cached records from {cache_filepath}",
+            all_splits_records = load_records_cache(
+                cache_filepath,
+                source=self._cache_source(),
+                source_files=self.source_files(),
             )
-            return pickle.load(open(Path(cache_filepath), "rb"))
-        else:
-            data_splitter = data_splitter or RandomSplitter([0.8, 0.2])
-            records = self.parse_dicted(show_pbar=show_pbar)
+            if all_splits_records is not None:
+                logger.info(
+                    f"Loading cached records from {cache_filepath}",
+                )
+                # caches created with `incremental=True` know the record ids
+                state = all_splits_records[0].records_file.state
+                if "idmap" in state:
+                    self._restore_idmap(state["idmap"])
+                    self._restore_class_map(state["class_map"], all_splits_records)
+                return _maybe_materialize(all_splits_records, lazy)
+
+        if cache_filepath is not None:
+            # before parsing, changes done meanwhile will invalidate the cache
+            source = self._cache_source()
+            source["files"] = files_fingerprint(self.source_files())
+
+        data_splitter = data_splitter or RandomSplitter([0.8, 0.2])
+        if incremental and self._check_path(cache_filepath):
+            all_splits_records = self._parse_incremental(
+                cache_filepath,
+                source=source,
+                data_splitter=data_splitter,
+                autofix=autofix,
+                show_pbar=show_pbar,
+            )
+            if all_splits_records is not None:
+                return _maybe_materialize(all_splits_records, lazy)
+
+        self._fingerprints = defaultdict(list) if incremental else None
+        start = time.perf_counter()
+        records = self.parse_dicted(show_pbar=show_pbar, num_workers=num_workers)
+        logger.info(
+            "Parsed {} records in {:.2f} seconds",
+            len(records),
+            time.perf_counter() - start,
+        )
 
-            splits = data_splitter(idmap=self.idmap)
-            all_splits_records = []
-            if autofix:
-                logger.opt(colors=True).info("<blue><bold>Autofixing records</></>")
-            for ids in splits:
-                split_records = [records[i] for i in ids if i in records]
+        splits = data_splitter(idmap=self.idmap)
+        all_splits_records = []
+        if autofix:
+            logger.opt(colors=True).info("<blue><bold>Autofixing records</></>")
+        for ids in splits:
+            split_records = [records[i] for i in ids if i in records]
 
-                if autofix:
-                    split_records = autofix_records(split_records, show_pbar=show_pbar)
+            if autofix:
+                split_records = autofix_records(split_records, show_pbar=show_pbar)
+
+            all_splits_records.append(split_records)
+
+        # self.class_map.lock()
+        if cache_filepath is not None:
+            state = None
+            if incremental:
+                state = self._cache_state(
+                    splits,
+                    digests=_records_digests(self._fingerprints),
+                    record_ids=[
+                        [int(o.record_id) for o in records]
+                        for records in all_splits_records
+                    ],
+                )
+            save_records_cache(
+                cache_filepath, all_splits_records, source=source, state=state
+            )
+        self._fingerprints = None
 
-                all_splits_records.append(split_records)
+        if lazy:
+            return read_records_cache(cache_filepath)[0]
+        return all_splits_records
 
-            # self.class_map.lock()
-            if cache_filepath is not None:
-                pickle.dump(all_splits_records, open(Path(cache_filepath), "wb"))
+    def _parse_incremental(
+        self,
+        cache_filepath: Union[str, Path],
+        source: dict,
+        data_splitter: DataSplitter,
+        autofix: bool,
+        show_pbar: bool,
+    ) -> Optional[List[CachedRecords]]:
+        """Updates an outdated cache, returns `None` if a full parse is needed."""
+        try:
+            cached_splits, metadata = read_records_cache(cache_filepath)
+        except (ValueError, OSError, pickle.UnpicklingError, EOFError):
+            return None
+        state = metadata["state"]
+        cached_source = {k: v for k, v in metadata["source"].items() if k != "files"}
+        if not state or cached_source != self._cache_source():
+            return None
+
+        logger.info("Updating cached records from {}", cache_filepath)
+        # group data points by record, only keeping their position
+        self._fingerprints, record_samples = defaultdict(list), defaultdict(list)
+        for i, sample in enumerate(pbar(self, show_pbar)):
+            try:
+                self.prepare_fingerprint(sample)
+                true_record_id = self.record_id(sample)
+            except AbortParseRecord:
+                continue
+            record_samples[true_record_id].append(i)
+            self._fingerprints[true_record_id].append(self.sample_fingerprint(sample))
+        digests = _records_digests(self._fingerprints)
+        self._fingerprints = None
+
+        cached_digests = state["digests"]
+        touched = {k for k, v in digests.items() if cached_digests.get(k) != v}
+        removed = cached_digests.keys() - digests.keys()
+
+        if not self._restore_class_map(state["class_map"], cached_splits):
+            logger.info("Class map changed, parsing all records")
+            return None
+
+        # ids of previous records are kept, new records get new ids
+        self._restore_idmap(state["idmap"])
+
+        samples_idxs = {i for k in touched for i in record_samples[k]}
+        samples = [o for i, o in enumerate(self) if i in samples_idxs]
+        records = self._parse_samples(samples, show_pbar=show_pbar)
+
+        splits = state["splits"]
+        split_ids = {i for ids in splits for i in ids}
+        new_ids = [i for i in self.idmap.get_ids() if i not in split_ids]
+        if new_ids:
+            new_splits = data_splitter(idmap=self.idmap.filter_ids(new_ids))
+            if len(new_splits) != len(splits):
+                logger.info("Number of splits changed, parsing all records")
+                return None
+            splits = [ids + [int(i) for i in o] for ids, o in zip(splits, new_splits)]
+
+        # cached records are copied as they are, only the touched ones are parsed
+        changed_ids = {self.idmap[k] for k in touched | removed}
+        all_splits_records, all_record_ids = [], []
+        for ids, cached_records, cached_record_ids in zip(
+            splits, cached_splits, state["record_ids"]
+        ):
+            keep = [i for i, o in enumerate(cached_record_ids) if o not in changed_ids]
+            split_records = [records[i] for i in ids if i in records]
+            if autofix:
+                split_records = autofix_records(split_records, show_pbar=show_pbar)
+            all_splits_records.append([cached_records[keep], *split_records])
+            all_record_ids.append(
+                [cached_record_ids[i] for i in keep]
+                + [int(o.record_id) for o in split_records]
+            )
 
-            return all_splits_records
+        logger.info(
+            "Parsed {} added or changed records, removed {} records",
+            len(records),
+            len(removed),
+        )
+        state = self._cache_state(splits, digests=digests, record_ids=all_record_ids)
+        save_records_cache(
+            cache_filepath, all_splits_records, source=source, state=state
+        )
+        all_splits_records, metadata = read_records_cache(cache_filepath)
+        self._restore_class_map(metadata["state"]["class_map"], all_splits_records)
+        return all_splits_records
 
     @classmethod
     def _templates(cls) -> List[str]:
@@ -172,3 +464,48 @@ class Parser(ParserInterface, ABC):
         template.add_lines(record_builder_template, 2)
 
         template.display()
+
+
+def _maybe_materialize(
+    splits: List[CachedRecords], lazy: bool
+) -> Union[List[List[BaseRecord]], List[CachedRecords]]:
+    return splits if lazy else [records.to_records() for records in splits]
+
+
+def _records_digests(fingerprints: Dict[Hashable, List[str]]) -> Dict[Hashable, str]:
+    # a record can be built from many data points (e.g. one per annotation)
+    return {
+        k: hashlib.blake2b("".join(v).encode(), digest_size=16).hexdigest()
+        for k, v in fingerprints.items()
+    }
+
+
+def _parse_shard(
+    parser: Parser, samples: Sequence[Any]
+) -> Tuple[Dict[int, BaseRecord], IDMap, Optional[ClassMap], Optional[dict]]:
+    # record ids are local to the shard, they're remapped when merging
+    parser.idmap = IDMap()
+    records = parser._parse_samples(samples, show_pbar=False)
+    return (
+        records,
+        parser.idmap,
+        getattr(parser, "class_map", None),
+        getattr(parser, "_fingerprints", None),
+    )
+
+
+def _set_class_map(record: BaseRecord, old_class_map: ClassMap, class_map: ClassMap):
+    for component in record.components:
+        if (
+            isinstance(component, BaseLabelsRecordComponent)
+            and component.class_map is old_class_map
+        ):
+            component.set_class_map(class_map)
+            # label ids can be different if the class map was unlocked
+            component.set_labels(component.labels)
+
+
+def _merge_records(record: BaseRecord, other: BaseRecord):
+    other_components = {(type(o), o.task.name): o for o in other.components}
+    for component in record.components:
+        component._merge(other_components[(type(component), component.task.name)])
@@ -4,6 +4,7 @@ from icevision.imports import *
 from icevision.core import *
 from icevision.utils import *
 from icevision.parsers.parser import *
+from icevision.parsers.img_size_resolver import *
 
 
 def via(
@@ -41,12 +42,16 @@ class VIABaseParser(Parser):
         img_dir: Union[str, Path],
         class_map: ClassMap,
         label_field: str = "label",
+        img_size_resolver: Optional[ImgSizeResolver] = None,
     ):
         super().__init__(template_record=self.template_record())
-        self.annotations_dict = json.loads(Path(annotations_filepath).read_bytes())
+        self.annotations_filepath = Path(annotations_filepath)
+        self.annotations_dict = json.loads(self.annotations_filepath.read_bytes())
         self.img_dir = Path(img_dir)
         self.label_field = label_field
         self.class_map = class_map
+        self.img_size_resolver = img_size_resolver or ImgSizeResolver()
+        self._filepath2size = None
 
     def template_record(self) -> BaseRecord:
         return BaseRecord(
@@ -60,6 +65,9 @@ class VIABaseParser(Parser):
     def __iter__(self):
         yield from self.annotations_dict.values()
 
+    def source_files(self) -> List[Path]:
+        return [self.annotations_filepath]
+
     def __len__(self):
         return len(self.annotations_dict.values())
 
@@ -77,8 +85,23 @@ class VIABaseParser(Parser):
     def filepath(self, o) -> Path:
         return self.img_dir / f"{o['filename']}"
 
+    def parse_dicted(
+        self, show_pbar: bool = True, num_workers: int = 0
+    ) -> Dict[int, RecordType]:
+        # all sizes are resolved at once, before sharding
+        self._resolve_img_sizes(show_pbar=show_pbar)
+        return super().parse_dicted(show_pbar=show_pbar, num_workers=num_workers)
+
+    def _resolve_img_sizes(self, show_pbar: bool = True) -> Dict[Path, ImgSize]:
+        if self._filepath2size is None:
+            # via annotations don't store the image size
+            filepaths = sorted({self.filepath(o) for o in self})
+            img_sizes = self.img_size_resolver(filepaths, show_pbar=show_pbar)
+            self._filepath2size = dict(zip(filepaths, img_sizes))
+        return self._filepath2size
+
     def image_width_height(self, o) -> Tuple[int, int]:
-        return get_img_size(self.filepath(o))
+        return self._resolve_img_sizes()[self.filepath(o)]
 
     def _get_label(self, o, region_attributes: dict) -> str:
         label = region_attributes.get(self.label_field)
@@ -1,4 +1,10 @@
-__all__ = ["voc", "VOCBBoxParser", "VOCMaskParser"]
+__all__ = [
+    "voc",
+    "VOCBBoxParser",
+    "VOCMaskParser",
+    "parse_voc_xml",
+    "read_voc_filename",
+]
 
 import xml.etree.ElementTree as ET
 from icevision.imports import *
@@ -57,6 +63,9 @@ class VOCBBoxParser(Parser):
     def __iter__(self):
         yield from self.annotation_files
 
+    def source_files(self) -> List[Path]:
+        return list(self.annotation_files)
+
     def template_record(self) -> BaseRecord:
         return BaseRecord(
             (
@@ -70,10 +79,20 @@ class VOCBBoxParser(Parser):
         return str(Path(self._filename).stem)
 
     def prepare(self, o):
-        tree = ET.parse(str(o))
-        self._root = tree.getroot()
-        self._filename = self._root.find("filename").text
-        self._size = self._root.find("size")
+        self._annotation = parse_voc_xml(o)
+        self._filename = self._annotation["filename"]
+
+    def prepare_fingerprint(self, o):
+        # only the image filename is needed for the record id
+        self._annotation = None
+        self._filename = read_voc_filename(o)
+
+    def sample_fingerprint(self, o) -> str:
+        # the xml is not parsed to check if it changed
+        return super().sample_fingerprint(self._files_fingerprint(o))
+
+    def _files_fingerprint(self, o) -> list:
+        return files_fingerprint([o])
 
     def parse_fields(self, o, record, is_new):
         if is_new:
@@ -88,34 +107,15 @@ class VOCBBoxParser(Parser):
         return self.images_dir / self._filename
 
     def img_size(self, o) -> ImgSize:
-        width = int(self._size.find("width").text)
-        height = int(self._size.find("height").text)
-        return ImgSize(width=width, height=height)
+        return self._annotation["size"]
 
     def labels(self, o) -> List[Hashable]:
-        labels = []
-        for object in self._root.iter("object"):
-            label = object.find("name").text
-            labels.append(label)
-
-        return labels
+        return [object["name"] for object in self._annotation["objects"]]
 
     def bboxes(self, o) -> List[BBox]:
-        def to_int(x):
-            return int(float(x))
-
-        bboxes = []
-        for object in self._root.iter("object"):
-            xml_bbox = object.find("bndbox")
-            xmin = to_int(xml_bbox.find("xmin").text)
-            ymin = to_int(xml_bbox.find("ymin").text)
-            xmax = to_int(xml_bbox.find("xmax").text)
-            ymax = to_int(xml_bbox.find("ymax").text)
-
-            bbox = BBox.from_xyxy(xmin, ymin, xmax, ymax)
-            bboxes.append(bbox)
-
-        return bboxes
+        return [
+            BBox.from_xyxy(*object["bndbox"]) for object in self._annotation["objects"]
+        ]
 
 
 class VOCMaskParser(VOCBBoxParser):
@@ -138,13 +138,12 @@ class VOCMaskParser(VOCBBoxParser):
 
         self._record_id2maskfile = {self.record_id_mask(o): o for o in self.mask_files}
 
-        # filter annotations
-        masks_ids = frozenset(self._record_id2maskfile.keys())
-        self._intersection = []
-        for item in super().__iter__():
-            super().prepare(item)
-            if super().record_id(item) in masks_ids:
-                self._intersection.append(item)
+        # filter annotations by the image filename, only reading the start of each xml
+        self._intersection = [
+            o
+            for o in super().__iter__()
+            if self.record_id_annotation(o) in self._record_id2maskfile
+        ]
 
     def __len__(self):
         return len(self._intersection)
@@ -152,19 +151,83 @@ class VOCMaskParser(VOCBBoxParser):
     def __iter__(self):
         yield from self._intersection
 
+    def source_files(self) -> List[Path]:
+        # masks are only opened when loading, but they decide which records exist
+        return super().source_files() + list(self.mask_files)
+
     def template_record(self) -> BaseRecord:
         record = super().template_record()
         record.add_component(MasksRecordComponent())
         return record
 
     def record_id_mask(self, o) -> Hashable:
-        """Should return the same as `record_id` from parent parser."""
+        """Should return the same as `record_id_annotation`."""
         return str(Path(o).stem)
 
+    def record_id_annotation(self, o) -> Hashable:
+        """Id of an annotation file, used to find its mask file. Same as `record_id`
+        (the stem of the image `<filename>`), but only reads the start of the xml.
+        """
+        return str(Path(read_voc_filename(o)).stem)
+
+    def _files_fingerprint(self, o) -> list:
+        # the mask content is only read when parsing, its stat is enough to detect
+        # changes
+        mask_file = self._record_id2maskfile[self.record_id(o)]
+        stat = Path(mask_file).stat()
+        mask_fingerprint = (str(mask_file), stat.st_size, stat.st_mtime_ns)
+        return super()._files_fingerprint(o) + [mask_fingerprint]
+
     def parse_fields(self, o, record, is_new):
         super().parse_fields(o, record, is_new=is_new)
         record.detection.add_masks(self.masks(o))
 
     def masks(self, o) -> List[Mask]:
+        # decoded and encoded as RLE when added to the record, the png is not
+        # opened again when loading the record
         mask_file = self._record_id2maskfile[self.record_id(o)]
         return [VocMaskFile(mask_file)]
+
+
+def read_voc_filename(filepath: Union[str, Path]) -> Optional[str]:
+    """Reads the image `filename` of a VOC xml annotation file, stopping as soon as
+    it's found (it's normally one of the first elements).
+    """
+    with open(filepath, "rb") as f:
+        for _, element in ET.iterparse(f):
+            if element.tag == "filename":
+                return element.text
+    return None
+
+
+def parse_voc_xml(filepath: Union[str, Path]) -> dict:
+    """Parses a VOC xml annotation file with `iterparse`, each object element is
+    discarded after being read.
+
+    # Returns
+        A dict with the image `filename`, `size` (`ImgSize`) and a list of `objects`,
+        each with a `name` and a `bndbox` (xmin, ymin, xmax, ymax).
+    """
+
+    def to_int(x):
+        return int(float(x))
+
+    annotation = {"filename": None, "size": None, "objects": []}
+    for _, element in ET.iterparse(str(filepath)):
+        if element.tag == "filename":
+            annotation["filename"] = element.text
+        elif element.tag == "size":
+            width = int(element.find("width").text)
+            height = int(element.find("height").text)
+            annotation["size"] = ImgSize(width=width, height=height)
+        elif element.tag == "object":
+            xml_bbox = element.find("bndbox")
+            bndbox = [
+                to_int(xml_bbox.find(k).text) for k in ("xmin", "ymin", "xmax", "ymax")
+            ]
+            annotation["objects"].append(
+                {"name": element.find("name").text, "bndbox": bndbox}
+            )
+            element.clear()
+
+    return annotation
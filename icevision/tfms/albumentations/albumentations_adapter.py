@@ -11,7 +11,6 @@ __all__ = [
 ]
 
 import albumentations as A
-from itertools import chain
 
 from icevision.imports import *
 from icevision.utils import *
@@ -93,15 +92,15 @@ class AlbumentationsBBoxesComponent(AlbumentationsAdapterComponent):
         # TODO: albumentations has a way of sending information that can be used for tasks
 
         # TODO HACK: Will not work for multitask, will fail silently
-        self.adapter._albu_in["bboxes"] = [o.xyxy for o in record_component.bboxes]
+        bboxes = BBoxArray.from_bboxes(record_component.bboxes)
+        self.adapter._albu_in["bboxes"] = bboxes.xyxy.tolist()
 
         self.adapter._collect_ops.append(CollectOp(self.collect))
 
-    def collect(self, record) -> List[BBox]:
+    def collect(self, record) -> BBoxArray:
         # TODO: quickfix from 576
         # bboxes_xyxy = [_clip_bboxes(xyxy, img_h, img_w) for xyxy in d["bboxes"]]
-        bboxes_xyxy = [xyxy for xyxy in self.adapter._albu_out["bboxes"]]
-        bboxes = [BBox.from_xyxy(*xyxy) for xyxy in bboxes_xyxy]
+        bboxes = BBoxArray.from_xyxy(self.adapter._albu_out["bboxes"])
         # TODO HACK: Will not work for multitask, will fail silently
         record.detection.set_bboxes(bboxes)
 
@@ -122,15 +121,28 @@ class AlbumentationsBBoxesComponent(AlbumentationsAdapterComponent):
 
 
 class AlbumentationsMasksComponent(AlbumentationsAdapterComponent):
-    def setup_masks(self, record):
-        self.adapter._albu_in["masks"] = list(record.masks.data)
+    def setup_masks(self, record_component):
+        self._masks = record_component.masks
+        # pixel level transforms don't change the masks, no need to decode them
+        if not self.adapter._image_only:
+            self.adapter._albu_in["masks"] = list(self._masks.data)
+
         self.adapter._collect_ops.append(CollectOp(self.collect))
 
     def collect(self, record):
-        masks = self.adapter._filter_attribute(self.adapter._albu_out["masks"])
-        masks = MaskArray(np.array(masks))
+        if self.adapter._image_only:
+            masks = self._masks
+            keep_mask = self.adapter._keep_mask
+            if keep_mask is not None and not keep_mask.all():
+                masks = masks[keep_mask]
+        else:
+            masks = self.adapter._filter_attribute(self.adapter._albu_out["masks"])
+            masks = MaskArray(np.array(masks))
         record.detection.set_masks(masks)
 
+        if self.adapter.compact_masks is not None:
+            record.detection.compact_masks(self.adapter.compact_masks)
+
 
 class AlbumentationsKeypointsComponent(AlbumentationsAdapterComponent):
     def setup_keypoints(self, record_component):
@@ -138,81 +150,57 @@ class AlbumentationsKeypointsComponent(AlbumentationsAdapterComponent):
             format="xy", remove_invisible=False, label_fields=["keypoints_labels"]
         )
 
-        # not compatible with some transforms
-        flat_tfms_list_ = _flatten_tfms(self.adapter.tfms_list)
-        if get_transform(flat_tfms_list_, "RandomSizedBBoxSafeCrop") is not None:
-            raise RuntimeError("RandomSizedBBoxSafeCrop is not supported for keypoints")
-
-        self._kpts = record_component.keypoints
-        self._kpts_xy = [xy for o in self._kpts for xy in o.xy]
-        self._kpts_labels = [label for o in self._kpts for label in o.metadata.labels]
-        self._kpts_visible = [visible for o in self._kpts for visible in o.visible]
-        assert len(self._kpts_xy) == len(self._kpts_labels) == len(self._kpts_visible)
+        self._kpts_metadata = [o.metadata for o in record_component.keypoints]
+        # (N, K, 3) array with the keypoints of all instances
+        self._kpts_data = record_component.keypoints_data
+        self._kpts_labels = [label for o in self._kpts_metadata for label in o.labels]
+        kpts_xyv = self._kpts_data.reshape(-1, 3)
+        assert len(kpts_xyv) == len(self._kpts_labels)
 
-        self.adapter._albu_in["keypoints"] = self._kpts_xy
+        self.adapter._albu_in["keypoints"] = kpts_xyv[:, :2].tolist()
         self.adapter._albu_in["keypoints_labels"] = self._kpts_labels
 
         self.adapter._collect_ops.append(CollectOp(self.collect))
 
     def collect(self, record):
+        kpts_xyv = self._kpts_data.reshape(-1, 3)
+        tfms_kpts = self.adapter._albu_out["keypoints"]
         # remove_invisible=False, therefore all points getting in are also getting out
-        assert len(self.adapter._albu_out["keypoints"]) == len(self._kpts_xy)
+        assert len(tfms_kpts) == len(kpts_xyv)
 
-        tfmed_kpts = self._remove_albu_outside_keypoints(
-            tfms_kpts=self.adapter._albu_out["keypoints"],
-            kpts_visible=self._kpts_visible,
+        tfms_xy = np.array([kpt[:2] for kpt in tfms_kpts], dtype=np.float64)
+        tfmed_xyv = self._remove_outside_keypoints(
+            tfms_xy=tfms_xy.reshape(-1, 2),
+            visible=kpts_xyv[:, 2],
             size_no_padding=self.adapter._size_no_padding,
         )
-        # flatten list of keypoints
-        flat_kpts = list(chain.from_iterable(tfmed_kpts))
-        # group keypoints from same instance
-        group_kpts = [
-            flat_kpts[i : i + len(flat_kpts) // len(self._kpts)]
-            for i in range(
-                0,
-                len(flat_kpts),
-                len(flat_kpts) // len(self._kpts),
-            )
-        ]
-        assert len(group_kpts) == len(self._kpts)
-
-        kpts = [
-            KeyPoints.from_xyv(group_kpt, original_kpt.metadata)
-            for group_kpt, original_kpt in zip(group_kpts, self._kpts)
-        ]
-        kpts = self.adapter._filter_attribute(kpts)
-        record.detection.set_keypoints(kpts)
 
-    @classmethod
-    def _remove_albu_outside_keypoints(cls, tfms_kpts, kpts_visible, size_no_padding):
-        """Remove keypoints that are outside image dimensions."""
-        v = kpts_visible
-        v_n = v.copy()
-        tra_n = tfms_kpts.copy()
-        for i in range(len(tfms_kpts)):
-            if v[i] > 0:
-                v_n[i] = cls._check_kps_coords(tfms_kpts[i], size_no_padding)
-                if v_n[i] == 1:
-                    v_n[i] = v[i]
-            if v_n[i] == 0:
-                tra_n[i] = (0, 0)
-            tra_n[i] = (tra_n[i][0], tra_n[i][1], v_n[i])
-        return tra_n
+        record.detection.set_keypoints_data(
+            tfmed_xyv.reshape(self._kpts_data.shape), self._kpts_metadata
+        )
+        kpts = self.adapter._filter_attribute(record.detection.keypoints)
+        record.detection.set_keypoints(kpts)
 
     @staticmethod
-    def _check_kps_coords(p, size_no_padding):
-        x, y = p
+    def _remove_outside_keypoints(
+        tfms_xy: np.ndarray, visible: np.ndarray, size_no_padding: ImgSize
+    ) -> np.ndarray:
+        """Marks the keypoints outside of the image (without padding) as not visible,
+        not visible keypoints are moved to (0, 0). Returns a (K, 3) array.
+        """
+        x, y = tfms_xy[:, 0], tfms_xy[:, 1]
         w, h = size_no_padding
         if w >= h:
             pad = (w - h) // 2
-            h1 = pad
-            h2 = w - pad
-            return int((x <= w) and (x >= 0) and (y >= h1) and (y <= h2))
+            inside = (x >= 0) & (x <= w) & (y >= pad) & (y <= w - pad)
         else:
             pad = (h - w) // 2
-            w1 = pad
-            w2 = h - pad
-            return int((x <= w2) and (x >= w1) and (y >= 0) and (y <= h))
+            inside = (x >= pad) & (x <= h - pad) & (y >= 0) & (y <= h)
+
+        visible = np.where(inside, visible, 0)
+        xyv = np.concatenate([tfms_xy, visible[:, None]], axis=1)
+        xyv[visible == 0, :2] = 0
+        return xyv
 
 
 class AlbumentationsIsCrowdsComponent(AlbumentationsAdapterComponent):
@@ -247,13 +235,47 @@ class Adapter(Transform, Composite):
         AlbumentationsKeypointsComponent,
     }
 
-    def __init__(self, tfms):
+    def __init__(self, tfms, compact_masks: Optional[str] = None):
         super().__init__()
         self.tfms_list = tfms
+        self.compact_masks = compact_masks
+        # everything that only depends on `tfms` is computed once
+        self._image_only = _is_image_only(tfms)
+        self._pad_tfm = get_transform(tfms, "Pad")
+        self._smallest_max_size_tfm = get_transform(tfms, "SmallestMaxSize")
+        self._longest_max_size_tfm = get_transform(tfms, "LongestMaxSize")
+        self._bbox_safe_crop = (
+            get_transform(_flatten_tfms(tfms), "RandomSizedBBoxSafeCrop") is not None
+        )
+        # compiled `A.Compose` and sorted collect ops, by the components of the record
+        self._plans = {}
+
+    def __getstate__(self):
+        # plans are compiled again in each process
+        state = super().__getstate__()
+        state["_plans"] = {}
+        return state
 
     def create_tfms(self):
         return A.Compose(self.tfms_list, **self._compose_kwargs)
 
+    def draft_size(self, img_size: ImgSize) -> Optional[ImgSize]:
+        # only the first transform is known to be applied to the full image
+        tfm = self.tfms_list[0] if len(self.tfms_list) > 0 else None
+        if tfm is None or tfm.p < 1:
+            return None
+
+        width, height = img_size
+        if isinstance(tfm, A.Resize):
+            return ImgSize(width=tfm.width, height=tfm.height)
+        if isinstance(tfm, (A.LongestMaxSize, A.SmallestMaxSize)):
+            fn = max if isinstance(tfm, A.LongestMaxSize) else min
+            scale = tfm.max_size / fn(width, height)
+            return ImgSize(
+                width=math.ceil(width * scale), height=math.ceil(height * scale)
+            )
+        return None
+
     def apply(self, record):
         # setup
         self._compose_kwargs = {}
@@ -262,8 +284,14 @@ class Adapter(Transform, Composite):
         self._collect_ops = []
         record.setup_transform(tfm=self)
 
-        # TODO: composing every time
-        tfms = self.create_tfms()
+        # records with the same components have the same inputs and collect ops,
+        # the pipeline is only composed for the first of them
+        signature = frozenset(collect_op.fn for collect_op in self._collect_ops)
+        plan = self._plans.get(signature)
+        if plan is None:
+            plan = self._plans[signature] = self._compile()
+        tfms, collect_ops = plan
+
         # apply transform
         self._albu_out = tfms(**self._albu_in)
 
@@ -271,11 +299,19 @@ class Adapter(Transform, Composite):
         self._size_no_padding = self._get_size_without_padding(record)
 
         # collect results
-        for collect_op in sorted(self._collect_ops, key=lambda x: x.order):
+        for collect_op in collect_ops:
             collect_op.fn(record)
 
         return record
 
+    def _compile(self) -> Tuple[A.Compose, List[CollectOp]]:
+        # not compatible with some transforms
+        if "keypoints" in self._albu_in and self._bbox_safe_crop:
+            raise RuntimeError("RandomSizedBBoxSafeCrop is not supported for keypoints")
+
+        collect_ops = sorted(self._collect_ops, key=lambda x: x.order)
+        return self.create_tfms(), collect_ops
+
     # def apply(self, record):
     #     self.prepare(record)
 
@@ -297,15 +333,15 @@ class Adapter(Transform, Composite):
     def _get_size_without_padding(self, record) -> ImgSize:
         height, width, _ = self._albu_out["image"].shape
 
-        if get_transform(self.tfms_list, "Pad") is not None:
+        if self._pad_tfm is not None:
             after_pad_h, after_pad_w, _ = record.img.shape
 
-            t = get_transform(self.tfms_list, "SmallestMaxSize")
+            t = self._smallest_max_size_tfm
             if t is not None:
                 presize = t.max_size
                 height, width = _func_max_size(after_pad_h, after_pad_w, presize, min)
 
-            t = get_transform(self.tfms_list, "LongestMaxSize")
+            t = self._longest_max_size_tfm
             if t is not None:
                 size = t.max_size
                 height, width = _func_max_size(after_pad_h, after_pad_w, size, max)
@@ -323,6 +359,18 @@ def _flatten_tfms(t):
     return flat
 
 
+def _is_image_only(tfms_list) -> bool:
+    """Checks if all transforms (including nested ones) only change the image pixels."""
+    for tfm in tfms_list:
+        nested_tfms = getattr(tfm, "transforms", None)
+        if nested_tfms is not None:
+            if not _is_image_only(nested_tfms):
+                return False
+        elif not isinstance(tfm, A.ImageOnlyTransform):
+            return False
+    return True
+
+
 def _is_iter(o):
     try:
         i = iter(o)
@@ -1,2 +1,4 @@
 from icevision.tfms.batch.batch_transform import *
 from icevision.tfms.batch.img_pad_stack import *
+from icevision.tfms.batch.tensor_tfms import *
+from icevision.tfms.batch.img_collate import *
@@ -0,0 +1,90 @@
+__all__ = ["ImgCollate"]
+
+from torch.utils.data import get_worker_info
+from icevision.imports import *
+from icevision.core import *
+
+
+class ImgCollate:
+    """Pads and stacks the images of the records in a single (N, C, H, W) tensor,
+    keeping their dtype (normally uint8).
+
+    Each image is written once, directly in its place in the batch, only the padding
+    around it (right and bottom, as `ImgPadStack`) is filled with `pad_value`. It
+    replaces `ImgPadStack` followed by `im2tensor` and `torch.stack`, which convert
+    every image to float32 (4 times the bytes) and copy it twice. Images are
+    converted to float on the device instead, with `normalize_imgs`. Used by the
+    model dataloaders created with `uint8_imgs=True`.
+
+    By default a new tensor is created for every batch. With `num_buffers`, batches
+    collated in the main process (`DataLoader` with `num_workers=0`) are written in
+    preallocated buffers that are reused, pinned if CUDA is available so they can be
+    copied to the GPU asynchronously. A batch is then overwritten after `num_buffers`
+    more batches are collated, so only use it when every batch is copied before
+    (e.g. moved to the GPU, `.to` does not copy on CPU). In `DataLoader` workers a
+    new tensor is always created, pinning is then done by the `DataLoader`
+    (`pin_memory=True`). The model dataloaders created with `uint8_imgs=True` don't
+    expose `num_buffers`, they always create a new tensor, use `ImgCollate` directly
+    in a custom `collate_fn` to reuse buffers.
+
+    # Arguments
+        pad_value: Value used for padding, a single value or one for each channel.
+        pin_memory: Whether or not to pin the reused buffers, defaults to True if
+            CUDA is available (checked when the first buffer is allocated).
+        num_buffers: Number of buffers reused in the main process, 0 to not reuse
+            them.
+    """
+
+    def __init__(
+        self,
+        pad_value: Union[int, Sequence[int]] = 0,
+        pin_memory: Optional[bool] = None,
+        num_buffers: int = 0,
+    ):
+        self.pad_value = torch.tensor(pad_value).reshape(-1, 1, 1)
+        self.pin_memory = pin_memory
+        self.num_buffers = num_buffers
+        self._buffers = [None] * num_buffers
+        self._next_buffer = 0
+
+    def __getstate__(self):
+        # buffers are not sent to the workers
+        state = self.__dict__.copy()
+        state["_buffers"] = [None] * self.num_buffers
+        return state
+
+    def __call__(self, records: Sequence[RecordType]) -> Tensor:
+        return self.collate([record.img for record in records])
+
+    def collate(self, imgs: Sequence[np.ndarray]) -> Tensor:
+        height = max(img.shape[0] for img in imgs)
+        width = max(img.shape[1] for img in imgs)
+        channels = imgs[0].shape[2]
+        dtype = torch.from_numpy(imgs[0][:0]).dtype
+
+        batch = self._empty((len(imgs), channels, height, width), dtype=dtype)
+        pad_value = self.pad_value.to(dtype)
+        for out, img in zip(batch, imgs):
+            h, w = img.shape[:2]
+            out[:, :h, :w].copy_(torch.from_numpy(img).permute(2, 0, 1))
+            if h < height:
+                out[:, h:].copy_(pad_value.expand_as(out[:, h:]))
+            if w < width:
+                out[:, :h, w:].copy_(pad_value.expand_as(out[:, :h, w:]))
+        return batch
+
+    def _empty(self, shape: Tuple[int, ...], dtype: torch.dtype) -> Tensor:
+        if not self.num_buffers or get_worker_info() is not None:
+            # in workers the batch is sent to the main process, it can't be reused
+            return torch.empty(shape, dtype=dtype)
+
+        numel = int(np.prod(shape))
+        i = self._next_buffer
+        self._next_buffer = (i + 1) % self.num_buffers
+        buffer = self._buffers[i]
+        if buffer is None or buffer.dtype != dtype or buffer.numel() < numel:
+            if self.pin_memory is None:
+                self.pin_memory = torch.cuda.is_available()
+            buffer = torch.empty(numel, dtype=dtype, pin_memory=self.pin_memory)
+            self._buffers[i] = buffer
+        return buffer[:numel].view(shape)
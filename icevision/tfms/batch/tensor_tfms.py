@@ -0,0 +1,308 @@
+__all__ = [
+    "TensorBatchTransform",
+    "TensorCompose",
+    "BatchHorizontalFlip",
+    "BatchVerticalFlip",
+    "BatchResize",
+    "BatchRandomResizedCrop",
+    "BatchBrightnessContrast",
+    "BatchNormalize",
+]
+
+import torch.nn.functional as F
+from torchvision.ops import roi_align
+from icevision.imports import *
+from icevision.utils import *
+from icevision.core import *
+from icevision.tfms.batch.batch_transform import BatchTransform
+
+
+class TensorBatchTransform(BatchTransform):
+    """Base class for batch transforms that run on the whole batch at once.
+
+    The images of the batch are stacked in a single (N, C, H, W) tensor (keeping
+    their dtype) that is passed to `apply_tensor`, the annotations of the records
+    are updated with `BaseRecord.rescale`, `flip` and `crop`. All images need to
+    have the same size, e.g. transform them with `tfms.A.resize_and_pad` first.
+    The `img_size` of the records is set to the size of the images, padding
+    included, as that's where their annotations are.
+
+    The image of each record is then a (H, W, C) view into the transformed batch,
+    which is used as it is by the next `TensorBatchTransform` and by the batch
+    builders of the models, instead of stacking the images again. Use
+    `TensorCompose` to apply multiple transforms in a single call.
+    """
+
+    def apply(self, records: List[RecordType]) -> List[RecordType]:
+        imgs = _stack_imgs(records)
+        imgs = self.apply_tensor(imgs, records)
+        _unstack_imgs(imgs, records)
+        return records
+
+    @abstractmethod
+    def apply_tensor(self, imgs: Tensor, records: List[RecordType]) -> Tensor:
+        """Transforms the stacked images and updates the annotations of the records.
+
+        Args:
+            imgs (Tensor): Images of the batch, with the dimensions (N, C, H, W).
+            records (List[RecordType]): Records of the images, in the same order.
+        """
+
+
+class TensorCompose(TensorBatchTransform):
+    """Applies multiple `TensorBatchTransform`s in sequence."""
+
+    def __init__(self, tfms: Sequence[TensorBatchTransform]):
+        self.tfms = tfms
+
+    def apply_tensor(self, imgs: Tensor, records: List[RecordType]) -> Tensor:
+        for tfm in self.tfms:
+            imgs = tfm.apply_tensor(imgs, records)
+        return imgs
+
+
+class BatchHorizontalFlip(TensorBatchTransform):
+    """Flips each image horizontally with probability `p`."""
+
+    horizontal = True
+
+    def __init__(self, p: float = 0.5):
+        self.p = p
+
+    def apply_tensor(self, imgs: Tensor, records: List[RecordType]) -> Tensor:
+        flip = torch.rand(len(records)) < self.p
+        dim = -1 if self.horizontal else -2
+        imgs = torch.where(flip[:, None, None, None], imgs.flip(dim), imgs)
+        for record, flipped in zip(records, flip.tolist()):
+            if flipped:
+                record.flip(horizontal=self.horizontal)
+        return imgs
+
+
+class BatchVerticalFlip(BatchHorizontalFlip):
+    """Flips each image vertically with probability `p`."""
+
+    horizontal = False
+
+
+class BatchResize(TensorBatchTransform):
+    """Resizes all images to `size`, with area interpolation when downscaling and
+    bilinear interpolation otherwise.
+
+    # Arguments
+        size: Size of the resized images, an int for square images or (width, height).
+    """
+
+    def __init__(self, size: Union[int, Tuple[int, int]]):
+        width, height = (size, size) if isinstance(size, int) else size
+        self.size = ImgSize(width=width, height=height)
+
+    def apply_tensor(self, imgs: Tensor, records: List[RecordType]) -> Tensor:
+        imgs = _resize(imgs, self.size)
+        for record in records:
+            record.rescale(self.size)
+        return imgs
+
+
+class BatchRandomResizedCrop(TensorBatchTransform):
+    """Crops a random region of each image and resizes it to `size`.
+
+    The region covers a random fraction (`scale`) of the image area and has a random
+    aspect ratio (`ratio`), as `torchvision.transforms.RandomResizedCrop`. The
+    regions of all images are cropped and resized together with `roi_align`.
+    Annotations outside of the region are removed.
+
+    # Arguments
+        size: Size of the output images, an int for square images or (width, height).
+        scale: Range of the fraction of the image area to crop.
+        ratio: Range of the aspect ratio (width / height) of the cropped region.
+    """
+
+    def __init__(
+        self,
+        size: Union[int, Tuple[int, int]],
+        scale: Tuple[float, float] = (0.08, 1.0),
+        ratio: Tuple[float, float] = (3 / 4, 4 / 3),
+    ):
+        width, height = (size, size) if isinstance(size, int) else size
+        self.size = ImgSize(width=width, height=height)
+        self.scale = scale
+        self.ratio = ratio
+
+    def apply_tensor(self, imgs: Tensor, records: List[RecordType]) -> Tensor:
+        height, width = imgs.shape[-2:]
+        regions = torch.tensor(
+            [self._sample_region(width, height) for _ in records], dtype=torch.int64
+        )
+
+        # (batch index, xmin, ymin, xmax, ymax) for each image
+        boxes = torch.cat([torch.arange(len(records))[:, None], regions], dim=1)
+        crops = roi_align(
+            imgs.float(),
+            boxes.float(),
+            output_size=(self.size.height, self.size.width),
+            sampling_ratio=2,
+            aligned=True,
+        )
+
+        for record, region in zip(records, regions.tolist()):
+            record.crop(*region)
+            record.rescale(self.size)
+            _remove_empty_bboxes(record)
+        return _cast(crops, imgs.dtype)
+
+    def _sample_region(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        area = width * height
+        log_ratio = np.log(self.ratio)
+        for _ in range(10):
+            target_area = area * np.random.uniform(*self.scale)
+            aspect_ratio = np.exp(np.random.uniform(*log_ratio))
+            w = int(round(np.sqrt(target_area * aspect_ratio)))
+            h = int(round(np.sqrt(target_area / aspect_ratio)))
+            if 0 < w <= width and 0 < h <= height:
+                xmin = np.random.randint(0, width - w + 1)
+                ymin = np.random.randint(0, height - h + 1)
+                return xmin, ymin, xmin + w, ymin + h
+
+        # fallback to a central crop
+        aspect_ratio = width / height
+        if aspect_ratio < min(self.ratio):
+            w, h = width, int(round(width / min(self.ratio)))
+        elif aspect_ratio > max(self.ratio):
+            w, h = int(round(height * max(self.ratio))), height
+        else:
+            w, h = width, height
+        xmin, ymin = (width - w) // 2, (height - h) // 2
+        return xmin, ymin, xmin + w, ymin + h
+
+
+class BatchBrightnessContrast(TensorBatchTransform):
+    """Randomly changes the brightness and contrast of each image with probability
+    `p`, as `A.RandomBrightnessContrast`.
+
+    # Arguments
+        brightness_limit: The brightness is shifted by a random factor in
+            [-brightness_limit, brightness_limit] of the maximum pixel value.
+        contrast_limit: The contrast is multiplied by a random factor in
+            [1 - contrast_limit, 1 + contrast_limit].
+        p: Probability of changing each image.
+    """
+
+    def __init__(
+        self, brightness_limit: float = 0.2, contrast_limit: float = 0.2, p=0.5
+    ):
+        self.brightness_limit = brightness_limit
+        self.contrast_limit = contrast_limit
+        self.p = p
+
+    def apply_tensor(self, imgs: Tensor, records: List[RecordType]) -> Tensor:
+        n = len(records)
+        max_value = 255.0 if imgs.dtype == torch.uint8 else 1.0
+        apply = (torch.rand(n) < self.p).float()
+        alpha = 1 + apply * _uniform(n, self.contrast_limit)
+        beta = apply * _uniform(n, self.brightness_limit) * max_value
+
+        out = imgs.float() * alpha[:, None, None, None] + beta[:, None, None, None]
+        return _cast(out.clamp_(0, max_value), imgs.dtype)
+
+
+class BatchNormalize(TensorBatchTransform):
+    """Normalizes the images as `A.Normalize`, the images become float32.
+
+    # Arguments
+        mean: Mean of each channel, relative to `max_pixel_value`.
+        std: Standard deviation of each channel, relative to `max_pixel_value`.
+        max_pixel_value: Maximum value of the pixels of the input images.
+    """
+
+    def __init__(
+        self,
+        mean: Sequence[float] = (0.485, 0.456, 0.406),
+        std: Sequence[float] = (0.229, 0.224, 0.225),
+        max_pixel_value: float = 255.0,
+    ):
+        self.mean = torch.tensor(mean, dtype=torch.float32)[:, None, None]
+        self.std = torch.tensor(std, dtype=torch.float32)[:, None, None]
+        self.max_pixel_value = max_pixel_value
+
+    def apply_tensor(self, imgs: Tensor, records: List[RecordType]) -> Tensor:
+        mean = self.mean * self.max_pixel_value
+        std = self.std * self.max_pixel_value
+        return (imgs.float() - mean) / std
+
+
+def _stack_imgs(records: List[RecordType]) -> Tensor:
+    shapes = {record.img.shape for record in records}
+    if len(shapes) > 1:
+        raise ValueError(
+            f"All images of the batch need to have the same size, got {shapes}. "
+            "Resize them to the same size first (e.g. with `tfms.A.resize_and_pad`)"
+        )
+    imgs = [record.img for record in records]
+    batch = _batch_tensor(imgs)
+    if batch is None:
+        batch = torch.from_numpy(np.stack(imgs)).permute(0, 3, 1, 2)
+    height, width = batch.shape[-2:]
+    for record in records:
+        if record.img_size != (width, height):
+            record.set_img_size(ImgSize(width=width, height=height))
+    return batch
+
+
+def _unstack_imgs(imgs: Tensor, records: List[RecordType]) -> None:
+    # the image of each record is a (H, W, C) view into the (N, C, H, W) batch
+    imgs = imgs.contiguous().permute(0, 2, 3, 1).numpy()
+    for record, img in zip(records, imgs):
+        record.img = img
+
+
+def _batch_tensor(imgs: Sequence[np.ndarray]) -> Optional[Tensor]:
+    """Returns the (N, C, H, W) tensor the images are views of, without copying
+    them, if they were set by a `TensorBatchTransform` (in the same order).
+    """
+    base = imgs[0].base
+    if not isinstance(base, np.ndarray) or base.shape[0] != len(imgs):
+        return None
+    for img, expected in zip(imgs, base):
+        if (
+            img.base is not base
+            or img.__array_interface__ != expected.__array_interface__
+        ):
+            return None
+    batch = torch.from_numpy(base).permute(0, 3, 1, 2)
+    return batch if batch.is_contiguous() else None
+
+
+def _resize(imgs: Tensor, size: ImgSize) -> Tensor:
+    height, width = imgs.shape[-2:]
+    if (width, height) == size:
+        return imgs
+    out_size = (size.height, size.width)
+    if size.width <= width and size.height <= height:
+        out = F.interpolate(imgs.float(), size=out_size, mode="area")
+    else:
+        out = F.interpolate(
+            imgs.float(), size=out_size, mode="bilinear", align_corners=False
+        )
+    return _cast(out, imgs.dtype)
+
+
+def _cast(imgs: Tensor, dtype: torch.dtype) -> Tensor:
+    if dtype == torch.uint8:
+        return imgs.round_().clamp_(0, 255).to(dtype)
+    return imgs.to(dtype)
+
+
+def _uniform(n: int, limit: float) -> Tensor:
+    return (torch.rand(n) * 2 - 1) * limit
+
+
+def _remove_empty_bboxes(record: RecordType) -> None:
+    detection = getattr(record, "detection", None)
+    bboxes = getattr(detection, "bboxes", None)
+    if bboxes is None:
+        return
+    xyxy = BBoxArray.from_bboxes(bboxes).data
+    empty = (xyxy[:, 2] <= xyxy[:, 0]) | (xyxy[:, 3] <= xyxy[:, 1])
+    for i in np.flatnonzero(empty)[::-1]:
+        record.remove_annotation(int(i), task_name="detection")
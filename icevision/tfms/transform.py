@@ -1,6 +1,7 @@
 __all__ = ["Transform"]
 
 from icevision.imports import *
+from icevision.utils import *
 from icevision.core import *
 
 
@@ -17,3 +18,10 @@ class Transform(ABC):
               dict: Modified values, the keys of the dictionary should have the same
               names as the keys received by this function
         """
+
+    def draft_size(self, img_size: ImgSize) -> Optional[ImgSize]:
+        """Smallest size an image of `img_size` can be decoded at without losing
+        quality, because the transform resizes it first. `None` if it needs to be
+        decoded at full size.
+        """
+        return None
@@ -6,3 +6,5 @@ from icevision.utils.download_utils import *
 from icevision.utils.data_dir import *
 from icevision.utils.capture_stdout import *
 from icevision.utils.logger_utils import *
+from icevision.utils.parallel import *
+from icevision.utils.json_stream import *
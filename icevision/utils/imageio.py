@@ -1,13 +1,17 @@
 __all__ = [
     "ImgSize",
     "open_img",
+    "scaled_img_size",
     "get_image_size",
     "get_img_size",
+    "get_img_sizes",
+    "ImgSizeCache",
     "show_img",
     "plot_grid",
 ]
 
 from icevision.imports import *
+from icevision.utils.parallel import *
 from PIL import ExifTags
 
 ImgSize = namedtuple("ImgSize", "width,height")
@@ -18,12 +22,56 @@ for _EXIF_ORIENTATION_TAG in ExifTags.TAGS.keys():
         break
 
 
-def open_img(fn, gray=False):
+def open_img(
+    fn,
+    gray=False,
+    draft_size: Optional[ImgSize] = None,
+    max_size: Optional[int] = None,
+):
+    """Opens an image as a numpy array, transposed according to its EXIF orientation.
+
+    # Arguments
+        fn: Path of the image, or a binary file object.
+        gray: If True the image is converted to grayscale, otherwise to RGB.
+        draft_size: If specified, JPEG images are decoded at a reduced scale (1/2,
+            1/4 or 1/8, with PIL `draft`) as long as the image stays at least as
+            large as `draft_size` on both sides. Other formats are not affected.
+        max_size: If specified, images with a side larger than `max_size` are
+            downscaled to `scaled_img_size(size, max_size)`. JPEG images are decoded
+            at a reduced scale first, unless `draft_size` is given.
+    """
     color = "L" if gray else "RGB"
-    image = PIL.Image.open(str(fn))
+    # file objects are opened as they are (e.g. image bytes read from a tar shard)
+    image = PIL.Image.open(fn if hasattr(fn, "read") else str(fn))
+    # sizes are given for the transposed image
+    transposed = image.getexif().get(_EXIF_ORIENTATION_TAG) in [5, 6, 7, 8]
+    img_size = ImgSize(*image.size[::-1]) if transposed else ImgSize(*image.size)
+
+    target_size = None
+    if max_size is not None and max(img_size) > max_size:
+        target_size = scaled_img_size(img_size, max_size)
+        draft_size = draft_size or target_size
+    if draft_size is not None:
+        width, height = draft_size[::-1] if transposed else draft_size
+        image.draft(color, (max(1, width), max(1, height)))
+
     image = PIL.ImageOps.exif_transpose(image)
     image = image.convert(color)
-    return np.array(image)
+    img = np.array(image)
+    if target_size is not None and img.shape[:2] != target_size[::-1]:
+        img = cv2.resize(img, tuple(target_size), interpolation=cv2.INTER_AREA)
+    return img
+
+
+def scaled_img_size(img_size: ImgSize, max_size: int) -> ImgSize:
+    """Size of an image with its longest side scaled down to `max_size`, images that
+    are already smaller keep their size.
+    """
+    width, height = img_size
+    scale = min(1, max_size / max(width, height))
+    return ImgSize(
+        width=max(1, round(width * scale)), height=max(1, round(height * scale))
+    )
 
 
 # TODO: Deprecated
@@ -54,6 +102,89 @@ def get_img_size(filepath: Union[str, Path]) -> ImgSize:
     return ImgSize(*image_size)
 
 
+class ImgSizeCache:
+    """Image sizes persisted to a json file, keyed by path and modification time.
+
+    An entry is only valid while the file modification time is the same as when
+    the size was stored, checking it only requires a `stat` of the image.
+
+    # Arguments
+        filepath: Where the sizes are saved, the file is created if it does not exist.
+    """
+
+    version = 1
+
+    def __init__(self, filepath: Union[str, Path]):
+        self.filepath = Path(filepath)
+        self.sizes = {}
+        if self.filepath.exists():
+            data = json.loads(self.filepath.read_text())
+            if data.get("version") == self.version:
+                self.sizes = data["sizes"]
+
+    def get(self, filepath: Union[str, Path]) -> Optional[ImgSize]:
+        entry = self.sizes.get(str(filepath))
+        if entry is None:
+            return None
+        mtime, width, height = entry
+        try:
+            if Path(filepath).stat().st_mtime_ns != mtime:
+                return None
+        except FileNotFoundError:
+            return None
+        return ImgSize(width=width, height=height)
+
+    def set(self, filepath: Union[str, Path], img_size: ImgSize):
+        mtime = Path(filepath).stat().st_mtime_ns
+        self.sizes[str(filepath)] = [mtime, img_size.width, img_size.height]
+
+    def save(self):
+        tmp_filepath = self.filepath.with_name(f"{self.filepath.name}.tmp")
+        tmp_filepath.write_text(
+            json.dumps({"version": self.version, "sizes": self.sizes})
+        )
+        os.replace(tmp_filepath, self.filepath)
+
+
+def get_img_sizes(
+    filepaths: Sequence[Union[str, Path]],
+    num_workers: int = 16,
+    cache: Optional[ImgSizeCache] = None,
+    show_pbar: bool = True,
+) -> List[ImgSize]:
+    """Returns the (width, height) of multiple images, see `get_img_size`.
+
+    Only the image headers are read. Reading is I/O bound, so it's done by a pool
+    of threads, which is a big speed up on network mounted storage.
+
+    # Arguments
+        filepaths: Images to get the size of.
+        num_workers: Number of threads, if 0 everything runs in the main thread.
+        cache: Sizes in the cache are not read again, new sizes are added and saved.
+        show_pbar: Whether or not to show a progress bar.
+    """
+    img_sizes = [cache.get(o) if cache is not None else None for o in filepaths]
+    missing = [i for i, img_size in enumerate(img_sizes) if img_size is None]
+    if len(missing) == 0:
+        return img_sizes
+
+    missing_img_sizes = parallel_map(
+        get_img_size,
+        [filepaths[i] for i in missing],
+        num_workers=num_workers,
+        use_threads=True,
+        show_pbar=show_pbar,
+    )
+    for i, img_size in zip(missing, missing_img_sizes):
+        img_sizes[i] = img_size
+        if cache is not None:
+            cache.set(filepaths[i], img_size)
+    if cache is not None:
+        cache.save()
+
+    return img_sizes
+
+
 def show_img(img, ax=None, show: bool = False, **kwargs):
     img = img.squeeze().copy()
     cmap = "gray" if len(img.shape) == 2 else None
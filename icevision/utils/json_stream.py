@@ -0,0 +1,103 @@
+__all__ = ["iter_json_items"]
+
+from icevision.imports import *
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+class _JSONStream:
+    """Text buffer over a file, only keeps the part that was not consumed yet."""
+
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def read(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # drop consumed text, so memory stays bounded by the chunk size
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read():
+                raise json.JSONDecodeError("Unexpected end of file", self.buffer, 0)
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {list(chars)}", self.buffer, self.pos
+            )
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # numbers could continue in the next chunk (e.g. "1." or "1e")
+                if self.eof or (
+                    end < len(self.buffer) and self.buffer[end] in _DELIMITERS
+                ):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read()
+
+
+def iter_json_items(
+    filepath: Union[str, Path], chunk_size: int = 1 << 20
+) -> Iterator[Tuple[str, Any]]:
+    """Incrementally reads a json file with an object at the top level.
+
+    Yields `(key, value)` for each key of the top level object. If the value is an
+    array, `(key, item)` is yielded for each of its items instead. Only one item
+    is decoded at a time, so the memory used doesn't depend on the file size.
+
+    # Arguments
+        filepath: Path of the json file.
+        chunk_size: Number of characters read from the file at a time.
+    """
+    with open(filepath, "r", encoding="utf-8") as file:
+        stream = _JSONStream(file, chunk_size=chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+
+        while True:
+            key = stream.value()
+            stream.expect(":")
+
+            if stream.peek() == "[":
+                stream.expect("[")
+                if stream.peek() != "]":
+                    while True:
+                        yield key, stream.value()
+                        if stream.expect(",]") == "]":
+                            break
+                else:
+                    stream.expect("]")
+            else:
+                yield key, stream.value()
+
+            if stream.expect(",}") == "}":
+                return
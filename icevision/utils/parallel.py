@@ -0,0 +1,40 @@
+__all__ = ["chunks", "parallel_map"]
+
+from icevision.imports import *
+from icevision.utils.utils import *
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def chunks(items: Sequence, num_chunks: int) -> List[Sequence]:
+    """Splits `items` into at most `num_chunks` contiguous chunks of similar size."""
+    num_chunks = max(1, min(num_chunks, len(items)))
+    bounds = np.linspace(0, len(items), num_chunks + 1).astype(int)
+    return [items[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def parallel_map(
+    fn: Callable,
+    items: Sequence,
+    num_workers: int = 0,
+    use_threads: bool = False,
+    show_pbar: bool = True,
+) -> List[Any]:
+    """Applies `fn` to every item, optionally using a pool of workers.
+
+    Results are returned in the same order as `items`.
+
+    # Arguments
+        fn: Function to be applied, needs to be picklable when using processes.
+        items: Items to be passed to `fn`.
+        num_workers: Number of workers, if 0 everything runs in the main process.
+        use_threads: Use a pool of threads instead of processes. Useful when `fn`
+            is I/O bound.
+        show_pbar: Whether or not to show a progress bar.
+    """
+    if num_workers == 0:
+        return [fn(item) for item in pbar(items, show=show_pbar)]
+
+    executor_cls = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with executor_cls(max_workers=num_workers) as executor:
+        results = executor.map(fn, items)
+        return list(pbar(results, show=show_pbar, total=len(items)))
@@ -6,9 +6,11 @@ __all__ = [
     "params",
     "check_all_model_params_in_groups2",
     "model_device",
+    "normalize_imgs",
 ]
 
 from icevision.imports import *
+from icevision.utils.utils import IMAGENET_STATS
 
 
 def to_np(t):
@@ -50,3 +52,35 @@ def model_device(model: nn.Module):
     Can be wrong if different parts of the model are in different devices.
     """
     return next(iter(model.parameters())).device
+
+
+def normalize_imgs(
+    imgs: Union[Tensor, Sequence[Tensor]],
+    mean: Sequence[float] = IMAGENET_STATS[0],
+    std: Sequence[float] = IMAGENET_STATS[1],
+    max_pixel_value: float = 255.0,
+    bgr: bool = False,
+) -> Union[Tensor, List[Tensor]]:
+    """Normalizes uint8 images on their device, as `tfms.A.Normalize` does for each
+    image in the dataloader workers. Used on batches built with `uint8_imgs=True`.
+
+    Images that are not uint8 are returned unchanged, they're already normalized.
+
+    # Arguments
+        imgs: A (N, C, H, W) or (C, H, W) tensor, or a list of them.
+        mean: Mean of each channel, relative to `max_pixel_value`.
+        std: Standard deviation of each channel, relative to `max_pixel_value`.
+        max_pixel_value: Maximum value of the pixels of the images.
+        bgr: Whether or not to reverse the channels (RGB to BGR) after normalizing.
+    """
+    if isinstance(imgs, (list, tuple)):
+        return [normalize_imgs(img, mean, std, max_pixel_value, bgr) for img in imgs]
+    if imgs.dtype != torch.uint8:
+        return imgs
+
+    mean = torch.tensor(mean, device=imgs.device).reshape(-1, 1, 1)
+    std = torch.tensor(std, device=imgs.device).reshape(-1, 1, 1)
+    imgs = imgs.float().sub_(mean * max_pixel_value).div_(std * max_pixel_value)
+    if bgr:
+        imgs = imgs.flip(-3)
+    return imgs
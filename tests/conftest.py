@@ -422,3 +422,19 @@ def check_attributes_on_component():
             assert getattr(task_subfield, name) is getattr(component, name)
 
     return _inner
+
+
+@pytest.fixture
+def check_rescaled_sample():
+    def _inner(sample, original):
+        height, width = sample.img.shape[:2]
+        assert sample.img_size == ImgSize(width=width, height=height)
+        assert sample.detection.masks.shape[1:] == (height, width)
+
+        scale = np.array([width / original.width, height / original.height] * 2)
+        for bbox, original_bbox in zip(
+            sample.detection.bboxes, original.detection.bboxes
+        ):
+            np.testing.assert_allclose(bbox.xyxy, np.array(original_bbox.xyxy) * scale)
+
+    return _inner
@@ -29,3 +29,41 @@ def test_bbox_autofix():
     bbox = BBox.from_xyxy(-1, 1, 4, 4)
     bbox.autofix(img_w=3, img_h=2)
     assert bbox.xyxy == (0, 1, 3, 2)
+
+
+def test_bbox_array_conversions():
+    bboxes = BBoxArray.from_xywh([[1, 2, 2, 2], [10, 20, 20, 10]])
+
+    assert bboxes.data.dtype == np.float32
+    np.testing.assert_equal(bboxes.xyxy, [[1, 2, 3, 4], [10, 20, 30, 30]])
+    np.testing.assert_equal(bboxes.yxyx, [[2, 1, 4, 3], [20, 10, 30, 30]])
+    np.testing.assert_equal(bboxes.xywh, [[1, 2, 2, 2], [10, 20, 20, 10]])
+    np.testing.assert_equal(bboxes.area, [4, 200])
+    assert bboxes == [BBox.from_xyxy(1, 2, 3, 4), BBox.from_xyxy(10, 20, 30, 30)]
+
+
+def test_bbox_array_relative_xcycwh():
+    w, h = 640, 480
+    bbox = BBox.from_xyxy(416, 48, 480, 144)
+    bboxes = BBoxArray.from_bboxes([bbox])
+
+    expected = bbox.relative_xcycwh(img_width=w, img_height=h)
+    np.testing.assert_allclose(bboxes.relative_xcycwh(w, h)[0], expected, rtol=1e-6)
+
+
+def test_bbox_array_autofix():
+    bboxes = BBoxArray.from_xyxy([[-1, 1, 4, 4], [1, 2, 1, 3]])
+    success = bboxes.autofix(img_w=3, img_h=2)
+
+    assert success.tolist() == [True, False]
+    assert bboxes[0] == BBox.from_xyxy(0, 1, 3, 2)
+
+
+def test_bbox_array_list_interface():
+    bboxes = BBoxArray.from_xyxy([[1, 2, 3, 4], [5, 6, 7, 8]])
+    bboxes.extend([BBox.from_xyxy(0, 0, 1, 1)])
+    assert len(bboxes) == 3
+
+    assert bboxes.pop(1) == BBox.from_xyxy(5, 6, 7, 8)
+    assert bboxes.to_tensor().shape == (2, 4)
+    assert len(BBoxArray.from_xyxy([])) == 0
@@ -66,3 +66,35 @@ def test_composite_unique_components():
     # TODO: comp1 and comp2 are the same class but different instances
     # `set` will not consider them the same
     assert composite.components == {comp1}
+
+
+def test_composite_getattr_cache():
+    comp1, comp2 = MockComponent1(), MockComponent2()
+    comp1.x, comp2.y = 1, 2
+    composite = Composite([comp1])
+
+    assert composite.x == 1
+    with pytest.raises(AttributeError):
+        composite.y
+    # cache is updated when components change
+    composite.add_component(comp2)
+    assert composite.y == 2
+    assert composite.x == 1
+
+    # composites with the same components share the resolution table
+    other = Composite([MockComponent1(), MockComponent2()])
+    assert other._attr_table is composite._attr_table
+    with pytest.raises(AttributeError):
+        other.x
+
+
+def test_composite_getattr_cache_pickle():
+    comp1 = MockComponent1()
+    comp1.x = 1
+    composite = Composite([comp1])
+    assert composite.x == 1
+
+    assert "_attr_table" not in composite.__getstate__()
+    composite = pickle.loads(pickle.dumps(composite))
+    assert composite.x == 1
+    assert deepcopy(composite).x == 1
@@ -15,3 +15,27 @@ def test_keypoints_simple(keypoints_img_128372):
     assert (kps.x == np.array(keypoints_img_128372[0::3])).all()
     assert kps.xy == [(x, y) for x, y in zip(kps.x, kps.y)]
     assert kps.xy[0] == (0, 0)
+
+
+def test_keypoints_data():
+    component = KeyPointsRecordComponent()
+    component.set_keypoints(
+        [
+            KeyPoints.from_xyv([1, 2, 1, 3, 4, 2], None),
+            KeyPoints.from_xyv([5, 6, 0, 7, 8, 1], None),
+        ]
+    )
+    data = component.keypoints_data
+    assert data.shape == (2, 2, 3)
+    assert data[1].tolist() == [[5, 6, 0], [7, 8, 1]]
+
+    data[:, :, :2] *= 2
+    component.set_keypoints_data(data, [None, None])
+    # keypoints are views into the array
+    assert np.shares_memory(component.keypoints[1].keypoints, data)
+    assert component.keypoints[1].x.tolist() == [10, 14]
+    assert component.keypoints[0].xyv == [(2, 4, 1), (6, 8, 2)]
+
+    component.add_keypoints([KeyPoints.from_xyv([0, 0, 0], None)])
+    with pytest.raises(ValueError):
+        component.keypoints_data
@@ -82,3 +82,106 @@ def test_mask_unconnected_polygon(samples_source):
     mask = poly.to_erles(h, w).to_mask(h, w)
 
     assert mask.shape == (1, h, w)
+
+
+@pytest.fixture
+def mask_data():
+    data = np.zeros((2, 6, 8), dtype=np.uint8)
+    data[0, 1:4, 2:7] = 1
+    data[1, 3:, :3] = 1
+    data[1, 0, 7] = 1
+    return data
+
+
+def test_mask_array_from_erles(mask_data):
+    erles = MaskArray(mask_data).to_erles(h=6, w=8)
+    mask = MaskArray.from_masks(erles, h=6, w=8)
+
+    assert mask._data is None
+    assert mask.shape == (2, 6, 8)
+    assert len(mask) == 2
+    # not modified masks are not encoded again
+    assert mask.to_erles(h=6, w=8) is erles
+    assert pickle.loads(pickle.dumps(mask))._data is None
+
+    np.testing.assert_equal(mask.data, mask_data)
+    # decoded masks can be modified in place and are encoded again
+    mask.data[0] = 0
+    np.testing.assert_equal(mask.to_erles(h=6, w=8).to_mask(h=6, w=8).data[0], 0)
+
+    data = mask.data
+    mask = pickle.loads(pickle.dumps(mask))
+    np.testing.assert_equal(mask.data, data)
+
+
+@pytest.mark.parametrize(
+    "fn_name,kwargs,expected_fn",
+    [
+        ("hflip", {}, lambda o: o[:, :, ::-1]),
+        ("vflip", {}, lambda o: o[:, ::-1]),
+        ("crop", dict(xmin=1, ymin=2, xmax=6, ymax=5), lambda o: o[:, 2:5, 1:6]),
+        ("resize", dict(height=3, width=4), lambda o: o[:, ::2, ::2]),
+        ("resize", dict(height=12, width=8), lambda o: o.repeat(2, axis=1)),
+    ],
+)
+def test_encoded_rles_transforms(mask_data, fn_name, kwargs, expected_fn):
+    erles = MaskArray(mask_data).to_erles(h=6, w=8)
+    tfmed_erles = getattr(erles, fn_name)(**kwargs)
+
+    expected = expected_fn(mask_data)
+    h, w = expected.shape[1:]
+    np.testing.assert_equal(tfmed_erles.to_mask(h=h, w=w).data, expected)
+    # same encoding as encoding the transformed masks
+    assert tfmed_erles == MaskArray(expected).to_erles(h=h, w=w)
+
+
+def test_encode_decode_rle(mask_data, coco_counts):
+    counts = encode_rle(mask_data)
+    assert [o.tolist() for o in counts] == [
+        o["counts"] for o in MaskArray(mask_data).to_coco_rle(h=6, w=8)
+    ]
+    np.testing.assert_equal(decode_rle(counts, h=6, w=8), mask_data)
+
+    mask = decode_rle([coco_counts], h=17, w=1)
+    expected = [1, 1, 1, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0]
+    assert mask.reshape(-1).tolist() == expected
+
+
+def test_encode_rle_no_instances():
+    masks = np.zeros((0, 6, 8), dtype=np.uint8)
+    assert encode_rle(masks) == []
+    assert MaskArray(masks).to_coco_rle(h=6, w=8) == []
+    assert decode_rle([], h=6, w=8).shape == (0, 6, 8)
+
+
+def test_compress_counts(mask_data):
+    for counts, erle in zip(
+        encode_rle(mask_data), MaskArray(mask_data).to_erles(h=6, w=8).erles
+    ):
+        assert compress_counts(counts) == erle["counts"]
+        assert decompress_counts(erle["counts"]).tolist() == counts.tolist()
+
+
+def test_rle_to_kaggle(kaggle_counts, coco_counts):
+    assert RLE.from_coco(coco_counts).to_kaggle() == kaggle_counts
+
+
+@pytest.mark.parametrize("compact_mask_cls", [PackedMaskArray, CroppedMaskArray])
+def test_compact_mask_arrays(mask_data, compact_mask_cls):
+    mask = compact_mask_cls.from_mask_array(MaskArray(mask_data))
+
+    assert len(mask) == 2
+    assert mask.shape == (2, 6, 8)
+    np.testing.assert_equal(mask.to_mask(h=6, w=8).data, mask_data)
+    np.testing.assert_equal(mask[np.array([False, True])].data, mask_data[1:])
+    # an int index selects a single mask, as with `MaskArray`
+    assert mask[1].shape == MaskArray(mask_data)[1].shape == (6, 8)
+    np.testing.assert_equal(mask[1].data, mask_data[1])
+    assert mask.to_erles(h=6, w=8) == MaskArray(mask_data).to_erles(h=6, w=8)
+
+
+def test_cropped_mask_array_crops(mask_data):
+    mask = CroppedMaskArray.from_mask_array(MaskArray(mask_data))
+
+    assert mask.offsets.tolist() == [[2, 1], [0, 0]]
+    assert [o.shape for o in mask.crops] == [(3, 5), (6, 8)]
@@ -157,3 +157,139 @@ def test_autofix_records(
     assert record.detection.label_ids == [1]
     assert record.detection.bboxes == [BBox.from_xyxy(1, 2, 3, 3)]
     assert len(record.detection.masks) == 1
+
+
+def test_record_autofix_bbox_array(record):
+    record.detection.set_bboxes(BBoxArray.from_bboxes(record.detection.bboxes))
+    record.autofix()
+
+    assert record.detection.label_ids == [1]
+    assert record.detection.bboxes == [BBox.from_xyxy(1, 2, 3, 3)]
+    assert len(record.detection.masks) == 1
+
+
+def test_batch_autofix_records(
+    record, record_invalid_path, record_wrong_num_annotations, record_empty_annotations
+):
+    records = [
+        record,
+        record_invalid_path,
+        record_wrong_num_annotations,
+        record_empty_annotations,
+    ]
+    records, report = batch_autofix_records(records)
+
+    assert len(records) == 2
+    record = records[0]
+    assert record.detection.label_ids == [1]
+    assert record.detection.bboxes == [BBox.from_xyxy(1, 2, 3, 3)]
+    assert len(record.detection.masks) == 1
+
+    assert report.num_records == 4
+    assert report.removed_record_ids == [2, 3]
+    assert report.counts == {
+        "missing_file": 1,
+        "wrong_num_annotations": 1,
+        "clipped_bboxes": 1,
+        "invalid_bboxes": 1,
+        "removed_annotations": 1,
+    }
+
+
+def test_record_copy(record):
+    record_copy = record.copy()
+
+    assert record_copy.detection.class_map is record.detection.class_map
+    assert record_copy.filepath is record.filepath
+    assert record_copy.detection.bboxes == record.detection.bboxes
+    assert record_copy.detection.bboxes is not record.detection.bboxes
+
+    record_copy.remove_annotation(i=0, task_name="detection")
+    assert record.detection.label_ids == [1, 2]
+    assert len(record.detection.bboxes) == 2
+    assert len(record.detection.masks) == 2
+    assert len(record_copy.detection.masks) == 1
+
+    # bboxes modified in place don't change the original record
+    record_copy = record.copy()
+    record_copy.detection.bboxes[0].autofix(img_w=3, img_h=3)
+    assert record_copy.detection.bboxes[0].xyxy == (1, 2, 3, 3)
+    assert record.detection.bboxes[0].xyxy == (1, 2, 4, 4)
+
+
+def test_record_rescale(coco_record):
+    record = coco_record.copy()
+    width, height = record.img_size
+    record.rescale(ImgSize(width=width // 2, height=height // 4))
+
+    assert record.img_size == ImgSize(width=width // 2, height=height // 4)
+    scale = np.array([width // 2 / width, height // 4 / height] * 2)
+    for bbox, original in zip(record.detection.bboxes, coco_record.detection.bboxes):
+        np.testing.assert_allclose(bbox.xyxy, np.array(original.xyxy) * scale)
+    np.testing.assert_allclose(
+        record.detection.areas,
+        np.array(coco_record.detection.areas) * scale[0] * scale[1],
+    )
+
+    masks = record.detection.masks.to_mask(h=height // 4, w=width // 2)
+    assert masks.shape == (len(coco_record.detection.masks), height // 4, width // 2)
+    # the original record is not modified
+    assert coco_record.img_size == ImgSize(width=width, height=height)
+
+
+def test_record_rescale_keypoints(record_keypoints):
+    record_keypoints.set_img_size(ImgSize(width=10, height=10))
+    record_keypoints.rescale(ImgSize(width=20, height=5))
+
+    keypoints = record_keypoints.detection.keypoints[0]
+    assert keypoints.x.tolist() == [0, 2, 4]
+    assert keypoints.y.tolist() == [0, 0.5, 1]
+    assert keypoints.visible.tolist() == [0, 1, 2]
+    assert record_keypoints.detection.bboxes == [BBox.from_xyxy(2, 1, 8, 2)]
+
+
+def test_record_flip(coco_record):
+    record = coco_record.copy()
+    width, height = record.img_size
+    record.flip(horizontal=True)
+
+    for bbox, original in zip(record.detection.bboxes, coco_record.detection.bboxes):
+        xmin, ymin, xmax, ymax = original.xyxy
+        np.testing.assert_allclose(bbox.xyxy, [width - xmax, ymin, width - xmin, ymax])
+    masks = record.detection.masks.to_mask(h=height, w=width).data
+    original_masks = coco_record.detection.masks.to_mask(h=height, w=width).data
+    np.testing.assert_equal(masks, original_masks[:, :, ::-1])
+
+    record.flip(horizontal=False)
+    masks = record.detection.masks.to_mask(h=height, w=width).data
+    np.testing.assert_equal(masks, original_masks[:, ::-1, ::-1])
+
+
+def test_record_crop(coco_record):
+    record = coco_record.copy()
+    width, height = record.img_size
+    record.crop(10, 20, 110, 70)
+
+    assert record.img_size == ImgSize(width=100, height=50)
+    for bbox, original in zip(record.detection.bboxes, coco_record.detection.bboxes):
+        expected = np.array(original.xyxy) - [10, 20, 10, 20]
+        np.testing.assert_allclose(bbox.xyxy, np.clip(expected, 0, [100, 50] * 2))
+    masks = record.detection.masks.to_mask(h=50, w=100).data
+    original_masks = coco_record.detection.masks.to_mask(h=height, w=width).data
+    np.testing.assert_equal(masks, original_masks[:, 20:70, 10:110])
+
+
+def test_record_flip_crop_keypoints(record_keypoints):
+    record_keypoints.set_img_size(ImgSize(width=10, height=10))
+    record_keypoints.flip()
+
+    keypoints = record_keypoints.detection.keypoints[0]
+    # keypoints that are not labeled are not moved
+    assert keypoints.x.tolist() == [0, 9, 8]
+    assert record_keypoints.detection.bboxes == [BBox.from_xyxy(6, 2, 9, 4)]
+
+    record_keypoints.crop(8, 0, 10, 10)
+    keypoints = record_keypoints.detection.keypoints[0]
+    assert keypoints.x.tolist() == [0, 1, 0]
+    assert keypoints.visible.tolist() == [0, 1, 2]
+    assert record_keypoints.detection.bboxes == [BBox.from_xyxy(0, 2, 1, 4)]
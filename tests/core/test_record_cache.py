@@ -0,0 +1,89 @@
+import gc
+import pytest
+from icevision.all import *
+
+
+@pytest.fixture
+def records(instance_segmentation_record):
+    record2 = deepcopy(instance_segmentation_record)
+    record2.set_record_id(2)
+    record2.detection.set_class_map(instance_segmentation_record.detection.class_map)
+    record2.detection.set_bboxes([BBox.from_xyxy(5, 6, 7, 8)])
+    return [instance_segmentation_record, record2]
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    source_file = tmp_path / "annotations.json"
+    source_file.write_text("{}")
+    return source_file
+
+
+def test_records_cache(records, tmp_path):
+    cache_filepath = tmp_path / "records.cache"
+    save_records_cache(cache_filepath, [records[:1], records[1:]])
+
+    splits = load_records_cache(cache_filepath)
+    assert [len(o) for o in splits] == [1, 1]
+    assert isinstance(splits[0], CachedRecords)
+
+    for original, record in zip(records, [splits[0][0], splits[1][0]]):
+        assert record.record_id == original.record_id
+        assert record.filepath == original.filepath
+        assert record.detection.label_ids == original.detection.label_ids
+        assert record.detection.bboxes == original.detection.bboxes
+
+    # class maps are stored once and shared between records
+    assert splits[0][0].detection.class_map is splits[1][0].detection.class_map
+    # records are read from the file again, changes are not kept
+    splits[0][0].set_record_id(42)
+    assert splits[0][0].record_id == records[0].record_id
+
+    subset = pickle.loads(pickle.dumps(splits[1][[0]]))
+    assert subset[0].record_id == 2
+    assert len(subset[0].detection.masks) == len(records[1].detection.masks)
+
+
+def test_records_cache_invalid(records, tmp_path):
+    cache_filepath = tmp_path / "records.cache"
+    pickle.dump([records], open(cache_filepath, "wb"))
+    assert load_records_cache(cache_filepath) is None
+
+    save_records_cache(cache_filepath, [records], source={"parser": "a"})
+    assert load_records_cache(cache_filepath, source={"parser": "b"}) is None
+    assert load_records_cache(cache_filepath, source={"parser": "a"}) is not None
+
+    cache_filepath.write_bytes(cache_filepath.read_bytes()[:-4])
+    assert load_records_cache(cache_filepath, source={"parser": "a"}) is None
+
+
+def test_records_cache_source_files(records, source_file, tmp_path):
+    cache_filepath = tmp_path / "records.cache"
+    source = {"files": files_fingerprint([source_file])}
+    save_records_cache(cache_filepath, [records], source=source)
+
+    assert load_records_cache(cache_filepath, source_files=[source_file]) is not None
+
+    # touching the file keeps the cache valid, the content is the same
+    stat = source_file.stat()
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert load_records_cache(cache_filepath, source_files=[source_file]) is not None
+
+    source_file.write_text("[]")
+    assert load_records_cache(cache_filepath, source_files=[source_file]) is None
+    assert load_records_cache(cache_filepath, source_files=[]) is None
+
+
+def test_share_records(records, tmp_path):
+    shared_records = share_records(records, dirpath=tmp_path)
+    assert share_records(shared_records) is shared_records
+    filepath = shared_records.filepath
+    assert filepath.parent == tmp_path
+
+    assert [o.record_id for o in shared_records] == [o.record_id for o in records]
+    subset = pickle.loads(pickle.dumps(shared_records[1:]))
+    assert subset[0].detection.bboxes == records[1].detection.bboxes
+
+    del shared_records, subset
+    gc.collect()
+    assert not filepath.exists()
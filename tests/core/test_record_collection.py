@@ -0,0 +1,64 @@
+import pytest
+from icevision.all import *
+
+
+@pytest.fixture
+def records(object_detection_record):
+    record2 = deepcopy(object_detection_record)
+    record2.set_record_id(2)
+    record2.detection.set_labels_by_id([2])
+    record2.detection.set_bboxes([BBox.from_xyxy(5, 6, 7, 8)])
+
+    return [object_detection_record, record2]
+
+
+def test_record_collection_from_records(records):
+    collection = RecordCollection.from_records(records)
+
+    assert len(collection) == 2
+    assert collection.offsets.tolist() == [0, 2, 3]
+    assert collection.label_ids.tolist() == [1, 2, 2]
+    assert collection.bboxes.dtype == np.float32
+    assert collection.bboxes.shape == (3, 4)
+
+    for original, record in zip(records, collection):
+        assert record.record_id == original.record_id
+        assert record.filepath == original.filepath
+        assert record.img_size == original.img_size
+        assert record.detection.class_map == original.detection.class_map
+        assert record.detection.label_ids == original.detection.label_ids
+        assert record.detection.labels == original.detection.labels
+        assert record.detection.bboxes == original.detection.bboxes
+
+
+def test_record_collection_take(records):
+    collection = RecordCollection.from_records(records)
+
+    subset = collection[[1]]
+    assert isinstance(subset, RecordCollection)
+    assert subset.offsets.tolist() == [0, 1]
+    assert subset[0].detection.bboxes == [BBox.from_xyxy(5, 6, 7, 8)]
+
+    subset = collection[::-1]
+    assert [record.record_id for record in subset] == [2, 1]
+    assert collection[-1].record_id == 2
+
+
+def test_record_collection_dataset(records):
+    collection = RecordCollection.from_records(records)
+    dataset = Dataset(collection)
+
+    sample = dataset[0]
+    assert sample.img.shape == (375, 500, 3)
+    assert sample.detection.label_ids == [1, 2]
+
+
+def test_record_collection_unsupported_components(instance_segmentation_record):
+    with pytest.raises(ValueError):
+        RecordCollection.from_records([instance_segmentation_record])
+
+
+def test_record_collection_different_class_maps(records):
+    records[1].detection.set_class_map(ClassMap(["b", "a"]))
+    with pytest.raises(ValueError):
+        RecordCollection.from_records(records)
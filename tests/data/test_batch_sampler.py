@@ -0,0 +1,54 @@
+import pytest
+from icevision.all import *
+
+
+@pytest.fixture
+def records():
+    records = []
+    for i, img_size in enumerate([(640, 480), (480, 640)] * 5 + [(500, 500)]):
+        record = BaseRecord((SizeRecordComponent(),))
+        record.set_record_id(i)
+        record.set_img_size(ImgSize(*img_size))
+        records.append(record)
+    return records
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+def test_aspect_ratio_batch_sampler(records, shuffle):
+    sampler = AspectRatioBatchSampler(
+        records, batch_size=2, shuffle=shuffle, num_buckets=2
+    )
+    batches = list(sampler)
+    assert len(batches) == len(sampler) == 6
+    assert sorted(i for batch in batches for i in batch) == list(range(11))
+    # all batches are full except the last one
+    assert [len(batch) for batch in batches] == [2] * 5 + [1]
+
+    # portrait and landscape images are not mixed, only the square image is
+    full_batches = [[records[i].img_size for i in batch] for batch in batches[:-1]]
+    mixed = [o for o in full_batches if len(set(o)) > 1]
+    assert len(mixed) == 1 and ImgSize(500, 500) in mixed[0]
+
+    if shuffle:
+        assert list(sampler) != batches
+        sampler.set_epoch(0)
+        assert list(sampler) == batches
+    else:
+        assert list(sampler) == batches
+
+
+def test_aspect_ratio_batch_sampler_drop_last(records):
+    sampler = AspectRatioBatchSampler(records, batch_size=2, drop_last=True)
+    batches = list(sampler)
+    assert len(batches) == len(sampler) == 5
+    assert all(len(batch) == 2 for batch in batches)
+
+
+def test_aspect_ratio_batch_sampler_dataset(records):
+    dataset = Dataset(records)
+    dl = DataLoader(
+        dataset,
+        batch_sampler=AspectRatioBatchSampler(dataset, batch_size=4),
+        collate_fn=lambda o: o,
+    )
+    assert sum(len(batch) for batch in dl) == len(records)
@@ -10,3 +10,34 @@ def test_dataset_from_images():
     sample = dataset[0]
     assert (sample.img == np.zeros([4, 4, 3])).all()
     assert sample.height == sample.width == 4
+
+
+def test_dataset_shared(coco_mask_records):
+    dataset = Dataset(coco_mask_records, shared=True)
+    assert isinstance(dataset.records, CachedRecords)
+    assert len(dataset) == len(coco_mask_records)
+
+    dataset = pickle.loads(pickle.dumps(dataset))
+    sample = dataset[0]
+    expected = coco_mask_records[0].load()
+    assert sample.record_id == expected.record_id
+    assert sample.detection.bboxes == expected.detection.bboxes
+    assert (sample.img == expected.img).all()
+
+
+def test_dataset_draft(coco_mask_records, check_rescaled_sample):
+    class Presize(tfms.Transform):
+        def draft_size(self, img_size):
+            return ImgSize(width=img_size.width // 4, height=img_size.height // 4)
+
+        def apply(self, record):
+            return record
+
+    records = coco_mask_records[:1]
+    expected = records[0].load()
+    assert Dataset(records, tfm=Presize())[0].img.shape == expected.img.shape
+
+    sample = Dataset(records, tfm=Presize(), draft=True)[0]
+    height, width = sample.img.shape[:2]
+    assert (width, height) == ((expected.width + 3) // 4, (expected.height + 3) // 4)
+    check_rescaled_sample(sample, expected)
@@ -0,0 +1,68 @@
+import pytest
+from icevision.all import *
+
+
+@pytest.fixture
+def records(coco_mask_records):
+    return coco_mask_records[:3]
+
+
+def test_image_cache(records, tmp_path):
+    img_cache = ImageCache(max_bytes=2 ** 30, dirpath=tmp_path)
+    dataset = Dataset(records, img_cache=img_cache)
+
+    samples = [dataset[i] for i in range(len(dataset))]
+    assert (img_cache.hits, img_cache.misses) == (0, 3)
+    assert len(img_cache) == 3
+    assert img_cache.nbytes == sum(o.img.nbytes for o in samples)
+
+    for i, sample in enumerate(samples):
+        cached_sample = dataset[i]
+        expected = records[i].load()
+        assert (cached_sample.img == expected.img).all()
+        assert cached_sample.img_size == expected.img_size
+        assert cached_sample.detection.bboxes == expected.detection.bboxes
+        # each item gets its own copy of the image
+        cached_sample.img[:] = 0
+    assert (img_cache.hits, img_cache.misses) == (3, 3)
+    assert (dataset[0].img == records[0].load().img).all()
+
+
+def test_image_cache_eviction(records, tmp_path):
+    nbytes = [records[i].load().img.nbytes for i in range(2)]
+    img_cache = ImageCache(max_bytes=max(nbytes) + 1, dirpath=tmp_path)
+    dataset = Dataset(records, img_cache=img_cache)
+
+    dataset[0], dataset[1]
+    assert len(img_cache) == 1
+    assert img_cache.nbytes == nbytes[1]
+    dataset[1]
+    assert img_cache.hits == 1
+
+    with pytest.raises(ValueError):
+        Dataset(records[:1], img_cache=img_cache)
+
+
+def test_image_cache_max_size(records, tmp_path, check_rescaled_sample):
+    img_cache = ImageCache(max_bytes=2 ** 30, max_size=64, dirpath=tmp_path)
+    dataset = Dataset(records, img_cache=img_cache)
+
+    for _ in range(2):
+        sample, expected = dataset[0], records[0].load()
+        assert max(sample.img.shape[:2]) == 64
+        check_rescaled_sample(sample, expected)
+    assert img_cache.hits == 1
+
+
+def test_image_cache_workers(records, tmp_path):
+    img_cache = ImageCache(max_bytes=2 ** 30, dirpath=tmp_path)
+    dataset = Dataset(records, img_cache=img_cache)
+    data_loader = DataLoader(
+        dataset, batch_size=None, num_workers=2, collate_fn=lambda o: o.record_id
+    )
+
+    assert sorted(data_loader) == sorted(o.record_id for o in records)
+    # images decoded by the workers are shared with this process
+    assert (img_cache.hits, img_cache.misses) == (0, 3)
+    dataset[2]
+    assert img_cache.hits == 1
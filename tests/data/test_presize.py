@@ -0,0 +1,26 @@
+import pytest
+from icevision.all import *
+
+
+def test_presize_records(coco_mask_records, tmp_path, check_rescaled_sample):
+    records = coco_mask_records[:2]
+    originals = [record.load() for record in records]
+
+    presized = presize_records(records, max_size=64, out_dir=tmp_path)
+    for record, presized_record, original in zip(records, presized, originals):
+        assert presized_record.filepath.parent == tmp_path
+        assert record.filepath != presized_record.filepath
+
+        sample = presized_record.load()
+        assert max(sample.img.shape[:2]) == 64
+        check_rescaled_sample(sample, original)
+
+        # the original records are not modified
+        assert record.img_size == original.img_size
+        assert record.detection.bboxes == original.detection.bboxes
+
+    # images already presized are kept
+    mtimes = [o.filepath.stat().st_mtime_ns for o in presized]
+    presized_again = presize_records(records, max_size=64, out_dir=tmp_path)
+    assert [o.filepath.stat().st_mtime_ns for o in presized_again] == mtimes
+    assert [o.img_size for o in presized_again] == [o.img_size for o in presized]
@@ -0,0 +1,56 @@
+import pytest
+from icevision.all import *
+from icevision.models.utils import transform_dl
+
+
+@pytest.fixture
+def shards_dir(coco_mask_records, tmp_path):
+    write_shards(coco_mask_records, tmp_path, records_per_shard=2, show_pbar=False)
+    return tmp_path
+
+
+def test_write_shards(coco_mask_records, tmp_path):
+    filepaths = write_shards(
+        coco_mask_records, tmp_path, records_per_shard=2, show_pbar=False
+    )
+    assert len(filepaths) == math.ceil(len(coco_mask_records) / 2)
+    assert all(o.exists() for o in filepaths)
+
+
+def test_streaming_dataset(coco_mask_records, shards_dir):
+    dataset = StreamingDataset(shards_dir, shuffle=False)
+    assert len(dataset) == len(coco_mask_records)
+
+    samples = list(dataset)
+    assert len(samples) == len(coco_mask_records)
+    for sample, record in zip(samples, coco_mask_records):
+        expected = record.load()
+        assert sample.record_id == expected.record_id
+        assert (sample.img == expected.img).all()
+        assert sample.detection.bboxes == expected.detection.bboxes
+        assert (sample.detection.masks.data == expected.detection.masks.data).all()
+        # the class map is stored once
+        assert sample.detection.class_map is samples[0].detection.class_map
+
+
+def test_streaming_dataset_shuffle(coco_mask_records, shards_dir):
+    dataset = StreamingDataset(shards_dir, shuffle_buffer=2)
+    record_ids = [o.record_id for o in dataset]
+    assert sorted(record_ids) == sorted(o.record_id for o in coco_mask_records)
+
+    dataset.set_epoch(1)
+    assert sorted(o.record_id for o in dataset) == sorted(record_ids)
+
+
+def test_streaming_dataset_workers(coco_mask_records, shards_dir):
+    dataset = StreamingDataset(shards_dir)
+    # the `shuffle` argument meant for map style datasets is dropped
+    dl = transform_dl(
+        dataset,
+        build_batch=lambda records: ([o.record_id for o in records], records),
+        batch_size=2,
+        num_workers=2,
+        shuffle=True,
+    )
+    record_ids = [record_id for batch, _ in dl for record_id in batch]
+    assert sorted(record_ids) == sorted(o.record_id for o in coco_mask_records)
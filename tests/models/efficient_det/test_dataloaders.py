@@ -126,3 +126,12 @@ def test_efficient_det_infer_dl(records, batch_tfms, img):
     assert torch.equal(batch_imgs, tensor_img)
     assert torch.equal(batch_info["img_size"], img_info["img_size"])
     assert torch.equal(batch_info["img_scale"], img_info["img_scale"])
+
+
+def test_efficient_det_train_dataloader_uint8(records, img):
+    dl = efficientdet.train_dl(records, batch_size=2, uint8_imgs=True)
+    (xb, yb), records = first(dl)
+
+    assert xb.dtype == torch.uint8
+    assert torch.equal(xb, torch.stack([torch.from_numpy(img).permute(2, 0, 1)] * 2))
+    _test_batch_train(images=xb.float() / 255, targets=yb)
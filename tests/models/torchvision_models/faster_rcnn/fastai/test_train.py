@@ -11,3 +11,22 @@ def test_fastai_faster_rcnn_train(
     )
 
     learn.fine_tune(1, 1e-4)
+
+
+def test_fastai_faster_rcnn_callback_norm_stats(fridge_ds):
+    train_ds, _ = fridge_ds
+    ds = Dataset(train_ds.records, tfms.A.Adapter([A.Resize(64, 64)]))
+    (imgs, targets), records = first(
+        faster_rcnn.train_dl(ds, batch_size=2, uint8_imgs=True)
+    )
+    mean, std = [0.5, 0.4, 0.3], [0.2, 0.2, 0.2]
+
+    cb = faster_rcnn.fastai.FasterRCNNCallback(norm_stats=(mean, std))
+    cb.learn = SimpleNamespace(xb=[(imgs, targets)], yb=[records])
+    cb.before_batch()
+
+    expected = (imgs.float() / 255 - tensor(mean)[:, None, None]) / tensor(std)[
+        :, None, None
+    ]
+    assert torch.allclose(cb.learn.xb[0], expected, atol=1e-5)
+    assert not torch.allclose(cb.learn.xb[0], normalize_imgs(imgs), atol=1e-5)
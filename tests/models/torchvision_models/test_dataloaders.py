@@ -126,6 +126,18 @@ def test_mask_rcnn_build_train_batch(mask_rcnn_records):
     _test_mask_rcnn_batch(batch)
 
 
+@pytest.mark.parametrize("mode", ["packed", "cropped"])
+def test_mask_rcnn_build_train_batch_compact_masks(instance_segmentation_record, mode):
+    record = instance_segmentation_record.load()
+    record.set_img_size(ImgSize(width=4, height=4))
+    record.detection.compact_masks(mode)
+
+    batch = mask_rcnn.build_train_batch([record] * 2)
+    _test_mask_rcnn_batch(batch)
+    (_, targets), _ = batch
+    assert (targets[0]["masks"] == 1).all()
+
+
 def test_mask_rcnn_build_train_batch_empty(empty_annotations_record):
     (_, targets), _ = mask_rcnn.build_train_batch([empty_annotations_record])
 
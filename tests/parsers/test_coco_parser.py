@@ -74,3 +74,59 @@ def test_mask_parser(coco_mask_parser):
             b"00O1O1O1N2O1N2N2N101N1O2O0O2N2O0O5G=^Ob0^OXTS2",
         }
     ]
+
+
+def test_coco_parser_img_size_from_metadata(coco_dir, monkeypatch):
+    def get_img_size(filepath):
+        raise AssertionError("images should not be opened")
+
+    imageio = sys.modules["icevision.utils.imageio"]
+    monkeypatch.setattr(imageio, "get_img_size", get_img_size)
+
+    parser = parsers.COCOBBoxParser(coco_dir / "annotations.json", coco_dir / "images")
+    records = parser.parse(data_splitter=SingleSplitSplitter())[0]
+    assert (records[0].width, records[0].height) == (640, 480)
+
+
+def test_coco_parser_img_size_from_images(coco_dir, tmp_path):
+    parser = parsers.COCOBBoxParser(
+        coco_dir / "annotations.json",
+        coco_dir / "images",
+        img_size_resolver=parsers.ImgSizeResolver(
+            trust_metadata=False, cache_filepath=tmp_path / "sizes.json"
+        ),
+    )
+    records = parser.parse(data_splitter=SingleSplitSplitter())[0]
+    assert (records[0].width, records[0].height) == (640, 480)
+    assert len(ImgSizeCache(tmp_path / "sizes.json").sizes) == 5
+
+
+@pytest.mark.parametrize(
+    "keys", [None, ["categories", "annotations", "images"], ["annotations"]]
+)
+def test_coco_parser_stream(coco_dir, tmp_path, keys):
+    annotations_filepath = coco_dir / "annotations.json"
+    if keys is not None:
+        # move sections to the end of the file
+        data = json.loads(annotations_filepath.read_bytes())
+        data = {**data, **{key: data.pop(key) for key in keys}}
+        annotations_filepath = tmp_path / "annotations.json"
+        annotations_filepath.write_text(json.dumps(data))
+
+    parser = parsers.COCOMaskParser(annotations_filepath, coco_dir / "images")
+    stream_parser = parsers.COCOMaskParser(
+        annotations_filepath, coco_dir / "images", stream=True
+    )
+    records = parser.parse(data_splitter=SingleSplitSplitter())[0]
+    stream_records = stream_parser.parse(data_splitter=SingleSplitSplitter())[0]
+
+    assert stream_parser.class_map == parser.class_map
+    assert len(stream_parser) == len(parser)
+    assert len(stream_records) == len(records)
+    for stream_record, record in zip(stream_records, records):
+        assert stream_record.filepath == record.filepath
+        assert stream_record.img_size == record.img_size
+        assert stream_record.detection.class_map is stream_parser.class_map
+        assert stream_record.detection.labels == record.detection.labels
+        assert stream_record.detection.bboxes == record.detection.bboxes
+        assert stream_record.detection.masks == record.detection.masks
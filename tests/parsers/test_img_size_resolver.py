@@ -0,0 +1,57 @@
+import pytest
+from icevision.all import *
+
+
+@pytest.fixture
+def filepaths(samples_source):
+    return [
+        samples_source / "voc/JPEGImages/2007_000063.jpg",
+        samples_source / "images2/flies.jpeg",
+    ]
+
+
+@pytest.fixture
+def read_filepaths(monkeypatch):
+    read_filepaths = []
+
+    def get_img_size(filepath):
+        read_filepaths.append(filepath)
+        return ImgSize(width=1, height=2)
+
+    imageio = sys.modules["icevision.utils.imageio"]
+    monkeypatch.setattr(imageio, "get_img_size", get_img_size)
+    return read_filepaths
+
+
+def test_img_size_resolver_metadata(filepaths, read_filepaths):
+    resolver = parsers.ImgSizeResolver(num_workers=0)
+    img_sizes = resolver(filepaths, [ImgSize(500, 375), None], show_pbar=False)
+
+    assert img_sizes == [ImgSize(500, 375), ImgSize(1, 2)]
+    assert read_filepaths == filepaths[1:]
+
+
+def test_img_size_resolver_verify(filepaths, read_filepaths):
+    resolver = parsers.ImgSizeResolver(verify_samples=1, num_workers=0)
+    img_sizes = resolver(filepaths, [ImgSize(500, 375), None], show_pbar=False)
+
+    # mismatches are replaced by the size read from the image
+    assert img_sizes == [ImgSize(1, 2), ImgSize(1, 2)]
+    assert read_filepaths == filepaths[::-1]
+
+
+def test_img_size_resolver_cache(filepaths, tmp_path):
+    cache_filepath = tmp_path / "sizes.json"
+    resolver = parsers.ImgSizeResolver(
+        trust_metadata=False, cache_filepath=cache_filepath
+    )
+    img_sizes = resolver(filepaths, [ImgSize(1, 2), ImgSize(1, 2)], show_pbar=False)
+    assert img_sizes == [ImgSize(500, 375), ImgSize(2592, 3888)]
+
+    cache = ImgSizeCache(cache_filepath)
+    assert cache.get(filepaths[0]) == ImgSize(500, 375)
+    assert cache.get(filepaths[1]) == ImgSize(2592, 3888)
+
+    # entries are invalidated when the image is modified
+    cache.sizes[str(filepaths[0])][0] -= 1
+    assert cache.get(filepaths[0]) is None
@@ -84,7 +84,18 @@ def test_parser(data, tmpdir):
     )[0]
     assert parser._check_path(cache_filepath) == True
     assert cache_filepath.exists() == True
-    loaded_records = pickle.load(open(cache_filepath, "rb"))[0]
+    loaded_records = parser.parse(
+        data_splitter=SingleSplitSplitter(), cache_filepath=cache_filepath
+    )[0]
+    assert isinstance(loaded_records, list)
+    assert isinstance(records, list)
+    lazy_records = parser.parse(
+        data_splitter=SingleSplitSplitter(), cache_filepath=cache_filepath, lazy=True
+    )[0]
+    assert isinstance(lazy_records, CachedRecords)
+    assert len(lazy_records) == len(records)
+    with pytest.raises(ValueError):
+        parser.parse(data_splitter=SingleSplitSplitter(), lazy=True)
     assert len(loaded_records) == len(records)
     for loaded_record, record in zip(loaded_records, records):
         assert loaded_record.filepath == record.filepath
@@ -120,3 +131,103 @@ def test_parser_invalid_data(data, bbox_xyxy):
 
     with pytest.raises(InvalidDataError) as err:
         records = parser.parse(data_splitter=SingleSplitSplitter())[0]
+
+
+def test_parser_num_workers(data):
+    # record 1 is split between shards and new labels are found by each shard
+    data = [
+        *data,
+        {"id": 7, "filepath": __file__, "labels": ["c"], "bboxes": [[5, 5, 9, 9]]},
+        {"id": 1, "filepath": __file__, "labels": ["d"], "bboxes": [[2, 2, 4, 4]]},
+    ]
+
+    def parse(num_workers):
+        parser = SimpleParser(data)
+        parser.class_map.unlock()
+        splits = parser.parse(
+            data_splitter=RandomSplitter([0.5, 0.5], seed=42),
+            autofix=False,
+            num_workers=num_workers,
+        )
+        return parser, splits
+
+    parser, splits = parse(num_workers=0)
+    parallel_parser, parallel_splits = parse(num_workers=2)
+
+    assert parallel_parser.idmap.name2id == parser.idmap.name2id
+    assert parallel_parser.class_map == parser.class_map
+    for split, parallel_split in zip(splits, parallel_splits):
+        assert [o.record_id for o in parallel_split] == [o.record_id for o in split]
+        for record, parallel_record in zip(split, parallel_split):
+            assert parallel_record.filepath == record.filepath
+            assert parallel_record.detection.labels == record.detection.labels
+            assert parallel_record.detection.label_ids == record.detection.label_ids
+            assert parallel_record.detection.bboxes == record.detection.bboxes
+            assert parallel_record.detection.class_map is parallel_parser.class_map
+
+    record_1 = [o for split in splits for o in split if o.record_id == 0][0]
+    assert record_1.detection.labels == ["a", "d"]
+
+
+def test_parser_incremental(data, tmp_path):
+    class JSONParser(SimpleParser):
+        def __init__(self, filepath):
+            self.filepath = filepath
+            self.parsed_ids = []
+            super().__init__(json.loads(filepath.read_text()))
+            self.class_map.unlock()
+
+        def source_files(self):
+            return [self.filepath]
+
+        def parse_fields(self, o, record, is_new):
+            self.parsed_ids.append(o["id"])
+            super().parse_fields(o, record, is_new=is_new)
+
+    def parse(data):
+        filepath.write_text(json.dumps(data))
+        parser = JSONParser(filepath)
+        splits = parser.parse(
+            data_splitter=RandomSplitter([0.5, 0.5], seed=42),
+            cache_filepath=cache_filepath,
+            incremental=True,
+        )
+        split_names = [{parser.idmap.get_id(o.record_id) for o in s} for s in splits]
+        return parser, splits, split_names
+
+    filepath, cache_filepath = tmp_path / "data.json", tmp_path / "records.cache"
+    data = [
+        *data,
+        {"id": 4, "filepath": __file__, "labels": ["b"], "bboxes": [[1, 1, 8, 8]]},
+    ]
+    parser, splits, split_names = parse(data)
+    assert parser.parsed_ids == [1, 42, 3, 4]
+    assert set.union(*split_names) == {1, 42, 4}
+
+    # record 1 is removed, 42 changed and 5 added
+    data = [
+        {**data[1], "labels": ["c"], "bboxes": [[1, 2, 3, 4]]},
+        *data[2:],
+        {"id": 5, "filepath": __file__, "labels": ["d"], "bboxes": [[5, 5, 9, 9]]},
+    ]
+    new_parser, new_splits, new_split_names = parse(data)
+    assert new_parser.parsed_ids == [42, 5]
+    assert set.union(*new_split_names) == {42, 4, 5}
+    # ids and splits of the previous records are kept
+    for name in [42, 4]:
+        assert new_parser.idmap[name] == parser.idmap[name]
+        assert [name in o for o in new_split_names] == [name in o for o in split_names]
+
+    records = {o.record_id: o for split in new_splits for o in split}
+    assert isinstance(new_splits[0], list)
+    assert records[new_parser.idmap[42]].detection.labels == ["c"]
+    assert records[new_parser.idmap[5]].detection.labels == ["d"]
+    assert records[new_parser.idmap[4]].detection.labels == ["b"]
+    # the cached class map is merged in the one of the parser
+    assert all(o.detection.class_map is new_parser.class_map for o in records.values())
+    assert records[new_parser.idmap[5]].detection.class_map.get_by_name("d") == 4
+
+    # unchanged source, the cache is loaded as it is
+    parser, splits, _ = parse(data)
+    assert parser.parsed_ids == []
+    assert all(o.detection.class_map is parser.class_map for o in splits[0])
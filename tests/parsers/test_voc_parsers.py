@@ -77,3 +77,99 @@ def test_voc_mask_parser(samples_source, voc_class_map):
             },
         ]
     )
+
+
+def test_parse_voc_xml(samples_source):
+    annotation = parsers.parse_voc_xml(
+        samples_source / "voc/Annotations/2007_000063.xml"
+    )
+
+    assert annotation["filename"] == "2007_000063.jpg"
+    assert annotation["size"] == ImgSize(width=500, height=375)
+    assert annotation["objects"] == [
+        {"name": "dog", "bndbox": [123, 115, 379, 275]},
+        {"name": "chair", "bndbox": [75, 1, 428, 375]},
+    ]
+
+
+def test_voc_mask_parser_num_workers(samples_source, voc_class_map):
+    parser = parsers.VOCMaskParser(
+        annotations_dir=samples_source / "voc/Annotations",
+        images_dir=samples_source / "voc/JPEGImages",
+        class_map=voc_class_map,
+        masks_dir=samples_source / "voc/SegmentationClass",
+    )
+    # the intersection with the masks only reads the image filename of the xml
+    assert [Path(o).name for o in parser] == ["2007_000063.xml"]
+
+    records = parser.parse(data_splitter=SingleSplitSplitter())[0]
+    parallel_records = parser.parse(data_splitter=SingleSplitSplitter(), num_workers=2)[
+        0
+    ]
+
+    assert len(parallel_records) == len(records) == 1
+    assert parallel_records[0].detection.labels == records[0].detection.labels
+    assert parallel_records[0].detection.bboxes == records[0].detection.bboxes
+    assert parallel_records[0].detection.masks == records[0].detection.masks
+
+
+def test_voc_mask_parser_matches_xml_filename(samples_source, voc_class_map, tmpdir):
+    # the annotation file is named differently than its image and mask
+    annotations_dir = Path(tmpdir)
+    shutil.copy(
+        samples_source / "voc/Annotations/2007_000063.xml",
+        annotations_dir / "annotation.xml",
+    )
+    parser = parsers.VOCMaskParser(
+        annotations_dir=annotations_dir,
+        images_dir=samples_source / "voc/JPEGImages",
+        class_map=voc_class_map,
+        masks_dir=samples_source / "voc/SegmentationClass",
+    )
+
+    records = parser.parse(data_splitter=SingleSplitSplitter())[0]
+    assert len(records) == 1
+    assert len(records[0].detection.masks) == 2
+
+
+def test_voc_parser_incremental(samples_source, tmp_path, monkeypatch):
+    annotations_dir = tmp_path / "Annotations"
+    shutil.copytree(samples_source / "voc/Annotations", annotations_dir)
+    cache_filepath = tmp_path / "records.cache"
+
+    parsed_files = []
+    parse_voc_xml = parsers.voc_parser.parse_voc_xml
+
+    def counting_parse_voc_xml(filepath):
+        parsed_files.append(Path(filepath).name)
+        return parse_voc_xml(filepath)
+
+    monkeypatch.setattr(parsers.voc_parser, "parse_voc_xml", counting_parse_voc_xml)
+
+    def parse():
+        parser = parsers.VOCBBoxParser(
+            annotations_dir=annotations_dir,
+            images_dir=samples_source / "voc/JPEGImages",
+        )
+        records = parser.parse(
+            data_splitter=SingleSplitSplitter(),
+            cache_filepath=cache_filepath,
+            incremental=True,
+        )[0]
+        return parser, records
+
+    parse()
+    assert sorted(parsed_files) == ["2007_000063.xml", "2011_003353.xml"]
+
+    # only the changed file is parsed, unchanged ones are not parsed to check them
+    xml_filepath = annotations_dir / "2011_003353.xml"
+    xml_filepath.write_text(xml_filepath.read_text().replace("person", "cat"))
+    parsed_files.clear()
+    parser, records = parse()
+    assert parsed_files == ["2011_003353.xml"]
+
+    labels = {Path(o.filepath).stem: o.detection.labels for o in records}
+    assert labels == {"2007_000063": ["dog", "chair"], "2011_003353": ["cat"]}
+    # the cached classes are merged in the class map of the parser
+    assert set(parser.class_map._id2class) >= {"dog", "chair", "person", "cat"}
+    assert all(o.detection.class_map is parser.class_map for o in records)
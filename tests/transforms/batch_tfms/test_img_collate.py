@@ -0,0 +1,49 @@
+import pytest
+from icevision.all import *
+
+
+@pytest.fixture()
+def records():
+    imgs = [
+        np.full((2, 4, 3), 10, dtype=np.uint8),
+        np.full((3, 2, 3), 20, dtype=np.uint8),
+    ]
+    records = []
+    for img in imgs:
+        record = BaseRecord((ImageRecordComponent(),))
+        record.set_img(img)
+        records.append(record)
+    return records
+
+
+@pytest.mark.parametrize("pad_value", [0, (1, 2, 3)])
+def test_img_collate(records, pad_value):
+    batch = tfms.batch.ImgCollate(pad_value=pad_value, pin_memory=False)(records)
+
+    expected = np.ones((2, 3, 4, 3), dtype=np.uint8)
+    expected *= np.array(pad_value, dtype=np.uint8).reshape(-1)
+    expected[0, :2, :4] = 10
+    expected[1, :3, :2] = 20
+    assert batch.dtype == torch.uint8
+    np.testing.assert_equal(batch.numpy(), expected.transpose(0, 3, 1, 2))
+
+
+def test_img_collate_new_batches(records):
+    img_collate = tfms.batch.ImgCollate()
+    batch = img_collate(records)
+    batch_data = batch.clone()
+    img_collate(records[:1])
+    # batches are not overwritten by the next ones
+    assert torch.equal(batch, batch_data)
+
+
+def test_img_collate_buffers(records):
+    img_collate = tfms.batch.ImgCollate(pin_memory=False, num_buffers=2)
+    batches = [img_collate(records) for _ in range(3)]
+    # buffers are reused
+    assert batches[0].data_ptr() == batches[2].data_ptr()
+    assert batches[0].data_ptr() != batches[1].data_ptr()
+
+    batch = img_collate(records[:1])
+    assert batch.shape == (1, 3, 2, 4)
+    assert (batch == 10).all()
@@ -0,0 +1,91 @@
+import pytest
+from icevision.all import *
+from icevision.tfms.batch.tensor_tfms import _batch_tensor
+
+
+@pytest.fixture()
+def records():
+    records = []
+    for i in range(3):
+        record = BaseRecord((ImageRecordComponent(), BBoxesRecordComponent()))
+        img = np.zeros((20, 40, 3), dtype=np.uint8)
+        img[2:6, 4:12] = 10 * (i + 1)
+        record.set_img(img)
+        record.detection.add_bboxes([BBox.from_xyxy(4, 2, 12, 6)])
+        records.append(record)
+    return records
+
+
+def test_batch_horizontal_flip(records):
+    imgs = [record.img.copy() for record in records]
+    tfmed = tfms.batch.BatchHorizontalFlip(p=1.0)(records)
+
+    for record, img in zip(tfmed, imgs):
+        np.testing.assert_equal(record.img, img[:, ::-1])
+        assert record.detection.bboxes == [BBox.from_xyxy(28, 2, 36, 6)]
+
+
+def test_batch_vertical_flip(records):
+    tfmed = tfms.batch.BatchVerticalFlip(p=0.0)(records)
+    assert tfmed[0].detection.bboxes == [BBox.from_xyxy(4, 2, 12, 6)]
+
+    tfmed = tfms.batch.BatchVerticalFlip(p=1.0)(records)
+    assert tfmed[0].detection.bboxes == [BBox.from_xyxy(4, 14, 12, 18)]
+    assert (tfmed[0].img[14:18, 4:12] == 10).all()
+
+
+def test_batch_resize_normalize(records):
+    tfm = tfms.batch.TensorCompose(
+        [tfms.batch.BatchResize((20, 10)), tfms.batch.BatchNormalize()]
+    )
+    tfmed = tfm(records)
+
+    img = tfmed[0].img
+    assert img.shape == (10, 20, 3) and img.dtype == np.float32
+    assert tfmed[0].img_size == ImgSize(width=20, height=10)
+    assert tfmed[0].detection.bboxes == [BBox.from_xyxy(2, 1, 6, 3)]
+    expected = (10 / 255 - np.array([0.485, 0.456, 0.406])) / [0.229, 0.224, 0.225]
+    np.testing.assert_allclose(img[1, 2], expected, rtol=1e-5)
+
+
+def test_batch_random_resized_crop(records):
+    tfm = tfms.batch.BatchRandomResizedCrop(16, scale=(0.1, 0.5))
+    tfmed = tfm(records)
+
+    for record in tfmed:
+        assert record.img.shape == (16, 16, 3) and record.img.dtype == np.uint8
+        assert record.img_size == ImgSize(width=16, height=16)
+        # bboxes outside of the crop are removed
+        for bbox in record.detection.bboxes:
+            assert bbox.width > 0 and bbox.height > 0
+            assert 0 <= bbox.xmin <= bbox.xmax <= 16
+
+
+def test_batch_brightness_contrast(records):
+    imgs = np.stack([record.img for record in records])
+    tfm = tfms.batch.BatchBrightnessContrast(p=0.0)
+    np.testing.assert_equal(np.stack([o.img for o in tfm(records)]), imgs)
+
+    tfm = tfms.batch.BatchBrightnessContrast(brightness_limit=0.5, p=1.0)
+    assert not (np.stack([o.img for o in tfm(records)]) == imgs).all()
+
+
+def test_tensor_batch_transform_views(records):
+    tfmed = tfms.batch.BatchHorizontalFlip(p=1.0)(records)
+    imgs = [record.img for record in tfmed]
+
+    # the images are views into the transformed batch, used without copying them
+    batch = _batch_tensor(imgs)
+    assert batch.shape == (3, 3, 20, 40) and batch.is_contiguous()
+    np.testing.assert_equal(batch.permute(0, 2, 3, 1).numpy(), np.stack(imgs))
+    assert _batch_tensor(imgs[::-1]) is None
+    assert _batch_tensor([img.copy() for img in imgs]) is None
+
+    tfmed = tfms.batch.BatchHorizontalFlip(p=1.0)(tfmed)
+    np.testing.assert_equal(tfmed[0].img[2:6, 4:12], 10)
+
+
+def test_tensor_batch_transform_sizes(records):
+    records[0].set_img(np.zeros((10, 10, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        tfms.batch.BatchHorizontalFlip()(records)
@@ -104,32 +104,42 @@ def test_keypoints_transform_crop_error(coco_keypoints_parser):
 
 
 def test_filter_keypoints():
-    tfms_kps, w, h, v = (
-        [(0, 0), (60, 119), (-30, 40), (100, 300), (30, 100)],
+    tfms_xy, w, h, v = (
+        np.array([(0, 0), (60, 119), (-30, 40), (100, 300), (30, 100)]),
         80,
         120,
-        [0, 1, 1, 1, 2],
+        np.array([0, 1, 1, 1, 2]),
     )
     img_size = ImgSize(width=w, height=h)
-    tra_n = tfms.A.AlbumentationsKeypointsComponent._remove_albu_outside_keypoints(
-        tfms_kps, v, img_size
+    xyv = tfms.A.AlbumentationsKeypointsComponent._remove_outside_keypoints(
+        tfms_xy, v, img_size
     )
 
-    assert len(tfms_kps) == len(tra_n)
-    assert tra_n == [(0, 0, 0), (60, 119, 1), (0, 0, 0), (0, 0, 0), (30, 100, 2)]
+    assert xyv.tolist() == [
+        [0, 0, 0],
+        [60, 119, 1],
+        [0, 0, 0],
+        [0, 0, 0],
+        [30, 100, 2],
+    ]
 
-    tfms_kps, w, h, v = (
-        [(0, 0), (79, 119), (-30, 40), (100, 300), (70, 100)],
+    tfms_xy, w, h, v = (
+        np.array([(0, 0), (79, 119), (-30, 40), (100, 300), (70, 100)]),
         120,
         120,
-        [0, 1, 1, 1, 2],
+        np.array([0, 1, 1, 1, 2]),
     )
-    tra_n = tfms.A.AlbumentationsKeypointsComponent._remove_albu_outside_keypoints(
-        tfms_kps, v, img_size
+    xyv = tfms.A.AlbumentationsKeypointsComponent._remove_outside_keypoints(
+        tfms_xy, v, img_size
     )
 
-    assert len(tfms_kps) == len(tra_n)
-    assert tra_n == [(0, 0, 0), (79, 119, 1), (0, 0, 0), (0, 0, 0), (70, 100, 2)]
+    assert xyv.tolist() == [
+        [0, 0, 0],
+        [79, 119, 1],
+        [0, 0, 0],
+        [0, 0, 0],
+        [70, 100, 2],
+    ]
 
 
 def test_filter_boxes():
@@ -139,3 +149,48 @@ def test_filter_boxes():
 
     res = tfms.A.AlbumentationsBBoxesComponent._clip_bboxes(inp, h, w)
     assert out == res
+
+
+def test_adapter_draft_size():
+    img_size = ImgSize(width=500, height=375)
+    tfm = tfms.A.Adapter(tfms.A.resize_and_pad(100))
+    assert tfm.draft_size(img_size) == ImgSize(width=100, height=75)
+
+    tfm = tfms.A.Adapter(tfms.A.aug_tfms(size=64, presize=128))
+    assert tfm.draft_size(img_size) == ImgSize(width=171, height=128)
+
+    tfm = tfms.A.Adapter([tfms.A.HorizontalFlip(), *tfms.A.resize_and_pad(100)])
+    assert tfm.draft_size(img_size) is None
+
+
+def test_dataset_draft(records):
+    tfm = tfms.A.Adapter(tfms.A.resize_and_pad(64))
+    sample = Dataset(records, tfm=tfm)[0]
+    draft_sample = Dataset(records, tfm=tfm, draft=True)[0]
+
+    assert draft_sample.img.shape == sample.img.shape
+    assert draft_sample.img_size == sample.img_size
+    for bbox, expected in zip(draft_sample.detection.bboxes, sample.detection.bboxes):
+        np.testing.assert_allclose(bbox.xyxy, expected.xyxy, atol=1)
+    assert draft_sample.detection.masks.shape == sample.detection.masks.shape
+
+
+def test_adapter_compiles_once(records, monkeypatch):
+    tfm = tfms.A.Adapter([tfms.A.HorizontalFlip(p=1.0)])
+    create_tfms = tfm.create_tfms
+    calls = []
+    monkeypatch.setattr(tfm, "create_tfms", lambda: calls.append(1) or create_tfms())
+
+    ds, tfm_ds = Dataset(records), Dataset(records, tfm=tfm)
+    for i in range(len(records)):
+        sample, tfmed = ds[i], tfm_ds[i]
+        assert (tfmed.img == sample.img[:, ::-1, :]).all()
+    assert len(calls) == 1
+
+    # records with other components get their own pipeline
+    img = open_img(records[0].filepath)
+    Dataset.from_images([img], tfm)[0]
+    assert len(calls) == 2 and len(tfm._plans) == 2
+
+    monkeypatch.undo()
+    assert pickle.loads(pickle.dumps(tfm))._plans == {}
@@ -24,3 +24,17 @@ def test_open_img(samples_source, fn, expected):
 def test_get_image_size(samples_source, fn, expected):
     size = get_image_size(samples_source / fn)
     assert size == (expected)
+
+
+@pytest.mark.parametrize(
+    "fn,draft_size,expected",
+    [
+        ("voc/JPEGImages/2007_000063.jpg", ImgSize(200, 150), (188, 250, 3)),
+        ("voc/JPEGImages/2007_000063.jpg", ImgSize(300, 150), (375, 500, 3)),
+        # rotated by the EXIF orientation
+        ("images2/flies.jpeg", ImgSize(600, 900), (972, 648, 3)),
+        ("images/000000343934.jpg", None, (480, 640, 3)),
+    ],
+)
+def test_open_img_draft(samples_source, fn, draft_size, expected):
+    assert open_img(samples_source / fn, draft_size=draft_size).shape == expected
@@ -0,0 +1,34 @@
+import pytest
+from icevision.all import *
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_iter_json_items(tmp_path, chunk_size):
+    data = {
+        "info": {"year": 2021, "name": "[not, an, array]"},
+        "empty": [],
+        "numbers": [1234567, -1.5e3, 0],
+        "items": [{"id": 1, "counts": 'a\\"]['}, None, [1, [2]]],
+        "last": 3,
+    }
+    filepath = tmp_path / "data.json"
+    filepath.write_text(json.dumps(data, indent=2))
+
+    items = list(iter_json_items(filepath, chunk_size=chunk_size))
+    assert items == [
+        ("info", data["info"]),
+        ("numbers", 1234567),
+        ("numbers", -1.5e3),
+        ("numbers", 0),
+        ("items", data["items"][0]),
+        ("items", None),
+        ("items", [1, [2]]),
+        ("last", 3),
+    ]
+
+
+def test_iter_json_items_invalid(tmp_path):
+    filepath = tmp_path / "data.json"
+    filepath.write_text('{"items": [1, 2')
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items(filepath))
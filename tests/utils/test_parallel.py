@@ -0,0 +1,16 @@
+import pytest
+from icevision.all import *
+
+
+def test_chunks():
+    assert chunks(list(range(5)), 2) == [[0, 1], [2, 3, 4]]
+    assert chunks(list(range(2)), 4) == [[0], [1]]
+    assert chunks([], 4) == [[]]
+
+
+@pytest.mark.parametrize("num_workers,use_threads", [(0, False), (2, True), (2, False)])
+def test_parallel_map(num_workers, use_threads):
+    res = parallel_map(
+        abs, [-1, 2, -3], num_workers=num_workers, use_threads=use_threads
+    )
+    assert res == [1, 2, 3]
@@ -1,3 +1,4 @@
+import pytest
 from icevision.all import *
 from icevision.core.record_components import LossesRecordComponent
 
@@ -119,3 +120,20 @@ def test_get_weighted_sum():
     result = get_weighted_sum(br, weights)
 
     assert result.losses["loss_weighted"] == expected["loss_weighted"]
+
+
+@pytest.mark.parametrize("bgr", [False, True])
+def test_normalize_imgs(bgr):
+    img = np.random.randint(0, 256, (4, 5, 3), dtype=np.uint8)
+    expected = normalize_imagenet(img)
+    if bgr:
+        expected = expected[:, :, ::-1]
+    expected = im2tensor(expected.copy())
+
+    imgs = torch.from_numpy(img).permute(2, 0, 1)
+    assert torch.allclose(normalize_imgs(imgs[None], bgr=bgr)[0], expected, atol=1e-6)
+    for normalized in normalize_imgs([imgs, imgs], bgr=bgr):
+        assert torch.allclose(normalized, expected, atol=1e-6)
+
+    # already normalized images are left unchanged
+    assert normalize_imgs(expected) is expected